@@ -1,10 +1,6 @@
 """配置文件 - 管理测试环境配置"""
 
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 
 
 class Config:
@@ -12,6 +8,10 @@ class Config:
     
     # 测试网站URL
     BASE_URL = "https://www.saucedemo.com"
+    # 目标站点: remote 使用线上站点，local 在进程内启动本地替身站点并覆盖 BASE_URL
+    TARGET_SITE = os.getenv("TARGET_SITE", "remote")
+    LOCAL_SITE_LATENCY_MS = int(os.getenv("LOCAL_SITE_LATENCY_MS", "0"))
+    INVENTORY_PATH = "/inventory.html"
     
     # 测试用户信息
     VALID_USERNAME = "standard_user"
@@ -20,32 +20,90 @@ class Config:
     INVALID_USERNAME = "invalid_user"
     INVALID_PASSWORD = "invalid_password"
     
+    # 登录方式: session 直接写入会话状态，ui 通过登录表单
+    LOGIN_MODE = os.getenv("LOGIN_MODE", "session")
+    # 商品列表只读断言的后端: selenium 使用浏览器，http 直接解析服务端渲染的页面，parity 同时运行两者并交叉验证
+    PRODUCTS_BACKEND = os.getenv("PRODUCTS_BACKEND", "selenium")
+    # 夹具快照：每个进程中第一次执行夹具后记录浏览器状态，之后的测试直接恢复
+    CHECKPOINTS = os.getenv("CHECKPOINTS", "true").lower() == "true"
+    # 写入会话cookies前打开的同源轻量地址
+    SESSION_BOOTSTRAP_PATH = "/favicon.ico"
+    
     # 浏览器配置
     BROWSER = os.getenv("BROWSER", "chrome")
     HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
-    IMPLICIT_WAIT = 10
+    # 启动配置: fast 为无头快速启动，debug 为有界面的调试模式；默认按 HEADLESS 选择
+    DRIVER_PROFILE = os.getenv("DRIVER_PROFILE", "fast" if HEADLESS else "debug")
+    # 预热的浏览器用户数据目录模板，每个浏览器从模板在tmpfs中的副本启动
+    PROFILE_TEMPLATE = os.getenv("PROFILE_TEMPLATE", "true").lower() == "true"
+    PROFILE_TEMPLATE_DIR = os.getenv(
+        "PROFILE_TEMPLATE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "selenium-po-demo", "profile-template")
+    )
+    PROFILE_CLONE_ROOT = os.getenv("PROFILE_CLONE_ROOT", "/dev/shm" if os.path.isdir("/dev/shm") else None)
+    # 隐式等待会与显式等待叠加，所有等待都由 BasePage 的显式等待负责
+    IMPLICIT_WAIT = 0
+    REUSE_BROWSER = os.getenv("REUSE_BROWSER", "true").lower() == "true"
+    
+    # 网络整形配置：逗号分隔的URL模式和资源类型（image、font、media、stylesheet、analytics）
+    BLOCK_URL_PATTERNS = [pattern for pattern in os.getenv("BLOCK_URL_PATTERNS", "").split(",") if pattern]
+    BLOCK_RESOURCE_TYPES = [name for name in os.getenv("BLOCK_RESOURCE_TYPES", "").split(",") if name]
+    # 持久化的浏览器磁盘缓存目录，静态资源在多次启动之间从本地读取
+    NETWORK_CACHE_DIR = os.getenv("NETWORK_CACHE_DIR")
+    # 开启性能日志统计每个测试的网络流量，测试会话中默认开启；负载、基准和演示脚本不读取日志
+    RECORD_NETWORK_TRAFFIC = os.getenv("RECORD_NETWORK_TRAFFIC", "false").lower() == "true"
+    
+    # 报告配置
+    REPORTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+    DURATIONS_DB = os.path.join(REPORTS_DIR, "durations.sqlite")
+    # 旧版耗时记录文件，首次创建耗时数据库时导入
+    DURATIONS_FILE = os.path.join(REPORTS_DIR, "durations.json")
+    METRICS_FILE = os.path.join(REPORTS_DIR, "metrics.json")
+    # 并行运行时各进程写入的统计（驱动解析、浏览器启动、夹具快照），由控制进程汇总到测试摘要
+    WORKER_STATS_DIR = os.path.join(REPORTS_DIR, ".worker-stats")
+    # 流式报告目录：results.ndjson、附件和查看页面
+    STREAM_REPORT_DIR = os.getenv("STREAM_REPORT_DIR", os.path.join(REPORTS_DIR, "stream"))
+    # 失败现场：测试失败时保存截图、DOM、控制台日志和网络记录，放在流式报告目录下便于查看页面链接
+    CAPTURE_ARTIFACTS = os.getenv("CAPTURE_ARTIFACTS", "true").lower() == "true"
+    ARTIFACTS_DIR = os.getenv("ARTIFACTS_DIR", os.path.join(STREAM_REPORT_DIR, "artifacts"))
+    ARTIFACTS_MAX_MB = int(os.getenv("ARTIFACTS_MAX_MB", "200"))
+    # 失败重试：只重试超时、元素过期和网络错误这类基础设施失败，RETRY_BUDGET 为每个进程最多的重试次数
+    RETRIES = int(os.getenv("RETRIES", "1"))
+    RETRY_BUDGET = int(os.getenv("RETRY_BUDGET", "10"))
+    RETRY_CATEGORIES = os.getenv("RETRY_CATEGORIES", "timeout,stale,network").split(",")
+    BENCHMARK_RESULTS = os.path.join(REPORTS_DIR, "benchmark.json")
+    BENCHMARK_BASELINE = os.getenv(
+        "BENCHMARK_BASELINE",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+    )
+    LOADGEN_RESULTS = os.path.join(REPORTS_DIR, "loadgen.json")
+    # 数据驱动的场景文件（JSON，安装了 PyYAML 时也可以使用YAML）
+    SCENARIOS_FILE = os.getenv(
+        "SCENARIOS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios", "shopping.json")
+    )
+    
+    # 驱动配置
+    CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
+    DRIVER_OFFLINE = os.getenv("DRIVER_OFFLINE", "false").lower() == "true"
+    DRIVER_MANIFEST = os.getenv(
+        "DRIVER_MANIFEST",
+        os.path.join(os.path.expanduser("~"), ".cache", "selenium-po-demo", "driver_manifest.json")
+    )
     EXPLICIT_WAIT = 20
+    POLL_INTERVAL = 0.1
+    DOM_SETTLE_QUIET_MS = 100
+    # 按名称查找商品前确认页面就绪的最长时间，就绪条件不满足时视为当前页面没有商品，不等待显式等待超时
+    READY_PROBE_TIMEOUT = 2
     
     @staticmethod
-    def get_driver():
-        """获取WebDriver实例"""
-        if Config.BROWSER.lower() == "chrome":
-            chrome_options = Options()
-            
-            if Config.HEADLESS:
-                chrome_options.add_argument("--headless")
-            
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            driver.implicitly_wait(Config.IMPLICIT_WAIT)
-            driver.maximize_window()
+    def get_driver(profile=None):
+        """获取WebDriver实例
+        
+        Args:
+            profile: 启动配置名称，默认为 DRIVER_PROFILE
             
-            return driver
-        else:
-            raise ValueError(f"不支持的浏览器类型: {Config.BROWSER}")
\ No newline at end of file
+        Returns:
+            WebDriver: 新的浏览器实例
+        """
+        from core.driver_factory import create_driver
+        return create_driver(profile)
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Core Package
+
+这个包包含了测试框架的基础设施，例如浏览器池、驱动工厂、驱动解析、网络整形等。
+依赖页面对象的模块（如 core.session）需要单独导入，避免与 pages 包循环导入。
+"""
+
+from .driver_pool import DriverPool
+from .driver_factory import DriverFactory, PROFILES, get_factory, create_driver
+from .driver_resolver import DriverResolver, get_resolver, resolve_chromedriver
+from .network import NetworkShaper, RESOURCE_TYPE_PATTERNS
+from .profile_template import ProfileTemplate
+
+__all__ = [
+    'DriverPool',
+    'DriverFactory',
+    'PROFILES',
+    'get_factory',
+    'create_driver',
+    'DriverResolver',
+    'get_resolver',
+    'resolve_chromedriver',
+    'NetworkShaper',
+    'RESOURCE_TYPE_PATTERNS',
+    'ProfileTemplate'
+]
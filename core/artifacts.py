@@ -0,0 +1,305 @@
+"""失败现场 - 测试失败时保存截图、DOM、浏览器控制台日志和网络记录
+
+浏览器中的数据必须在浏览器被重置和归还之前读取，因此在测试线程中完成；
+压缩、写盘和淘汰旧文件交给后台线程，测试的teardown不需要等待。
+每次运行的现场文件总大小有上限，超过时按最近最少使用的顺序删除整个测试的现场目录。
+"""
+
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from selenium.common.exceptions import WebDriverException
+from config import Config
+
+# 每个测试的现场目录中的统计文件名前缀，控制进程汇总各进程的统计
+STATS_PREFIX = ".stats-"
+
+# 读取页面的资源加载记录，生成精简的HAR条目
+RESOURCE_TIMING = """
+return performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .map(function (entry) {
+        return {
+            name: entry.name,
+            type: entry.initiatorType || entry.entryType,
+            startTime: entry.startTime,
+            duration: entry.duration,
+            transferSize: entry.transferSize || 0,
+            encodedBodySize: entry.encodedBodySize || 0,
+            status: entry.responseStatus || 0,
+            protocol: entry.nextHopProtocol || ''
+        };
+    });
+"""
+
+
+def _directory_name(nodeid):
+    """把测试节点ID转换为目录名
+    
+    Args:
+        nodeid: 测试节点ID
+    
+    Returns:
+        str: 目录名
+    """
+    return "".join(character if character.isalnum() or character in ".-" else "_" for character in nodeid)[:200]
+
+
+def to_har(entries, page_url):
+    """把资源加载记录转换为HAR 1.2格式
+    
+    Args:
+        entries: RESOURCE_TIMING 返回的记录
+        page_url: 页面地址
+    
+    Returns:
+        dict: HAR文档
+    """
+    origin = time.time() * 1000 - max([entry["startTime"] + entry["duration"] for entry in entries] or [0])
+    return {
+        "log": {
+            "version": "1.2",
+            "creator": {"name": "python_selenium_po_demo", "version": "1.0"},
+            "pages": [{"id": "page_1", "title": page_url, "startedDateTime": _iso(origin), "pageTimings": {}}],
+            "entries": [
+                {
+                    "pageref": "page_1",
+                    "startedDateTime": _iso(origin + entry["startTime"]),
+                    "time": entry["duration"],
+                    "request": {"method": "GET", "url": entry["name"], "httpVersion": entry["protocol"],
+                                "headers": [], "queryString": [], "cookies": [], "headersSize": -1, "bodySize": 0},
+                    "response": {"status": entry["status"], "statusText": "", "httpVersion": entry["protocol"],
+                                 "headers": [], "cookies": [], "redirectURL": "", "headersSize": -1,
+                                 "bodySize": entry["encodedBodySize"],
+                                 "content": {"size": entry["encodedBodySize"], "mimeType": ""},
+                                 "_transferSize": entry["transferSize"]},
+                    "cache": {},
+                    "timings": {"send": 0, "wait": entry["duration"], "receive": 0},
+                    "_resourceType": entry["type"]
+                }
+                for entry in entries
+            ]
+        }
+    }
+
+
+def _iso(milliseconds):
+    """毫秒时间戳转换为ISO 8601格式
+    
+    Args:
+        milliseconds: 毫秒时间戳
+    
+    Returns:
+        str: 时间字符串
+    """
+    seconds = milliseconds / 1000
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)) + f".{int(milliseconds % 1000):03d}Z"
+
+
+class ArtifactCollector:
+    """失败现场收集器，每个进程一个实例"""
+    
+    def __init__(self, directory=None, max_bytes=None):
+        """初始化收集器
+        
+        Args:
+            directory: 现场文件目录，默认为 Config.ARTIFACTS_DIR
+            max_bytes: 现场文件总大小上限（字节），默认为 Config.ARTIFACTS_MAX_MB
+        """
+        self.directory = directory or Config.ARTIFACTS_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else Config.ARTIFACTS_MAX_MB * 1024 * 1024
+        self.stats = {
+            "captures": 0,
+            "capture_time": 0.0,
+            "write_time": 0.0,
+            "raw_bytes": 0,
+            "written_bytes": 0,
+            "evicted": 0,
+            "errors": 0
+        }
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+    
+    def capture(self, nodeid, driver):
+        """读取浏览器中的现场数据，交给后台线程压缩写盘
+        
+        Args:
+            nodeid: 测试节点ID
+            driver: WebDriver实例
+        
+        Returns:
+            dict: files 为将要写入的现场文件列表，每项为 (名称, 路径)；capture_ms 为读取浏览器的耗时
+        """
+        start_time = time.perf_counter()
+        snapshot = {}
+        readers = {
+            "screenshot.png": driver.get_screenshot_as_png,
+            "dom.html.gz": lambda: driver.page_source,
+            "console.json.gz": lambda: driver.get_log("browser"),
+            "network.har.gz": lambda: to_har(driver.execute_script(RESOURCE_TIMING) or [], driver.current_url)
+        }
+        for name, read in readers.items():
+            try:
+                snapshot[name] = read()
+            except WebDriverException:
+                # 浏览器已崩溃或不支持该日志类型时跳过这一项
+                with self._lock:
+                    self.stats["errors"] += 1
+        elapsed = time.perf_counter() - start_time
+        with self._lock:
+            self.stats["captures"] += 1
+            self.stats["capture_time"] += elapsed
+        
+        test_dir = os.path.join(self.directory, _directory_name(nodeid))
+        self._queue.put((test_dir, snapshot))
+        return {
+            "files": [(name, os.path.join(test_dir, name)) for name in snapshot],
+            "capture_ms": round(elapsed * 1000, 1)
+        }
+    
+    def _run(self):
+        """后台线程：压缩并写入现场文件，然后执行淘汰"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except OSError:
+                with self._lock:
+                    self.stats["errors"] += 1
+            finally:
+                self._queue.task_done()
+    
+    def _write(self, test_dir, snapshot):
+        """写入一个测试的现场文件
+        
+        Args:
+            test_dir: 测试的现场目录
+            snapshot: 文件名到内容的映射
+        """
+        start_time = time.perf_counter()
+        os.makedirs(test_dir, exist_ok=True)
+        raw_bytes = written_bytes = 0
+        for name, content in snapshot.items():
+            if not isinstance(content, (bytes, str)):
+                content = json.dumps(content, ensure_ascii=False, indent=1)
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            raw_bytes += len(content)
+            # PNG本身已经压缩，其余文本内容用gzip压缩
+            data = gzip.compress(content, compresslevel=6) if name.endswith(".gz") else content
+            with open(os.path.join(test_dir, name), "wb") as f:
+                f.write(data)
+            written_bytes += len(data)
+        evicted = self.evict()
+        with self._lock:
+            self.stats["raw_bytes"] += raw_bytes
+            self.stats["written_bytes"] += written_bytes
+            self.stats["evicted"] += evicted
+            self.stats["write_time"] += time.perf_counter() - start_time
+    
+    def evict(self):
+        """总大小超过上限时，按最近一次写入时间从旧到新删除整个测试的现场目录
+        
+        Returns:
+            int: 删除的目录数量
+        """
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir():
+                continue
+            size = sum(item.stat().st_size for item in os.scandir(entry.path) if item.is_file())
+            entries.append((entry.stat().st_mtime, entry.path, size))
+            total += size
+        
+        evicted = 0
+        for _, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            evicted += 1
+        return evicted
+    
+    def close(self):
+        """等待所有现场文件写完，并把本进程的统计写入现场目录
+        
+        Returns:
+            dict: 本进程的统计
+        """
+        self._queue.put(None)
+        self._thread.join()
+        if self.stats["captures"]:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, f"{STATS_PREFIX}{os.getpid()}.json"), "w", encoding="utf-8") as f:
+                json.dump(self.stats, f)
+        return self.stats
+
+
+def clear(directory=None):
+    """删除上一次运行的现场文件
+    
+    Args:
+        directory: 现场文件目录，默认为 Config.ARTIFACTS_DIR
+    """
+    shutil.rmtree(directory or Config.ARTIFACTS_DIR, ignore_errors=True)
+
+
+def load_stats(directory=None):
+    """汇总各进程写入的统计
+    
+    Args:
+        directory: 现场文件目录，默认为 Config.ARTIFACTS_DIR
+    
+    Returns:
+        dict: 合计统计，没有任何现场时为None
+    """
+    directory = directory or Config.ARTIFACTS_DIR
+    totals = None
+    if not os.path.isdir(directory):
+        return None
+    for entry in os.scandir(directory):
+        if not entry.name.startswith(STATS_PREFIX):
+            continue
+        with open(entry.path, encoding="utf-8") as f:
+            stats = json.load(f)
+        totals = totals or dict.fromkeys(stats, 0)
+        for key, value in stats.items():
+            totals[key] += value
+    return totals
+
+
+_collector = None
+
+
+def get_collector():
+    """获取进程共享的现场收集器
+    
+    Returns:
+        ArtifactCollector: 现场收集器
+    """
+    global _collector
+    if _collector is None:
+        _collector = ArtifactCollector()
+    return _collector
+
+
+def shutdown():
+    """关闭进程共享的现场收集器
+    
+    Returns:
+        dict: 本进程的统计，没有创建收集器时为None
+    """
+    global _collector
+    if _collector is None:
+        return None
+    stats = _collector.close()
+    _collector = None
+    return stats
@@ -0,0 +1,411 @@
+"""性能基准 - 使用页面对象重复运行关键流程，与保存的基线比较并检测性能回退
+
+用法::
+
+    # 运行基准并保存为基线
+    python -m core.benchmark run --save-baseline
+    
+    # 运行基准并与基线比较，出现显著回退时退出码为1
+    python -m core.benchmark run --compare
+    
+    # 比较已保存的结果文件
+    python -m core.benchmark compare reports/benchmark.json
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime
+from config import Config
+from core.driver_factory import create_driver
+from core.driver_pool import DriverPool
+from core.metrics import get_command_counter
+from core import local_site
+from core.session import SessionBootstrap
+from pages import LoginPage, ProductsPage, CartPage
+
+# 需要比较但还没有保存基线时的退出码，与性能回退（1）和参数错误（2）区分
+EXIT_NO_BASELINE = 3
+
+
+def percentile(values, fraction):
+    """计算百分位数（线性插值）
+    
+    Args:
+        values: 数值列表
+        fraction: 百分位，例如0.95
+        
+    Returns:
+        float: 百分位数，列表为空时返回None
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(samples):
+    """计算一组耗时样本的统计值
+    
+    Args:
+        samples: 耗时样本列表（秒）
+        
+    Returns:
+        dict: p50、p95、p99、平均值和最小/最大值
+    """
+    return {
+        "p50": percentile(samples, 0.50),
+        "p95": percentile(samples, 0.95),
+        "p99": percentile(samples, 0.99),
+        "mean": sum(samples) / len(samples) if samples else None,
+        "min": min(samples) if samples else None,
+        "max": max(samples) if samples else None
+    }
+
+
+def mann_whitney_u(baseline, current):
+    """单侧 Mann-Whitney U 检验：current 是否显著大于 baseline
+    
+    使用带平局修正和连续性修正的正态近似，不依赖第三方库。
+    
+    Args:
+        baseline: 基线样本
+        current: 当前样本
+        
+    Returns:
+        float: 单侧p值，越小表示当前结果越显著地慢于基线
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    index = 0
+    while index < len(combined):
+        end = index
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[index][0]:
+            end += 1
+        average_rank = (index + end) / 2 + 1
+        for position in range(index, end + 1):
+            ranks[position] = average_rank
+        ties = end - index + 1
+        tie_term += ties ** 3 - ties
+        index = end + 1
+    
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u_statistic = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u_statistic - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare_results(baseline, current, alpha=0.01, threshold=0.10):
+    """比较当前结果与基线
+    
+    只有同时满足统计显著（p < alpha）且中位数变慢超过阈值时才视为耗时回退；
+    WebDriver请求数是确定值，中位数增加即视为回退。
+    
+    Args:
+        baseline: 基线结果（run_benchmark 的返回值）
+        current: 当前结果
+        alpha: 显著性水平
+        threshold: 中位数相对变化的最小阈值
+        
+    Returns:
+        list: 每个流程的比较结果字典，regression 为True表示回退
+    """
+    comparisons = []
+    for name, flow in current["flows"].items():
+        base_flow = baseline["flows"].get(name)
+        if base_flow is None:
+            continue
+        base_p50 = base_flow["latency"]["p50"]
+        change = (flow["latency"]["p50"] - base_p50) / base_p50 if base_p50 else 0.0
+        p_value = mann_whitney_u(base_flow["samples"], flow["samples"])
+        base_commands = percentile(base_flow["commands"], 0.5)
+        commands = percentile(flow["commands"], 0.5)
+        latency_regression = p_value < alpha and change > threshold
+        command_regression = commands > base_commands
+        comparisons.append({
+            "flow": name,
+            "baseline_p50": base_p50,
+            "current_p50": flow["latency"]["p50"],
+            "change": change,
+            "p_value": p_value,
+            "baseline_commands": base_commands,
+            "current_commands": commands,
+            "regression": latency_regression or command_regression
+        })
+    return comparisons
+
+
+class Flow:
+    """一个基准流程：setup 准备状态（不计时），action 为被测量的操作"""
+    
+    def __init__(self, name, setup, action):
+        """初始化基准流程
+        
+        Args:
+            name: 流程名称
+            setup: 准备函数，接收 BenchmarkContext
+            action: 被测量的操作，接收 BenchmarkContext
+        """
+        self.name = name
+        self.setup = setup
+        self.action = action
+
+
+class BenchmarkContext:
+    """基准运行上下文，持有浏览器和页面对象"""
+    
+    def __init__(self, driver):
+        """初始化运行上下文
+        
+        Args:
+            driver: WebDriver实例
+        """
+        self.driver = driver
+        self.login_page = LoginPage(driver)
+        self.products_page = ProductsPage(driver)
+        self.cart_page = CartPage(driver)
+    
+    def login(self):
+        """通过会话引导登录并停留在产品页面"""
+        SessionBootstrap(self.driver).login(Config.VALID_USERNAME, Config.VALID_PASSWORD)
+        self.products_page.wait_until_present(ProductsPage.PAGE_TITLE)
+
+
+def _open_login(context):
+    context.login_page.open(Config.BASE_URL)
+
+
+def _login(context):
+    context.login_page.login(Config.VALID_USERNAME, Config.VALID_PASSWORD)
+    context.products_page.wait_until_present(ProductsPage.PAGE_TITLE)
+
+
+def _login_with_item(context):
+    context.login()
+    context.products_page.add_backpack_to_cart()
+
+
+def _open_cart(context):
+    context.products_page.click_cart_icon()
+    context.cart_page.get_cart_item_names()
+
+
+def _sort(context):
+    context.products_page.select_sort_option("hilo")
+    context.products_page.get_product_prices()
+
+
+def _logout(context):
+    context.products_page.logout()
+    context.login_page.wait_until_present(LoginPage.LOGIN_BUTTON)
+
+
+def _add_to_cart(context):
+    context.products_page.add_backpack_to_cart()
+    context.products_page.get_cart_items_count()
+
+
+FLOWS = [
+    Flow("login", _open_login, _login),
+    Flow("inventory_read", BenchmarkContext.login, lambda context: context.products_page.get_product_grid()),
+    Flow("add_to_cart", BenchmarkContext.login, _add_to_cart),
+    Flow("cart_view", _login_with_item, _open_cart),
+    Flow("sort", BenchmarkContext.login, _sort),
+    Flow("logout", BenchmarkContext.login, _logout)
+]
+
+
+def run_benchmark(driver, flows=None, iterations=20, warmup=3, reset=None):
+    """运行基准流程
+    
+    Args:
+        driver: WebDriver实例
+        flows: 要运行的流程列表，默认为全部流程
+        iterations: 每个流程的计时次数
+        warmup: 每个流程的预热次数（不计入结果）
+        reset: 每次迭代前重置浏览器状态的函数，接收driver
+        
+    Returns:
+        dict: 包含各流程样本、统计值和WebDriver请求数的结果
+    """
+    context = BenchmarkContext(driver)
+    counter = get_command_counter(driver)
+    results = {}
+    for flow in flows or FLOWS:
+        samples = []
+        commands = []
+        for iteration in range(warmup + iterations):
+            if reset is not None:
+                reset(driver)
+            flow.setup(context)
+            commands_before = counter.count
+            start_time = time.perf_counter()
+            flow.action(context)
+            elapsed = time.perf_counter() - start_time
+            if iteration >= warmup:
+                samples.append(elapsed)
+                commands.append(counter.count - commands_before)
+        results[flow.name] = {
+            "samples": samples,
+            "latency": summarize(samples),
+            "commands": commands
+        }
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "base_url": Config.BASE_URL,
+        "iterations": iterations,
+        "warmup": warmup,
+        "flows": results
+    }
+
+
+def save_results(results, path):
+    """保存基准结果
+    
+    Args:
+        results: 基准结果
+        path: 文件路径
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path):
+    """读取基准结果
+    
+    Args:
+        path: 文件路径
+        
+    Returns:
+        dict: 基准结果
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_results(results):
+    """输出各流程的统计值"""
+    print(f"{'流程':<16}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'请求数':>8}")
+    for name, flow in results["flows"].items():
+        latency = flow["latency"]
+        print(
+            f"{name:<16}{latency['p50'] * 1000:>10.1f}{latency['p95'] * 1000:>10.1f}"
+            f"{latency['p99'] * 1000:>10.1f}{percentile(flow['commands'], 0.5):>8.0f}"
+        )
+
+
+def print_comparison(comparisons):
+    """输出比较结果
+    
+    Returns:
+        bool: 是否存在回退
+    """
+    regressed = False
+    for item in comparisons:
+        status = "回退" if item["regression"] else "正常"
+        regressed = regressed or item["regression"]
+        print(
+            f"[{status}] {item['flow']}: p50 {item['baseline_p50'] * 1000:.1f}ms -> "
+            f"{item['current_p50'] * 1000:.1f}ms ({item['change']:+.1%}, p={item['p_value']:.4f}), "
+            f"请求数 {item['baseline_commands']:.0f} -> {item['current_commands']:.0f}"
+        )
+    return regressed
+
+
+def positive_int(value):
+    """解析不小于1的整数参数
+    
+    Args:
+        value: 命令行参数值
+    
+    Returns:
+        int: 解析后的整数
+    
+    Raises:
+        argparse.ArgumentTypeError: 不是整数或小于1
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"不是整数: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须不小于1: {value}")
+    return number
+
+
+def main(argv=None):
+    """命令行入口
+    
+    Returns:
+        int: 退出码，存在性能回退时为1，需要比较但基线不存在时为 EXIT_NO_BASELINE
+    """
+    parser = argparse.ArgumentParser(description="页面对象性能基准")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    run_parser = subparsers.add_parser("run", help="运行基准流程")
+    run_parser.add_argument("--iterations", type=positive_int, default=20, help="每个流程的计时次数")
+    run_parser.add_argument("--warmup", type=int, default=3, help="每个流程的预热次数")
+    run_parser.add_argument("--flows", help="逗号分隔的流程名称，默认运行全部流程")
+    run_parser.add_argument("--output", default=Config.BENCHMARK_RESULTS, help="结果文件路径")
+    run_parser.add_argument("--save-baseline", action="store_true", help="把结果保存为基线")
+    run_parser.add_argument("--compare", action="store_true", help="运行后与基线比较")
+    
+    compare_parser = subparsers.add_parser("compare", help="比较结果文件与基线")
+    compare_parser.add_argument("results", help="结果文件路径")
+    
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("--baseline", default=Config.BENCHMARK_BASELINE, help="基线文件路径")
+        sub.add_argument("--alpha", type=float, default=0.01, help="显著性水平")
+        sub.add_argument("--threshold", type=float, default=0.10, help="中位数变慢的最小比例")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "run":
+        selected = FLOWS
+        if args.flows:
+            names = args.flows.split(",")
+            selected = [flow for flow in FLOWS if flow.name in names]
+        
+        # 使用本地替身站点时，先在进程内启动站点
+        with local_site.for_target():
+            pool = DriverPool(create_driver)
+            driver = pool.acquire()
+            try:
+                results = run_benchmark(driver, selected, args.iterations, args.warmup, reset=pool.reset)
+            finally:
+                pool.release(driver, discard=True)
+        save_results(results, args.output)
+        print_results(results)
+        if args.save_baseline:
+            save_results(results, args.baseline)
+            print(f"基线已保存: {args.baseline}")
+        if not args.compare:
+            return 0
+    else:
+        results = load_results(args.results)
+    
+    if not os.path.exists(args.baseline):
+        print(f"还没有基线: {args.baseline}，请先使用 --save-baseline 运行基准")
+        return EXIT_NO_BASELINE
+    comparisons = compare_results(load_results(args.baseline), results, args.alpha, args.threshold)
+    return 1 if print_comparison(comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
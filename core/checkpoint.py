@@ -0,0 +1,185 @@
+"""浏览器状态快照 - 记录并恢复cookies、localStorage、sessionStorage和当前地址
+
+Sauce Demo 的登录状态保存在cookie中，购物车保存在localStorage中，恢复这些状态并重新打开
+记录的地址即可回到快照时的页面，不需要重放得到该状态的点击。
+只存在于DOM中的状态（例如商品列表的排序）不会被记录。
+
+夹具可以通过 ``restore_or_capture`` 使用快照：每个进程中第一次执行夹具时正常准备并记录快照，
+之后按夹具名称和参数直接恢复。
+"""
+
+import time
+from urllib.parse import urlsplit
+from config import Config
+
+# 读取当前地址和两种存储
+CAPTURE_SCRIPT = """
+return {
+    url: window.location.href,
+    local_storage: Object.assign({}, window.localStorage),
+    session_storage: Object.assign({}, window.sessionStorage)
+};
+"""
+
+# 一次脚本调用恢复cookies和两种存储；cookies为null时表示已经通过WebDriver命令恢复
+RESTORE_SCRIPT = """
+var state = arguments[0];
+if (state.cookies !== null) {
+    document.cookie.split(';').forEach(function (pair) {
+        var name = pair.split('=')[0].trim();
+        if (name) {
+            document.cookie = name + '=; expires=Thu, 01 Jan 1970 00:00:00 GMT; path=/';
+        }
+    });
+    state.cookies.forEach(function (cookie) {
+        var parts = [cookie.name + '=' + cookie.value, 'path=' + (cookie.path || '/')];
+        if (cookie.expiry) {
+            parts.push('expires=' + new Date(cookie.expiry * 1000).toUTCString());
+        }
+        if (cookie.secure) {
+            parts.push('secure');
+        }
+        if (cookie.sameSite) {
+            parts.push('samesite=' + cookie.sameSite);
+        }
+        document.cookie = parts.join('; ');
+    });
+}
+[[window.localStorage, state.local_storage], [window.sessionStorage, state.session_storage]].forEach(function (pair) {
+    pair[0].clear();
+    Object.keys(pair[1]).forEach(function (key) { pair[0].setItem(key, pair[1][key]); });
+});
+"""
+
+# 每个进程缓存的夹具快照，键为 (夹具名称, 参数, 站点地址)
+_cache = {}
+
+# 快照的使用统计
+stats = {"captures": 0, "restores": 0, "setup_time": 0.0, "restore_time": 0.0}
+
+
+def _origin(url):
+    """取出地址的源（协议、主机和端口）
+    
+    Args:
+        url: 地址
+    
+    Returns:
+        str: 源，例如 https://www.saucedemo.com
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class Checkpoint:
+    """一个浏览器状态快照"""
+    
+    def __init__(self, url, cookies, local_storage, session_storage):
+        """初始化快照
+        
+        Args:
+            url: 当前地址
+            cookies: WebDriver格式的cookies
+            local_storage: localStorage内容
+            session_storage: sessionStorage内容
+        """
+        self.url = url
+        self.cookies = cookies
+        self.local_storage = local_storage
+        self.session_storage = session_storage
+    
+    @classmethod
+    def capture(cls, driver):
+        """记录浏览器当前的状态
+        
+        Args:
+            driver: WebDriver实例
+        
+        Returns:
+            Checkpoint: 快照
+        """
+        state = driver.execute_script(CAPTURE_SCRIPT)
+        return cls(state["url"], driver.get_cookies(), state["local_storage"], state["session_storage"])
+    
+    def is_expired(self):
+        """检查记录的cookies是否已过期
+        
+        Returns:
+            bool: 是否有cookie已过期
+        """
+        now = time.time()
+        return any(cookie.get("expiry", now + 1) <= now for cookie in self.cookies)
+    
+    def restore(self, driver):
+        """把浏览器恢复到快照时的状态并重新打开记录的地址
+        
+        cookies和存储在一次脚本调用中写入；JavaScript无法写入HttpOnly的cookie，
+        存在这类cookie时改用WebDriver的cookie命令。
+        
+        Args:
+            driver: WebDriver实例
+        """
+        # cookies和存储只能写入当前源，不在同一个源时先打开站点下的一个轻量地址
+        origin = _origin(self.url)
+        if _origin(driver.current_url) != origin:
+            driver.get(origin + Config.SESSION_BOOTSTRAP_PATH)
+        cookies = self.cookies
+        if any(cookie.get("httpOnly") for cookie in self.cookies):
+            driver.delete_all_cookies()
+            for cookie in self.cookies:
+                driver.add_cookie(cookie)
+            cookies = None
+        driver.execute_script(RESTORE_SCRIPT, {
+            "cookies": cookies,
+            "local_storage": self.local_storage,
+            "session_storage": self.session_storage
+        })
+        driver.get(self.url)
+
+
+def checkpoint_key(request):
+    """生成夹具快照的缓存键
+    
+    Args:
+        request: 夹具的pytest请求对象
+    
+    Returns:
+        tuple: (夹具名称, 参数, 站点地址)
+    """
+    return request.fixturename, repr(getattr(request, "param", None)), Config.BASE_URL
+
+
+def restore_or_capture(request, driver, setup, verify=None):
+    """恢复夹具的快照，没有可用的快照时执行准备步骤并记录快照
+    
+    Args:
+        request: 夹具的pytest请求对象
+        driver: WebDriver实例
+        setup: 准备步骤，无参数
+        verify: 恢复后检查页面状态的函数，返回False时重新执行准备步骤
+    
+    Returns:
+        bool: 是否从快照恢复
+    """
+    key = checkpoint_key(request)
+    checkpoint = _cache.get(key) if Config.CHECKPOINTS else None
+    if checkpoint is not None and not checkpoint.is_expired():
+        start_time = time.perf_counter()
+        checkpoint.restore(driver)
+        if verify is None or verify():
+            stats["restores"] += 1
+            stats["restore_time"] += time.perf_counter() - start_time
+            return True
+    
+    start_time = time.perf_counter()
+    setup()
+    stats["setup_time"] += time.perf_counter() - start_time
+    if Config.CHECKPOINTS:
+        _cache[key] = Checkpoint.capture(driver)
+        stats["captures"] += 1
+    return False
+
+
+def clear_cache():
+    """清除进程内缓存的夹具快照"""
+    _cache.clear()
@@ -0,0 +1,267 @@
+"""驱动工厂 - 按启动配置创建WebDriver，并记录每种配置的启动耗时"""
+
+import os
+import threading
+import time
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from config import Config
+from .driver_resolver import get_resolver
+from .network import NetworkShaper
+from .profile_template import ProfileTemplate
+
+# 所有配置共用的Chrome参数
+COMMON_ARGUMENTS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+    "--window-size=1920,1080"
+]
+
+# 启动配置：fast 为无头快速启动，debug 为有界面的调试模式
+PROFILES = {
+    "fast": {
+        "arguments": [
+            "--headless=new",
+            "--disable-gpu",
+            "--disable-extensions",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--disable-background-networking",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--disable-background-timer-throttling",
+            "--disable-renderer-backgrounding",
+            "--disable-backgrounding-occluded-windows",
+            "--metrics-recording-only",
+            "--mute-audio",
+            "--password-store=basic"
+        ],
+        "maximize": False,
+        "driver_log": None
+    },
+    "debug": {
+        "arguments": [
+            "--start-maximized"
+        ],
+        "maximize": True,
+        "driver_log": "chromedriver.log"
+    }
+}
+
+
+class DriverFactory:
+    """WebDriver工厂
+    
+    统一负责Chrome选项、驱动路径解析、网络整形、配置模板和等待设置，
+    ``Config.get_driver``、测试夹具和演示脚本都通过它创建浏览器。
+    """
+    
+    def __init__(self, resolver=None, shaper=None, profile_template=None):
+        """初始化驱动工厂
+        
+        Args:
+            resolver: chromedriver路径解析器，默认为进程共享的解析器
+            shaper: 网络整形器，默认按 Config 创建
+            profile_template: 浏览器配置模板，默认在 Config.PROFILE_TEMPLATE 开启时创建
+        """
+        self.resolver = resolver or get_resolver()
+        self.shaper = shaper or NetworkShaper.from_config()
+        if profile_template is None and Config.PROFILE_TEMPLATE:
+            profile_template = ProfileTemplate()
+        self.profile_template = profile_template
+        self.startups = []
+        self._lock = threading.Lock()
+    
+    def build_options(self, profile=None, user_data_dir=None):
+        """生成指定启动配置的Chrome选项
+        
+        Args:
+            profile: 启动配置名称，默认为 Config.DRIVER_PROFILE
+            user_data_dir: 浏览器用户数据目录，默认由Chrome创建空的临时目录
+        
+        Returns:
+            Options: Chrome选项
+        """
+        settings = self._profile(profile)
+        options = Options()
+        
+        # 禁用凭据服务和密码管理器，避免登录后弹出保存密码的提示
+        options.add_experimental_option("prefs", {
+            "credentials_enable_service": False,
+            "profile.password_manager_enabled": False
+        })
+        # 禁用 "Chrome正受到自动测试软件的控制" 的信息栏
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        
+        for argument in COMMON_ARGUMENTS + settings["arguments"]:
+            options.add_argument(argument)
+        if user_data_dir:
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+        
+        self.shaper.configure_options(options)
+        # 失败现场需要读取浏览器控制台日志
+        logging_prefs = options.to_capabilities().get("goog:loggingPrefs", {})
+        options.set_capability("goog:loggingPrefs", dict(logging_prefs, browser="ALL"))
+        return options
+    
+    def create(self, profile=None, use_template=None):
+        """创建一个新的浏览器实例
+        
+        Args:
+            profile: 启动配置名称，默认为 Config.DRIVER_PROFILE
+            use_template: 是否从配置模板的副本启动，默认在配置了模板时使用
+        
+        Returns:
+            WebDriver: 新的浏览器实例
+        """
+        if Config.BROWSER.lower() != "chrome":
+            raise ValueError(f"不支持的浏览器类型: {Config.BROWSER}")
+        
+        profile = profile or Config.DRIVER_PROFILE
+        if use_template is None:
+            use_template = self.profile_template is not None
+        template = (self.profile_template or ProfileTemplate()) if use_template else None
+        
+        # 模板只生成一次，生成耗时不计入启动耗时；站点无法访问导致生成失败时从空配置启动
+        key = None
+        if template is not None:
+            key = template.key(self.build_options(profile).arguments)
+            try:
+                template.ensure(lambda path: self._launch(profile, path), key)
+            except (WebDriverException, OSError) as e:
+                print(f"[DriverFactory] 浏览器配置模板生成失败，使用空配置启动: {e}")
+                template = None
+        
+        start_time = time.perf_counter()
+        user_data_dir = None
+        if template is not None:
+            try:
+                user_data_dir = template.clone(key)
+            except OSError as e:
+                print(f"[DriverFactory] 浏览器配置模板复制失败，使用空配置启动: {e}")
+        driver = self._launch(profile, user_data_dir)
+        if user_data_dir:
+            ProfileTemplate.remove_on_quit(driver, user_data_dir)
+        
+        with self._lock:
+            self.startups.append({
+                "profile": profile,
+                "template": user_data_dir is not None,
+                "elapsed": time.perf_counter() - start_time
+            })
+        return driver
+    
+    def _launch(self, profile, user_data_dir=None):
+        """启动浏览器并应用等待设置和网络整形
+        
+        Args:
+            profile: 启动配置名称
+            user_data_dir: 浏览器用户数据目录
+        
+        Returns:
+            WebDriver: 新的浏览器实例
+        """
+        settings = self._profile(profile)
+        options = self.build_options(profile, user_data_dir)
+        service = Service(self.resolver.resolve(), log_output=self._driver_log(settings))
+        driver = webdriver.Chrome(service=service, options=options)
+        driver.implicitly_wait(Config.IMPLICIT_WAIT)  # 不使用隐式等待，避免与显式等待叠加
+        if settings["maximize"]:
+            driver.maximize_window()
+        self.shaper.apply(driver)
+        return driver
+    
+    def startup_stats(self):
+        """按启动配置汇总本进程的启动耗时
+        
+        Returns:
+            dict: 见 ``summarize_startups``
+        """
+        with self._lock:
+            return summarize_startups(self.startups)
+    
+    @staticmethod
+    def _profile(profile):
+        """获取启动配置
+        
+        Args:
+            profile: 启动配置名称
+        
+        Returns:
+            dict: 启动配置
+        """
+        profile = profile or Config.DRIVER_PROFILE
+        if profile not in PROFILES:
+            raise ValueError(f"不支持的启动配置: {profile}")
+        return PROFILES[profile]
+    
+    @staticmethod
+    def _driver_log(settings):
+        """获取chromedriver日志路径，调试配置把日志写入报告目录
+        
+        Args:
+            settings: 启动配置
+        
+        Returns:
+            str: 日志路径，不需要日志时为None
+        """
+        if not settings["driver_log"]:
+            return None
+        os.makedirs(Config.REPORTS_DIR, exist_ok=True)
+        return os.path.join(Config.REPORTS_DIR, settings["driver_log"])
+
+
+def summarize_startups(startups):
+    """按启动配置汇总启动耗时，从配置模板启动的浏览器单独统计
+    
+    Args:
+        startups: 启动记录列表，可以来自多个进程
+    
+    Returns:
+        dict: 每种配置的启动次数、平均、最短和最长耗时（秒），
+            使用模板的配置名称带有 "+template" 后缀
+    """
+    stats = {}
+    for startup in startups:
+        name = startup["profile"] + ("+template" if startup.get("template") else "")
+        stats.setdefault(name, []).append(startup["elapsed"])
+    return {
+        profile: {
+            "count": len(times),
+            "mean": sum(times) / len(times),
+            "min": min(times),
+            "max": max(times)
+        }
+        for profile, times in stats.items()
+    }
+
+
+_default_factory = None
+
+
+def get_factory():
+    """获取进程共享的默认驱动工厂
+    
+    Returns:
+        DriverFactory: 默认驱动工厂
+    """
+    global _default_factory
+    if _default_factory is None:
+        _default_factory = DriverFactory()
+    return _default_factory
+
+
+def create_driver(profile=None):
+    """使用默认工厂创建浏览器
+    
+    Args:
+        profile: 启动配置名称，默认为 Config.DRIVER_PROFILE
+    
+    Returns:
+        WebDriver: 新的浏览器实例
+    """
+    return get_factory().create(profile)
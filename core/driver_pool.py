@@ -0,0 +1,128 @@
+"""浏览器池 - 在测试之间复用WebDriver实例"""
+
+import threading
+from selenium.common.exceptions import WebDriverException
+
+
+class DriverPool:
+    """WebDriver池，复用浏览器实例并在归还时重置浏览器状态"""
+    
+    def __init__(self, factory, max_idle=1):
+        """初始化浏览器池
+        
+        Args:
+            factory: 创建新WebDriver实例的可调用对象
+            max_idle: 池中最多保留的空闲浏览器数量
+        """
+        self._factory = factory
+        self._max_idle = max_idle
+        self._idle = []
+        self._home_handles = {}
+        self._lock = threading.Lock()
+        self.created_count = 0
+        self.reused_count = 0
+    
+    def acquire(self, fresh=False):
+        """从池中获取一个浏览器
+        
+        Args:
+            fresh: 是否强制创建全新的浏览器
+            
+        Returns:
+            WebDriver: 可用的浏览器实例
+        """
+        if not fresh:
+            with self._lock:
+                if self._idle:
+                    self.reused_count += 1
+                    return self._idle.pop()
+        
+        driver = self._factory()
+        with self._lock:
+            self.created_count += 1
+            self._home_handles[driver.session_id] = driver.current_window_handle
+        return driver
+    
+    def release(self, driver, discard=False):
+        """归还浏览器，重置成功的浏览器会放回池中
+        
+        Args:
+            driver: 要归还的浏览器实例
+            discard: 是否直接关闭而不放回池中
+        """
+        if discard or not self.reset(driver):
+            self._quit(driver)
+            return
+        
+        with self._lock:
+            if len(self._idle) < self._max_idle:
+                self._idle.append(driver)
+                return
+        self._quit(driver)
+    
+    def reset(self, driver):
+        """重置浏览器状态：关闭多余窗口、清除cookies和本地存储、回到空白页
+        
+        Args:
+            driver: 要重置的浏览器实例
+            
+        Returns:
+            bool: 是否重置成功
+        """
+        try:
+            home = self._home_handles.get(driver.session_id)
+            handles = driver.window_handles
+            if home not in handles:
+                home = handles[0]
+            for handle in handles:
+                if handle != home:
+                    driver.switch_to.window(handle)
+                    driver.close()
+            driver.switch_to.window(home)
+            self._home_handles[driver.session_id] = home
+            
+            # 本地存储只能在页面所属的源下清除，因此需要先于跳转空白页执行
+            if driver.current_url.startswith("http"):
+                driver.execute_script(
+                    "window.localStorage.clear(); window.sessionStorage.clear();"
+                )
+            self._clear_cookies(driver)
+            driver.get("about:blank")
+            return True
+        except WebDriverException:
+            return False
+    
+    def shutdown(self):
+        """关闭池中所有空闲的浏览器"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+    
+    def _clear_cookies(self, driver):
+        """清除所有域名下的cookies
+        
+        Args:
+            driver: 浏览器实例
+        """
+        # delete_all_cookies 只作用于当前域名，Chrome下优先通过CDP清除全部cookies
+        if hasattr(driver, "execute_cdp_cmd"):
+            try:
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                return
+            except WebDriverException:
+                pass
+        driver.delete_all_cookies()
+    
+    def _quit(self, driver):
+        """关闭浏览器并忽略已失效会话的错误
+        
+        Args:
+            driver: 浏览器实例
+        """
+        with self._lock:
+            self._home_handles.pop(driver.session_id, None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
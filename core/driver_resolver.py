@@ -0,0 +1,152 @@
+"""驱动解析 - 缓存chromedriver路径，支持离线环境"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+from config import Config
+
+
+class DriverResolver:
+    """chromedriver路径解析器
+    
+    解析顺序：
+    1. 预先提供的驱动路径（CHROMEDRIVER_PATH），不访问网络
+    2. 进程内缓存，同一进程只解析一次
+    3. 磁盘清单文件，按Chrome版本记录已下载的驱动路径，同一台机器只解析一次
+    4. ChromeDriverManager 在线下载（离线模式下跳过并报错）
+    """
+    
+    _process_cache = {}
+    _lock = threading.Lock()
+    
+    def __init__(self, driver_path=None, manifest_path=None, offline=None):
+        """初始化驱动解析器
+        
+        Args:
+            driver_path: 预先提供的chromedriver路径
+            manifest_path: 磁盘清单文件路径
+            offline: 是否离线模式（禁止任何网络访问）
+        """
+        self.driver_path = driver_path if driver_path is not None else Config.CHROMEDRIVER_PATH
+        self.manifest_path = manifest_path or Config.DRIVER_MANIFEST
+        self.offline = Config.DRIVER_OFFLINE if offline is None else offline
+        self.last_resolution = None
+        self.history = []
+    
+    def resolve(self):
+        """解析chromedriver路径
+        
+        Returns:
+            str: chromedriver可执行文件路径
+        """
+        start_time = time.perf_counter()
+        path, source = self._resolve()
+        self.last_resolution = {
+            "path": path,
+            "source": source,
+            "elapsed": time.perf_counter() - start_time
+        }
+        self.history.append(self.last_resolution)
+        return path
+    
+    def _resolve(self):
+        """按顺序尝试各个解析来源
+        
+        Returns:
+            tuple: (驱动路径, 来源名称)
+        """
+        if self.driver_path:
+            if not os.path.isfile(self.driver_path):
+                raise FileNotFoundError(f"CHROMEDRIVER_PATH 指向的驱动不存在: {self.driver_path}")
+            return self.driver_path, "provided"
+        
+        with DriverResolver._lock:
+            cached = DriverResolver._process_cache.get(self.manifest_path)
+            if cached and os.path.isfile(cached):
+                return cached, "process"
+            
+            browser_version = self._detect_browser_version()
+            manifest = self._load_manifest()
+            entry = manifest.get(browser_version)
+            if entry and os.path.isfile(entry["path"]):
+                DriverResolver._process_cache[self.manifest_path] = entry["path"]
+                return entry["path"], "manifest"
+            
+            if self.offline:
+                raise FileNotFoundError(
+                    f"离线模式下未找到Chrome {browser_version} 对应的驱动，"
+                    f"请设置 CHROMEDRIVER_PATH 或预先生成清单文件: {self.manifest_path}"
+                )
+            
+            path = ChromeDriverManager().install()
+            manifest[browser_version] = {
+                "path": path,
+                "resolved_at": datetime.now().isoformat(timespec="seconds")
+            }
+            self._save_manifest(manifest)
+            DriverResolver._process_cache[self.manifest_path] = path
+            return path, "download"
+    
+    def _detect_browser_version(self):
+        """获取本机Chrome版本，作为清单文件的键
+        
+        Returns:
+            str: Chrome版本号，无法识别时返回 "unknown"
+        """
+        try:
+            version = OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+        except Exception:
+            version = None
+        return version or "unknown"
+    
+    def _load_manifest(self):
+        """读取磁盘清单文件
+        
+        Returns:
+            dict: Chrome版本到驱动信息的映射
+        """
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_manifest(self, manifest):
+        """原子地写入磁盘清单文件，避免并发进程读到半写入的内容
+        
+        Args:
+            manifest: Chrome版本到驱动信息的映射
+        """
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+
+_default_resolver = None
+
+
+def get_resolver():
+    """获取进程共享的默认驱动解析器
+    
+    Returns:
+        DriverResolver: 默认驱动解析器
+    """
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = DriverResolver()
+    return _default_resolver
+
+
+def resolve_chromedriver():
+    """使用默认解析器获取chromedriver路径
+    
+    Returns:
+        str: chromedriver可执行文件路径
+    """
+    return get_resolver().resolve()
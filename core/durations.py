@@ -0,0 +1,332 @@
+"""测试耗时记录 - 在SQLite中追加保存每次运行中每个测试的耗时和结果
+
+用法::
+
+    # 最慢的测试（按最近几次运行的耗时中位数）
+    python -m core.durations slowest --limit 10
+    
+    # 某个测试在最近几次运行中的耗时趋势
+    python -m core.durations trend test_cart --runs 20
+    
+    # 最近几次运行中失败过的测试
+    python -m core.durations failures --runs 5
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from config import Config
+
+# 估算测试耗时时参考的最近运行次数
+RECENT_RUNS = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    finished REAL,
+    workers INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    setup REAL NOT NULL DEFAULT 0,
+    call REAL NOT NULL DEFAULT 0,
+    teardown REAL NOT NULL DEFAULT 0,
+    duration REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    recorded REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_nodeid ON results (nodeid, run_id);
+"""
+
+
+class DurationStore:
+    """测试耗时存储
+    
+    每次运行在 ``runs`` 表中追加一行，每个测试在 ``results`` 表中追加一行，记录最后一次尝试的
+    setup/call/teardown 各阶段耗时和结果，以及尝试次数，历史记录只追加不修改。
+    并行运行时控制进程创建运行记录，各worker把自己的结果写入同一个运行。
+    """
+    
+    def __init__(self, path=None, legacy_path=None):
+        """初始化耗时存储
+        
+        Args:
+            path: SQLite数据库路径，默认为 Config.DURATIONS_DB
+            legacy_path: 旧版JSON耗时记录的路径，默认为数据库所在目录中的 durations.json
+        """
+        self.path = path or Config.DURATIONS_DB
+        if legacy_path is None:
+            legacy_path = Config.DURATIONS_FILE if path is None else os.path.join(
+                os.path.dirname(os.path.abspath(path)), os.path.basename(Config.DURATIONS_FILE)
+            )
+        self.legacy_path = legacy_path
+        self.run_id = None
+        self._current = {}
+    
+    def connect(self):
+        """打开数据库连接，必要时创建表并导入旧的JSON耗时记录
+        
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        self._migrate(connection)
+        self._import_legacy(connection)
+        return connection
+    
+    @staticmethod
+    def _migrate(connection):
+        """为旧版数据库的 results 表补上 attempts 列，已有记录按只执行一次处理
+        
+        Args:
+            connection: 数据库连接
+        """
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(results)")}
+        if "attempts" not in columns:
+            with connection:
+                connection.execute("ALTER TABLE results ADD COLUMN attempts INTEGER NOT NULL DEFAULT 1")
+    
+    def _import_legacy(self, connection):
+        """把旧版 durations.json 中的耗时作为一次运行导入空数据库
+        
+        Args:
+            connection: 数据库连接
+        """
+        if not os.path.exists(self.legacy_path):
+            return
+        if connection.execute("SELECT 1 FROM runs LIMIT 1").fetchone():
+            return
+        try:
+            with open(self.legacy_path, encoding="utf-8") as f:
+                durations = json.load(f)
+        except (OSError, ValueError):
+            return
+        recorded = os.path.getmtime(self.legacy_path)
+        with connection:
+            run_id = connection.execute(
+                "INSERT INTO runs (started, finished) VALUES (?, ?)", (recorded, recorded)
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO results (run_id, nodeid, duration, outcome, recorded) VALUES (?, ?, ?, 'passed', ?)",
+                [(run_id, nodeid, duration, recorded) for nodeid, duration in durations.items()]
+            )
+    
+    def start_run(self):
+        """开始一次运行
+        
+        Returns:
+            int: 运行ID
+        """
+        with self.connect() as connection:
+            self.run_id = connection.execute("INSERT INTO runs (started) VALUES (?)", (time.time(),)).lastrowid
+        connection.close()
+        return self.run_id
+    
+    def finish_run(self, workers=0):
+        """记录运行结束时间
+        
+        Args:
+            workers: 并行worker数量，串行运行时为0
+        """
+        if self.run_id is None:
+            return
+        with self.connect() as connection:
+            connection.execute(
+                "UPDATE runs SET finished = ?, workers = ? WHERE id = ?", (time.time(), workers, self.run_id)
+            )
+        connection.close()
+    
+    def record(self, nodeid, when, duration, outcome):
+        """记录本次运行中某个测试阶段的耗时和结果
+        
+        失败重试时同一个测试会再次从 setup 开始，此时丢弃之前尝试的耗时和结果，
+        只保存最后一次尝试，尝试次数单独记录。
+        
+        Args:
+            nodeid: 测试节点ID
+            when: 测试阶段 (setup, call, teardown)
+            duration: 阶段耗时（秒）
+            outcome: 阶段结果 (passed, failed, skipped)
+        """
+        if when == "setup":
+            attempts = self._current[nodeid]["attempts"] + 1 if nodeid in self._current else 1
+            self._current[nodeid] = {
+                "setup": 0.0, "call": 0.0, "teardown": 0.0, "outcome": "passed", "attempts": attempts
+            }
+        result = self._current.setdefault(
+            nodeid, {"setup": 0.0, "call": 0.0, "teardown": 0.0, "outcome": "passed", "attempts": 1}
+        )
+        result[when] = result.get(when, 0.0) + duration
+        # 任一阶段失败即记为失败；只有 setup 被跳过时记为跳过
+        if outcome == "failed":
+            result["outcome"] = "failed"
+        elif outcome == "skipped" and result["outcome"] == "passed":
+            result["outcome"] = "skipped"
+    
+    def save(self):
+        """把本次运行记录的测试结果追加写入数据库"""
+        if not self._current:
+            return
+        if self.run_id is None:
+            self.start_run()
+        recorded = time.time()
+        rows = [
+            (self.run_id, nodeid, result["setup"], result["call"], result["teardown"],
+             result["setup"] + result["call"] + result["teardown"], result["outcome"], result["attempts"], recorded)
+            for nodeid, result in self._current.items()
+        ]
+        with self.connect() as connection:
+            connection.executemany(
+                "INSERT INTO results (run_id, nodeid, setup, call, teardown, duration, outcome, attempts, recorded) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        connection.close()
+        self._current = {}
+    
+    def _query(self, sql, parameters=()):
+        """执行查询，数据库不存在时返回空结果
+        
+        Args:
+            sql: SQL语句
+            parameters: 查询参数
+        
+        Returns:
+            list: 查询结果
+        """
+        if not os.path.exists(self.path):
+            return []
+        connection = self.connect()
+        try:
+            return connection.execute(sql, parameters).fetchall()
+        finally:
+            connection.close()
+    
+    def load(self, recent_runs=RECENT_RUNS):
+        """估算每个测试的耗时：最近几次通过的运行中耗时的中位数
+        
+        Args:
+            recent_runs: 参考的最近运行次数
+        
+        Returns:
+            dict: 测试节点ID到估算耗时（秒）的映射
+        """
+        samples = {}
+        for nodeid, duration in self._query(
+            "SELECT nodeid, duration FROM results WHERE outcome = 'passed' ORDER BY run_id DESC"
+        ):
+            history = samples.setdefault(nodeid, [])
+            if len(history) < recent_runs:
+                history.append(duration)
+        return {nodeid: statistics.median(history) for nodeid, history in samples.items()}
+    
+    def recent_failures(self, runs=3):
+        """最近几次运行中失败过的测试
+        
+        Args:
+            runs: 参考的最近运行次数
+        
+        Returns:
+            set: 测试节点ID集合
+        """
+        rows = self._query(
+            "SELECT DISTINCT nodeid FROM results WHERE outcome = 'failed' AND run_id IN "
+            "(SELECT DISTINCT run_id FROM results ORDER BY run_id DESC LIMIT ?)",
+            (runs,)
+        )
+        return {nodeid for (nodeid,) in rows}
+    
+    def history(self, pattern="", runs=20):
+        """查询匹配的测试在最近几次运行中的记录
+        
+        Args:
+            pattern: 测试节点ID中包含的文本
+            runs: 最近运行次数
+        
+        Returns:
+            dict: 测试节点ID到记录列表的映射，记录按运行先后排列，每条为 (运行ID, 耗时, 结果)
+        """
+        rows = self._query(
+            "SELECT nodeid, run_id, duration, outcome FROM results WHERE instr(nodeid, ?) > 0 AND run_id IN "
+            "(SELECT DISTINCT run_id FROM results ORDER BY run_id DESC LIMIT ?) ORDER BY nodeid, run_id",
+            (pattern, runs)
+        )
+        history = {}
+        for nodeid, run_id, duration, outcome in rows:
+            history.setdefault(nodeid, []).append((run_id, duration, outcome))
+        return history
+
+
+def trend(records):
+    """计算一组运行记录的耗时趋势
+    
+    Args:
+        records: (运行ID, 耗时, 结果) 列表，按运行先后排列
+    
+    Returns:
+        dict: 运行次数、失败次数、最近一次耗时、中位数，以及后一半相对前一半中位数的变化比例
+    """
+    durations = [duration for _, duration, outcome in records if outcome == "passed"]
+    summary = {
+        "runs": len(records),
+        "failures": sum(1 for _, _, outcome in records if outcome == "failed"),
+        "last": records[-1][1] if records else None,
+        "median": statistics.median(durations) if durations else None,
+        "change": None
+    }
+    if len(durations) >= 4:
+        half = len(durations) // 2
+        before = statistics.median(durations[:half])
+        after = statistics.median(durations[half:])
+        summary["change"] = (after - before) / before if before else None
+    return summary
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="查询测试耗时历史")
+    parser.add_argument("--db", default=None, help="耗时数据库路径，默认为 reports/durations.sqlite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    slowest_parser = subparsers.add_parser("slowest", help="最慢的测试")
+    slowest_parser.add_argument("--limit", type=int, default=20, help="显示数量")
+    
+    trend_parser = subparsers.add_parser("trend", help="测试的耗时趋势")
+    trend_parser.add_argument("pattern", nargs="?", default="", help="测试节点ID中包含的文本")
+    trend_parser.add_argument("--runs", type=int, default=20, help="最近运行次数")
+    
+    failures_parser = subparsers.add_parser("failures", help="最近失败过的测试")
+    failures_parser.add_argument("--runs", type=int, default=3, help="最近运行次数")
+    
+    args = parser.parse_args(argv)
+    store = DurationStore(args.db)
+    
+    if args.command == "slowest":
+        durations = sorted(store.load().items(), key=lambda item: item[1], reverse=True)
+        for nodeid, duration in durations[:args.limit]:
+            print(f"{duration:>8.2f}s  {nodeid}")
+    elif args.command == "trend":
+        print(f"{'运行':>4}{'失败':>4}{'最近(s)':>9}{'中位数(s)':>11}{'变化':>8}  测试")
+        for nodeid, records in store.history(args.pattern, args.runs).items():
+            summary = trend(records)
+            median = f"{summary['median']:.2f}" if summary["median"] is not None else "-"
+            change = f"{summary['change']:+.0%}" if summary["change"] is not None else "-"
+            print(f"{summary['runs']:>4}{summary['failures']:>4}{summary['last']:>9.2f}{median:>11}{change:>8}  {nodeid}")
+    else:
+        for nodeid in sorted(store.recent_failures(args.runs)):
+            print(nodeid)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
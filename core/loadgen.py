@@ -0,0 +1,440 @@
+"""负载生成 - 使用页面对象在一组无头浏览器上并发回放用户旅程
+
+用法::
+
+    # 在本地替身站点上以20个并发用户运行60秒，10秒内逐步启动
+    TARGET_SITE=local python -m core.loadgen --users 20 --ramp-up 10 --duration 60
+    
+    # 使用自定义旅程文件，每个用户完成3次旅程后结束
+    python -m core.loadgen --journeys journeys.json --users 5 --iterations 3
+
+旅程文件格式::
+
+    {"journeys": [
+        {"name": "buyer", "weight": 3,
+         "steps": ["login", "add_to_cart:Sauce Labs Backpack", "view_cart", "checkout"]},
+        {"name": "browser", "weight": 1, "steps": ["login", "sort:hilo", "logout"]}
+    ]}
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from core.benchmark import percentile
+from core.driver_factory import create_driver as default_create_driver
+from core.driver_pool import DriverPool
+from core import local_site
+from core.metrics import MetricsRecorder
+from pages import LoginPage, ProductsPage, CartPage
+
+# 延迟直方图的桶上界（毫秒），最后一个桶收集更慢的样本
+HISTOGRAM_BUCKETS = [50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# 默认旅程
+DEFAULT_JOURNEYS = [
+    {
+        "name": "buyer",
+        "weight": 3,
+        "steps": ["login", "add_to_cart:Sauce Labs Backpack", "add_to_cart:Sauce Labs Bike Light",
+                  "view_cart", "checkout"]
+    },
+    {
+        "name": "window_shopper",
+        "weight": 1,
+        "steps": ["login", "sort:lohi", "add_to_cart:Sauce Labs Onesie", "view_cart", "continue_shopping", "logout"]
+    }
+]
+
+
+class Shopper:
+    """一个模拟用户持有的浏览器和页面对象"""
+    
+    def __init__(self, driver, recorder=None):
+        """初始化模拟用户
+        
+        Args:
+            driver: WebDriver实例
+            recorder: 页面对象记录操作指标的收集器，默认为进程共享的收集器
+        """
+        self.driver = driver
+        self.login_page = LoginPage(driver, recorder)
+        self.products_page = ProductsPage(driver, recorder)
+        self.cart_page = CartPage(driver, recorder)
+
+
+def _login(shopper, argument):
+    shopper.login_page.open(Config.BASE_URL)
+    shopper.login_page.login(argument or Config.VALID_USERNAME, Config.VALID_PASSWORD)
+    shopper.products_page.wait_for_page_load()
+
+
+def _view_cart(shopper, argument):
+    shopper.products_page.click_cart_icon()
+    shopper.cart_page.wait_for_page_load()
+
+
+def _checkout(shopper, argument):
+    shopper.cart_page.proceed_to_checkout()
+
+
+def _continue_shopping(shopper, argument):
+    shopper.cart_page.click_continue_shopping()
+    shopper.products_page.wait_for_page_load()
+
+
+def _logout(shopper, argument):
+    shopper.products_page.logout()
+    shopper.login_page.wait_for_page_load()
+
+
+# 旅程步骤：名称到 (shopper, 参数) 函数的映射，参数写在步骤名称的冒号之后
+STEPS = {
+    "login": _login,
+    "add_to_cart": lambda shopper, name: shopper.products_page.add_product_to_cart_by_name(name),
+    "remove_from_cart": lambda shopper, name: shopper.products_page.remove_product_from_cart_by_name(name),
+    "sort": lambda shopper, option: shopper.products_page.select_sort_option(option),
+    "view_cart": _view_cart,
+    "checkout": _checkout,
+    "continue_shopping": _continue_shopping,
+    "logout": _logout
+}
+
+
+def parse_step(step):
+    """拆分步骤名称和参数
+    
+    Args:
+        step: 步骤，例如 "add_to_cart:Sauce Labs Backpack"
+    
+    Returns:
+        tuple: (步骤名称, 参数)，没有参数时参数为None
+    """
+    name, _, argument = step.partition(":")
+    return name, argument or None
+
+
+def load_journeys(path):
+    """读取旅程文件
+    
+    Args:
+        path: JSON文件路径
+    
+    Returns:
+        list: 旅程列表
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["journeys"]
+
+
+class LatencyHistogram:
+    """延迟直方图，同时保留样本用于计算百分位数"""
+    
+    def __init__(self, buckets=None):
+        """初始化直方图
+        
+        Args:
+            buckets: 桶上界列表（毫秒）
+        """
+        self.buckets = list(buckets or HISTOGRAM_BUCKETS)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.samples = []
+        self.errors = 0
+    
+    def record(self, elapsed, error=False):
+        """记录一次步骤执行
+        
+        Args:
+            elapsed: 耗时（秒）
+            error: 是否失败
+        """
+        if error:
+            self.errors += 1
+            return
+        milliseconds = elapsed * 1000
+        self.samples.append(milliseconds)
+        for index, bound in enumerate(self.buckets):
+            if milliseconds <= bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+    
+    def summary(self):
+        """生成直方图摘要
+        
+        Returns:
+            dict: 次数、错误率、百分位数（毫秒）和各桶计数
+        """
+        total = len(self.samples) + self.errors
+        labels = [f"<={bound}ms" for bound in self.buckets] + [f">{self.buckets[-1]}ms"]
+        return {
+            "count": total,
+            "errors": self.errors,
+            "error_rate": self.errors / total if total else 0.0,
+            "p50": percentile(self.samples, 0.50),
+            "p95": percentile(self.samples, 0.95),
+            "p99": percentile(self.samples, 0.99),
+            "max": max(self.samples) if self.samples else None,
+            "histogram": dict(zip(labels, self.counts))
+        }
+
+
+class LoadRunner:
+    """负载运行器
+    
+    每个模拟用户在自己的线程中从浏览器池获取一个无头浏览器，按权重随机选择旅程并依次执行步骤，
+    步骤之间按思考时间暂停；旅程结束后重置浏览器状态并开始下一次旅程。
+    旅程中任一步骤失败时记录错误、放弃本次旅程并丢弃该浏览器。
+    """
+    
+    def __init__(self, journeys=None, users=10, ramp_up=0.0, duration=None, iterations=None,
+                 think_time=(0.0, 0.0), create_driver=None, steps=None, seed=None):
+        """初始化负载运行器
+        
+        Args:
+            journeys: 旅程列表，默认为 DEFAULT_JOURNEYS
+            users: 目标并发用户数
+            ramp_up: 在多少秒内逐步启动全部用户
+            duration: 运行时长（秒），与 iterations 至少指定一个
+            iterations: 每个用户完成的旅程次数
+            think_time: 步骤之间的思考时间范围 (最短, 最长)（秒）
+            create_driver: 创建浏览器的函数，默认使用 fast 启动配置
+            steps: 步骤注册表，默认为 STEPS
+            seed: 随机数种子
+        """
+        if duration is None and iterations is None:
+            raise ValueError("duration 和 iterations 至少需要指定一个")
+        self.journeys = journeys or DEFAULT_JOURNEYS
+        self.users = users
+        self.ramp_up = ramp_up
+        self.duration = duration
+        self.iterations = iterations
+        self.think_time = think_time
+        self.steps = steps or STEPS
+        self.pool = DriverPool(create_driver or (lambda: default_create_driver("fast")), max_idle=users)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.step_stats = {}
+        self.journey_stats = {}
+        self.errors = {}
+        self.active_users = 0
+        self.peak_users = 0
+        
+        for journey in self.journeys:
+            for step in journey["steps"]:
+                if parse_step(step)[0] not in self.steps:
+                    raise ValueError(f"未知的旅程步骤: {step}")
+    
+    def run(self):
+        """运行负载并返回结果
+        
+        Returns:
+            dict: 吞吐量、各步骤和各旅程的延迟直方图、错误统计
+        """
+        start_time = time.perf_counter()
+        deadline = start_time + self.duration if self.duration is not None else None
+        try:
+            with ThreadPoolExecutor(max_workers=self.users, thread_name_prefix="shopper") as executor:
+                futures = [
+                    executor.submit(self._run_user, index, start_time, deadline)
+                    for index in range(self.users)
+                ]
+                for future in futures:
+                    future.result()
+            elapsed = time.perf_counter() - start_time
+        finally:
+            self.pool.shutdown()
+        return self._report(elapsed)
+    
+    def _run_user(self, index, start_time, deadline):
+        """一个模拟用户的执行循环
+        
+        Args:
+            index: 用户序号，决定启动时间
+            start_time: 负载开始时间
+            deadline: 结束时间，按次数运行时为None
+        """
+        delay = self.ramp_up * index / self.users if self.users else 0
+        time.sleep(max(0.0, start_time + delay - time.perf_counter()))
+        with self._lock:
+            self.active_users += 1
+            self.peak_users = max(self.peak_users, self.active_users)
+        
+        completed = 0
+        try:
+            while (self.iterations is None or completed < self.iterations) and \
+                    (deadline is None or time.perf_counter() < deadline):
+                self._run_journey(self._choose_journey(), deadline)
+                completed += 1
+        finally:
+            with self._lock:
+                self.active_users -= 1
+    
+    def _choose_journey(self):
+        """按权重随机选择旅程
+        
+        Returns:
+            dict: 旅程
+        """
+        with self._lock:
+            return self._random.choices(
+                self.journeys, weights=[journey.get("weight", 1) for journey in self.journeys]
+            )[0]
+    
+    def _run_journey(self, journey, deadline):
+        """执行一次旅程
+        
+        Args:
+            journey: 旅程
+            deadline: 结束时间
+        """
+        journey_start = time.perf_counter()
+        try:
+            driver = self.pool.acquire()
+        except Exception as e:
+            # 浏览器启动失败只算这次旅程失败，不中断其他用户
+            self._record(self.journey_stats, journey["name"], time.perf_counter() - journey_start, error=True)
+            self._count_error(f"acquire: {type(e).__name__}")
+            return
+        # 每次旅程使用自己的指标收集器，并发的用户线程不共享进程级的收集器
+        shopper = Shopper(driver, MetricsRecorder())
+        failed = False
+        for position, step in enumerate(journey["steps"]):
+            if position and self.think_time[1] > 0:
+                time.sleep(self._random.uniform(*self.think_time))
+            name, argument = parse_step(step)
+            step_start = time.perf_counter()
+            try:
+                self.steps[name](shopper, argument)
+            except Exception as e:
+                failed = True
+                self._record(self.step_stats, step, time.perf_counter() - step_start, error=True)
+                self._count_error(f"{step}: {type(e).__name__}")
+                break
+            self._record(self.step_stats, step, time.perf_counter() - step_start)
+        self._record(self.journey_stats, journey["name"], time.perf_counter() - journey_start, error=failed)
+        self.pool.release(driver, discard=failed)
+    
+    def _count_error(self, key):
+        """错误统计加一
+        
+        Args:
+            key: 错误键，格式为 "<步骤>: <异常类型>"
+        """
+        with self._lock:
+            self.errors[key] = self.errors.get(key, 0) + 1
+    
+    def _record(self, stats, name, elapsed, error=False):
+        """把一次执行记录到对应的直方图
+        
+        Args:
+            stats: 步骤或旅程的直方图字典
+            name: 步骤或旅程名称
+            elapsed: 耗时（秒）
+            error: 是否失败
+        """
+        with self._lock:
+            stats.setdefault(name, LatencyHistogram()).record(elapsed, error)
+    
+    def _report(self, elapsed):
+        """生成负载结果
+        
+        Args:
+            elapsed: 实际运行时长（秒）
+        
+        Returns:
+            dict: 负载结果
+        """
+        journeys = {name: histogram.summary() for name, histogram in self.journey_stats.items()}
+        completed = sum(summary["count"] - summary["errors"] for summary in journeys.values())
+        total = sum(summary["count"] for summary in journeys.values())
+        steps = {name: histogram.summary() for name, histogram in self.step_stats.items()}
+        return {
+            "base_url": Config.BASE_URL,
+            "users": self.users,
+            "peak_users": self.peak_users,
+            "ramp_up": self.ramp_up,
+            "elapsed": elapsed,
+            "journeys_completed": completed,
+            "journeys_failed": total - completed,
+            "throughput": completed / elapsed if elapsed else 0.0,
+            "steps_per_second": sum(summary["count"] for summary in steps.values()) / elapsed if elapsed else 0.0,
+            "error_rate": (total - completed) / total if total else 0.0,
+            "browsers_created": self.pool.created_count,
+            "steps": steps,
+            "journeys": journeys,
+            "errors": dict(self.errors)
+        }
+
+
+def print_report(report):
+    """输出负载结果"""
+    print(f"目标: {report['base_url']}  用户: {report['users']}（峰值 {report['peak_users']}）  "
+          f"时长: {report['elapsed']:.1f}s  浏览器: {report['browsers_created']}")
+    print(f"吞吐量: {report['throughput']:.2f} 旅程/秒，{report['steps_per_second']:.2f} 步骤/秒  "
+          f"完成 {report['journeys_completed']}，失败 {report['journeys_failed']}，错误率 {report['error_rate']:.1%}")
+    print(f"\n{'步骤':<36}{'次数':>6}{'错误率':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}")
+    for name, summary in report["steps"].items():
+        p50, p95, p99 = (summary[key] if summary[key] is not None else float("nan") for key in ("p50", "p95", "p99"))
+        print(f"{name:<36}{summary['count']:>6}{summary['error_rate']:>8.1%}{p50:>10.0f}{p95:>10.0f}{p99:>10.0f}")
+    for name, summary in report["steps"].items():
+        print(f"\n{name} 延迟分布:")
+        peak = max(summary["histogram"].values()) or 1
+        for label, count in summary["histogram"].items():
+            print(f"  {label:>10} {'#' * round(count * 40 / peak):<40} {count}")
+    if report["errors"]:
+        print("\n错误:")
+        for key, count in sorted(report["errors"].items(), key=lambda item: -item[1]):
+            print(f"  {count:>5}  {key}")
+
+
+def main(argv=None):
+    """命令行入口
+    
+    Returns:
+        int: 退出码，存在失败的旅程时为1
+    """
+    parser = argparse.ArgumentParser(description="使用页面对象并发回放用户旅程")
+    parser.add_argument("--users", type=int, default=10, help="目标并发用户数")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="在多少秒内逐步启动全部用户")
+    parser.add_argument("--duration", type=float, help="运行时长（秒）")
+    parser.add_argument("--iterations", type=int, help="每个用户完成的旅程次数")
+    parser.add_argument("--think-time", default="0,0", help="步骤之间的思考时间范围，例如 0.5,2")
+    parser.add_argument("--journeys", help="旅程JSON文件，默认使用内置旅程")
+    parser.add_argument("--output", default=Config.LOADGEN_RESULTS, help="结果文件路径")
+    parser.add_argument("--seed", type=int, help="随机数种子")
+    args = parser.parse_args(argv)
+    
+    if args.duration is None and args.iterations is None:
+        args.duration = 60.0
+    think_time = tuple(float(value) for value in args.think_time.split(","))
+    if len(think_time) == 1:
+        think_time = (think_time[0], think_time[0])
+    
+    # 使用本地替身站点时，先在进程内启动站点
+    with local_site.for_target():
+        runner = LoadRunner(
+            journeys=load_journeys(args.journeys) if args.journeys else None,
+            users=args.users,
+            ramp_up=args.ramp_up,
+            duration=args.duration,
+            iterations=args.iterations,
+            think_time=think_time,
+            seed=args.seed
+        )
+        report = runner.run()
+    
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print_report(report)
+    return 1 if report["journeys_failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""
+Local Site Package
+
+进程内运行的 Sauce Demo 替身站点，用于无网络、可复现的快速测试。
+"""
+
+from .catalog import PRODUCTS, product_slug
+from .server import LocalSite, for_target
+
+__all__ = [
+    'LocalSite',
+    'PRODUCTS',
+    'for_target',
+    'product_slug'
+]
@@ -0,0 +1,89 @@
+"""本地站点商品目录 - 与 Sauce Demo 一致的商品数据和账号"""
+
+# 可以正常登录的账号，密码统一为 PASSWORD
+USERS = [
+    "standard_user",
+    "problem_user",
+    "performance_glitch_user",
+    "error_user",
+    "visual_user"
+]
+LOCKED_USERS = ["locked_out_user"]
+PASSWORD = "secret_sauce"
+
+PRODUCTS = [
+    {
+        "id": 4,
+        "name": "Sauce Labs Backpack",
+        "price": 29.99,
+        "description": "carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising style with unequaled laptop and tablet protection."
+    },
+    {
+        "id": 0,
+        "name": "Sauce Labs Bike Light",
+        "price": 9.99,
+        "description": "A red light isn't the desired state in testing but it sure helps when riding your bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included."
+    },
+    {
+        "id": 1,
+        "name": "Sauce Labs Bolt T-Shirt",
+        "price": 15.99,
+        "description": "Get your testing superhero on with the Sauce Labs bolt T-shirt. From American Apparel, 100% ringspun combed cotton, heather gray with red bolt."
+    },
+    {
+        "id": 5,
+        "name": "Sauce Labs Fleece Jacket",
+        "price": 49.99,
+        "description": "It's not every day that you come across a midweight quarter-zip fleece jacket capable of handling everything from a relaxing day outdoors to a busy day at the office."
+    },
+    {
+        "id": 2,
+        "name": "Sauce Labs Onesie",
+        "price": 7.99,
+        "description": "Rib snap infant onesie for the junior automation engineer in development. Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel."
+    },
+    {
+        "id": 3,
+        "name": "Test.allTheThings() T-Shirt (Red)",
+        "price": 15.99,
+        "description": "This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard to automate a few tests. Super-soft and comfy ringspun combed cotton."
+    }
+]
+
+SORT_OPTIONS = [
+    ("az", "Name (A to Z)"),
+    ("za", "Name (Z to A)"),
+    ("lohi", "Price (low to high)"),
+    ("hilo", "Price (high to low)")
+]
+
+
+def product_slug(name):
+    """生成商品按钮id使用的标识，规则与 Sauce Demo 相同
+    
+    Args:
+        name: 商品名称
+        
+    Returns:
+        str: 商品标识，例如 sauce-labs-backpack
+    """
+    return "-".join(name.lower().split(" "))
+
+
+def sort_products(products, option):
+    """按排序选项排列商品
+    
+    Args:
+        products: 商品列表
+        option: 排序选项 (az, za, lohi, hilo)
+        
+    Returns:
+        list: 排序后的商品列表
+    """
+    if option == "za":
+        return sorted(products, key=lambda product: product["name"], reverse=True)
+    if option == "lohi":
+        return sorted(products, key=lambda product: product["price"])
+    if option == "hilo":
+        return sorted(products, key=lambda product: product["price"], reverse=True)
+    return sorted(products, key=lambda product: product["name"])
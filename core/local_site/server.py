@@ -0,0 +1,337 @@
+"""本地站点服务 - 在进程内运行的 Sauce Demo 替身，用于无网络、可复现的测试"""
+
+import html
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from urllib.parse import parse_qs, unquote, urlsplit
+from config import Config
+from .catalog import LOCKED_USERS, PASSWORD, PRODUCTS, SORT_OPTIONS, USERS, product_slug, sort_products
+
+SITE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(SITE_DIR, "templates")
+STATIC_DIR = os.path.join(SITE_DIR, "static")
+
+STATIC_TYPES = {
+    ".js": "application/javascript; charset=utf-8",
+    ".css": "text/css; charset=utf-8"
+}
+
+
+def _load_template(name):
+    """读取页面模板
+    
+    Args:
+        name: 模板文件名（不含扩展名）
+        
+    Returns:
+        Template: 页面模板
+    """
+    with open(os.path.join(TEMPLATES_DIR, f"{name}.html"), encoding="utf-8") as f:
+        return Template(f.read())
+
+
+def _favicon_png():
+    """生成一个1x1的PNG图标，用作 /favicon.ico 的响应
+    
+    Returns:
+        bytes: PNG图片内容
+    """
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xffffffff)
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 6, 0, 0, 0)
+    pixels = zlib.compress(b"\x00\xe2\x23\x1a\xff")
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", pixels) + chunk(b"IEND", b"")
+
+
+def _product_image(product):
+    """生成商品占位图片
+    
+    Args:
+        product: 商品信息
+        
+    Returns:
+        bytes: SVG图片内容
+    """
+    hue = (product["id"] * 57) % 360
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="320" height="320" viewBox="0 0 320 320">'
+        f'<rect width="320" height="320" fill="hsl({hue}, 60%, 85%)"/>'
+        f'<text x="160" y="170" font-size="20" text-anchor="middle">{html.escape(product["name"])}</text>'
+        '</svg>'
+    ).encode("utf-8")
+
+
+class LocalSite:
+    """本地站点，复现 Sauce Demo 的登录、商品列表、排序、购物车和登出流程
+    
+    页面使用与线上站点相同的元素id和data-test属性，登录状态保存在
+    ``session-username`` cookie中，购物车保存在localStorage的 ``cart-contents`` 中。
+    """
+    
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0):
+        """初始化本地站点
+        
+        Args:
+            host: 监听地址
+            port: 监听端口，0表示随机端口
+            latency_ms: 每个响应注入的延迟（毫秒）
+        """
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.request_count = 0
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._templates = {
+            name: _load_template(name)
+            for name in ("layout", "login", "header", "inventory", "inventory_item", "cart", "checkout", "not_found")
+        }
+        self._site_json = json.dumps({
+            "users": USERS,
+            "lockedUsers": LOCKED_USERS,
+            "password": PASSWORD,
+            "products": [dict(product, slug=product_slug(product["name"])) for product in PRODUCTS]
+        })
+    
+    @property
+    def base_url(self):
+        """站点地址
+        
+        Returns:
+            str: 形如 http://127.0.0.1:54321 的地址
+        """
+        return f"http://{self.host}:{self.port}"
+    
+    def start(self):
+        """在后台线程中启动站点
+        
+        Returns:
+            LocalSite: 站点本身，便于链式调用
+        """
+        site = self
+        
+        class Handler(LocalSiteHandler):
+            pass
+        Handler.site = site
+        
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-site", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """停止站点"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def count_request(self):
+        """记录一次请求"""
+        with self._lock:
+            self.request_count += 1
+    
+    def render(self, page, body):
+        """渲染完整页面
+        
+        Args:
+            page: 页面名称，写入body的data-page属性
+            body: 页面主体HTML
+            
+        Returns:
+            str: 完整的HTML
+        """
+        return self._templates["layout"].substitute(page=page, body=body, site_json=self._site_json)
+    
+    def render_header(self, title, secondary=""):
+        """渲染登录后页面的公共页头
+        
+        Args:
+            title: 页面标题
+            secondary: 标题右侧的附加内容
+            
+        Returns:
+            str: 页头HTML
+        """
+        return self._templates["header"].substitute(title=html.escape(title), secondary=secondary)
+    
+    def render_login(self):
+        """渲染登录页面"""
+        return self.render("login", self._templates["login"].substitute())
+    
+    def render_inventory(self, sort_option="az"):
+        """渲染商品列表页面，商品按排序选项在服务端排列
+        
+        Args:
+            sort_option: 排序选项 (az, za, lohi, hilo)
+        """
+        if sort_option not in dict(SORT_OPTIONS):
+            sort_option = "az"
+        options = "".join(
+            f'<option value="{value}"{" selected" if value == sort_option else ""}>{label}</option>'
+            for value, label in SORT_OPTIONS
+        )
+        secondary = (
+            '<div class="right_component"><span class="select_container">'
+            f'<span class="active_option" data-test="active-option">{dict(SORT_OPTIONS)[sort_option]}</span>'
+            f'<select class="product_sort_container" data-test="product-sort-container">{options}</select>'
+            '</span></div>'
+        )
+        items = "".join(
+            self._templates["inventory_item"].substitute(
+                id=product["id"],
+                name=html.escape(product["name"]),
+                slug=html.escape(product_slug(product["name"])),
+                description=html.escape(product["description"]),
+                price=f"{product['price']:.2f}"
+            )
+            for product in sort_products(PRODUCTS, sort_option)
+        )
+        body = self._templates["inventory"].substitute(
+            header=self.render_header("Products", secondary), items=items
+        )
+        return self.render("inventory", body)
+    
+    def render_cart(self):
+        """渲染购物车页面，购物车内容由前端根据localStorage渲染"""
+        body = self._templates["cart"].substitute(header=self.render_header("Your Cart"))
+        return self.render("cart", body)
+    
+    def render_checkout(self):
+        """渲染结账信息页面"""
+        body = self._templates["checkout"].substitute(header=self.render_header("Checkout: Your Information"))
+        return self.render("checkout", body)
+    
+    def render_not_found(self, path):
+        """渲染404页面
+        
+        Args:
+            path: 请求路径
+        """
+        return self.render("not_found", self._templates["not_found"].substitute(path=html.escape(path)))
+
+
+@contextmanager
+def for_target(always=False):
+    """按 Config.TARGET_SITE 准备测试网站：为 local 时在进程内启动本地站点并把 Config.BASE_URL 指向它，
+    退出时停止站点并恢复 Config.BASE_URL
+    
+    Args:
+        always: 目标不是本地站点时也启动站点，但不替换 Config.BASE_URL
+    
+    Yields:
+        LocalSite: 启动的本地站点，没有启动时为None
+    """
+    local = Config.TARGET_SITE == "local"
+    if not local and not always:
+        yield None
+        return
+    base_url = Config.BASE_URL
+    with LocalSite(latency_ms=Config.LOCAL_SITE_LATENCY_MS) as site:
+        if local:
+            Config.BASE_URL = site.base_url
+        try:
+            yield site
+        finally:
+            Config.BASE_URL = base_url
+
+
+class LocalSiteHandler(BaseHTTPRequestHandler):
+    """本地站点的请求处理器"""
+    
+    site = None
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        """处理GET请求"""
+        self.site.count_request()
+        if self.site.latency_ms:
+            time.sleep(self.site.latency_ms / 1000)
+        
+        url = urlsplit(self.path)
+        path = unquote(url.path)
+        query = parse_qs(url.query)
+        
+        if path in ("/", "/index.html"):
+            self._send_html(self.site.render_login())
+        elif path == "/inventory.html":
+            self._send_html(self.site.render_inventory(query.get("sort", ["az"])[0]))
+        elif path == "/cart.html":
+            self._send_html(self.site.render_cart())
+        elif path == "/checkout-step-one.html":
+            self._send_html(self.site.render_checkout())
+        elif path == "/favicon.ico":
+            self._send(200, "image/png", _favicon_png())
+        elif path.startswith("/static/img/") and path.endswith(".svg"):
+            self._send_product_image(path[len("/static/img/"):-len(".svg")])
+        elif path.startswith("/static/"):
+            self._send_static(path[len("/static/"):])
+        else:
+            self._send_html(self.site.render_not_found(path), status=404)
+    
+    def log_message(self, format, *args):
+        """不输出访问日志"""
+    
+    def _send(self, status, content_type, body, cache=False):
+        """发送响应
+        
+        Args:
+            status: HTTP状态码
+            content_type: 内容类型
+            body: 响应内容
+            cache: 是否允许浏览器缓存
+        """
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "max-age=3600" if cache else "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _send_html(self, text, status=200):
+        """发送HTML页面"""
+        self._send(status, "text/html; charset=utf-8", text.encode("utf-8"))
+    
+    def _send_static(self, name):
+        """发送静态资源
+        
+        Args:
+            name: static目录下的文件名
+        """
+        extension = os.path.splitext(name)[1]
+        file_path = os.path.join(STATIC_DIR, os.path.basename(name))
+        if extension not in STATIC_TYPES or not os.path.isfile(file_path):
+            self._send_html(self.site.render_not_found(self.path), status=404)
+            return
+        with open(file_path, "rb") as f:
+            self._send(200, STATIC_TYPES[extension], f.read(), cache=True)
+    
+    def _send_product_image(self, slug):
+        """发送商品图片
+        
+        Args:
+            slug: 商品标识
+        """
+        for product in PRODUCTS:
+            if product_slug(product["name"]) == slug:
+                self._send(200, "image/svg+xml", _product_image(product), cache=True)
+                return
+        self._send_html(self.site.render_not_found(self.path), status=404)
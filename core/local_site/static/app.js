@@ -0,0 +1,333 @@
+/* 本地站点前端逻辑：登录、商品列表、排序、购物车和登出，状态保存在cookie和localStorage中 */
+(function () {
+    'use strict';
+
+    var SESSION_COOKIE = 'session-username';
+    var SESSION_MAX_AGE = 600;
+    var CART_KEY = 'cart-contents';
+    var LOGIN_ERROR_KEY = 'login-error';
+
+    var site = window.SITE || {};
+    var products = site.products || [];
+
+    function getSessionUser() {
+        var match = document.cookie.match(new RegExp('(?:^|; )' + SESSION_COOKIE + '=([^;]*)'));
+        return match ? decodeURIComponent(match[1]) : null;
+    }
+
+    function setSessionUser(username) {
+        document.cookie = SESSION_COOKIE + '=' + encodeURIComponent(username) +
+            '; path=/; max-age=' + SESSION_MAX_AGE;
+    }
+
+    function clearSession() {
+        document.cookie = SESSION_COOKIE + '=; path=/; max-age=0';
+    }
+
+    function readCart() {
+        try {
+            return JSON.parse(window.localStorage.getItem(CART_KEY)) || [];
+        } catch (error) {
+            return [];
+        }
+    }
+
+    function writeCart(ids) {
+        if (ids.length) {
+            window.localStorage.setItem(CART_KEY, JSON.stringify(ids));
+        } else {
+            window.localStorage.removeItem(CART_KEY);
+        }
+    }
+
+    function findProduct(id) {
+        for (var i = 0; i < products.length; i++) {
+            if (products[i].id === id) {
+                return products[i];
+            }
+        }
+        return null;
+    }
+
+    function element(tag, attributes, text) {
+        var node = document.createElement(tag);
+        Object.keys(attributes || {}).forEach(function (name) {
+            node.setAttribute(name, attributes[name]);
+        });
+        if (text !== undefined) {
+            node.textContent = text;
+        }
+        return node;
+    }
+
+    function requireLogin() {
+        if (getSessionUser()) {
+            return true;
+        }
+        window.sessionStorage.setItem(
+            LOGIN_ERROR_KEY,
+            "Epic sadface: You can only access '" + window.location.pathname + "' when you are logged in."
+        );
+        window.location.replace('/');
+        return false;
+    }
+
+    /* 登录页面 */
+
+    function showLoginError(message) {
+        var container = document.getElementById('error-container');
+        container.innerHTML = '';
+        container.classList.add('error');
+        var heading = element('h3', {'data-test': 'error'});
+        var close = element('button', {'class': 'error-button', 'data-test': 'error-button', 'aria-label': 'close'});
+        close.addEventListener('click', hideLoginError);
+        heading.appendChild(close);
+        heading.appendChild(document.createTextNode(message));
+        container.appendChild(heading);
+        document.getElementById('user-name').classList.add('input_error');
+        document.getElementById('password').classList.add('input_error');
+    }
+
+    function hideLoginError() {
+        var container = document.getElementById('error-container');
+        container.innerHTML = '';
+        container.classList.remove('error');
+        document.getElementById('user-name').classList.remove('input_error');
+        document.getElementById('password').classList.remove('input_error');
+    }
+
+    function validateLogin(username, password) {
+        if (!username) {
+            return 'Epic sadface: Username is required';
+        }
+        if (!password) {
+            return 'Epic sadface: Password is required';
+        }
+        if (password === site.password && site.lockedUsers.indexOf(username) !== -1) {
+            return 'Epic sadface: Sorry, this user has been locked out.';
+        }
+        if (password !== site.password || site.users.indexOf(username) === -1) {
+            return 'Epic sadface: Username and password do not match any user in this service';
+        }
+        return null;
+    }
+
+    function initLogin() {
+        var pendingError = window.sessionStorage.getItem(LOGIN_ERROR_KEY);
+        if (pendingError) {
+            window.sessionStorage.removeItem(LOGIN_ERROR_KEY);
+            showLoginError(pendingError);
+        }
+        document.getElementById('login-form').addEventListener('submit', function (event) {
+            event.preventDefault();
+            var username = document.getElementById('user-name').value;
+            var password = document.getElementById('password').value;
+            var error = validateLogin(username, password);
+            if (error) {
+                showLoginError(error);
+                return;
+            }
+            setSessionUser(username);
+            window.location.href = '/inventory.html';
+        });
+    }
+
+    /* 公共页头：菜单、购物车徽章、登出 */
+
+    function updateCartBadge() {
+        var link = document.querySelector('[data-test="shopping-cart-link"]');
+        var badge = link.querySelector('[data-test="shopping-cart-badge"]');
+        var count = readCart().length;
+        if (!count) {
+            if (badge) {
+                link.removeChild(badge);
+            }
+            return;
+        }
+        if (!badge) {
+            badge = element('span', {'class': 'shopping_cart_badge', 'data-test': 'shopping-cart-badge'});
+            link.appendChild(badge);
+        }
+        badge.textContent = String(count);
+    }
+
+    function setMenuOpen(open) {
+        var menu = document.getElementById('menu');
+        menu.hidden = !open;
+        menu.setAttribute('aria-hidden', open ? 'false' : 'true');
+    }
+
+    function initHeader() {
+        document.getElementById('react-burger-menu-btn').addEventListener('click', function () {
+            setMenuOpen(true);
+        });
+        document.getElementById('react-burger-cross-btn').addEventListener('click', function () {
+            setMenuOpen(false);
+        });
+        document.getElementById('logout_sidebar_link').addEventListener('click', function (event) {
+            event.preventDefault();
+            clearSession();
+            window.location.href = '/';
+        });
+        document.getElementById('reset_sidebar_link').addEventListener('click', function (event) {
+            event.preventDefault();
+            writeCart([]);
+            updateCartBadge();
+            syncInventoryButtons();
+        });
+        updateCartBadge();
+    }
+
+    /* 商品列表页面 */
+
+    function setCartButton(button, slug, inCart) {
+        var id = (inCart ? 'remove-' : 'add-to-cart-') + slug;
+        button.id = id;
+        button.name = id;
+        button.setAttribute('data-test', id);
+        button.textContent = inCart ? 'Remove' : 'Add to cart';
+        button.className = 'btn btn_small btn_inventory ' + (inCart ? 'btn_secondary' : 'btn_primary');
+    }
+
+    function syncInventoryButtons() {
+        var cart = readCart();
+        Array.prototype.forEach.call(document.querySelectorAll('[data-test="inventory-item"]'), function (item) {
+            var product = findProduct(Number(item.getAttribute('data-product-id')));
+            if (product) {
+                setCartButton(item.querySelector('button'), product.slug, cart.indexOf(product.id) !== -1);
+            }
+        });
+    }
+
+    function sortInventory(option) {
+        var list = document.querySelector('[data-test="inventory-list"]');
+        var items = Array.prototype.slice.call(list.querySelectorAll('[data-test="inventory-item"]'));
+        var compare = {
+            az: function (a, b) { return a.name < b.name ? -1 : a.name > b.name ? 1 : 0; },
+            za: function (a, b) { return a.name < b.name ? 1 : a.name > b.name ? -1 : 0; },
+            lohi: function (a, b) { return a.price - b.price; },
+            hilo: function (a, b) { return b.price - a.price; }
+        }[option];
+        if (!compare) {
+            return;
+        }
+        items.sort(function (left, right) {
+            return compare(
+                findProduct(Number(left.getAttribute('data-product-id'))),
+                findProduct(Number(right.getAttribute('data-product-id')))
+            );
+        });
+        items.forEach(function (item) {
+            list.appendChild(item);
+        });
+        var select = document.querySelector('[data-test="product-sort-container"]');
+        document.querySelector('[data-test="active-option"]').textContent =
+            select.options[select.selectedIndex].text;
+    }
+
+    function initInventory() {
+        if (!requireLogin()) {
+            return;
+        }
+        initHeader();
+        syncInventoryButtons();
+        document.querySelector('[data-test="inventory-list"]').addEventListener('click', function (event) {
+            var button = event.target.closest('button');
+            var item = button && button.closest('[data-test="inventory-item"]');
+            if (!item) {
+                return;
+            }
+            var id = Number(item.getAttribute('data-product-id'));
+            var cart = readCart();
+            var index = cart.indexOf(id);
+            if (index === -1) {
+                cart.push(id);
+            } else {
+                cart.splice(index, 1);
+            }
+            writeCart(cart);
+            syncInventoryButtons();
+            updateCartBadge();
+        });
+        document.querySelector('[data-test="product-sort-container"]').addEventListener('change', function (event) {
+            sortInventory(event.target.value);
+        });
+    }
+
+    /* 购物车页面 */
+
+    function renderCartItem(product) {
+        var item = element('div', {'class': 'cart_item', 'data-test': 'inventory-item', 'data-product-id': product.id});
+        item.appendChild(element('div', {'class': 'cart_quantity', 'data-test': 'item-quantity'}, '1'));
+        var label = element('div', {'class': 'cart_item_label'});
+        var link = element('a', {'href': '#', 'id': 'item_' + product.id + '_title_link', 'data-test': 'item-' + product.id + '-title-link'});
+        link.appendChild(element('div', {'class': 'inventory_item_name', 'data-test': 'inventory-item-name'}, product.name));
+        label.appendChild(link);
+        label.appendChild(element('div', {'class': 'inventory_item_desc', 'data-test': 'inventory-item-desc'}, product.description));
+        var pricebar = element('div', {'class': 'item_pricebar'});
+        pricebar.appendChild(element('div', {'class': 'inventory_item_price', 'data-test': 'inventory-item-price'}, '$' + product.price.toFixed(2)));
+        var remove = element('button', {
+            'class': 'btn btn_secondary btn_small cart_button',
+            'data-test': 'remove-' + product.slug,
+            'id': 'remove-' + product.slug,
+            'name': 'remove-' + product.slug
+        }, 'Remove');
+        remove.addEventListener('click', function () {
+            var cart = readCart();
+            cart.splice(cart.indexOf(product.id), 1);
+            writeCart(cart);
+            item.parentNode.removeChild(item);
+            updateCartBadge();
+        });
+        pricebar.appendChild(remove);
+        label.appendChild(pricebar);
+        item.appendChild(label);
+        return item;
+    }
+
+    function initCart() {
+        if (!requireLogin()) {
+            return;
+        }
+        initHeader();
+        var list = document.querySelector('[data-test="cart-list"]');
+        readCart().forEach(function (id) {
+            var product = findProduct(id);
+            if (product) {
+                list.appendChild(renderCartItem(product));
+            }
+        });
+        document.getElementById('continue-shopping').addEventListener('click', function () {
+            window.location.href = '/inventory.html';
+        });
+        document.getElementById('checkout').addEventListener('click', function () {
+            window.location.href = '/checkout-step-one.html';
+        });
+    }
+
+    /* 结账页面 */
+
+    function initCheckout() {
+        if (!requireLogin()) {
+            return;
+        }
+        initHeader();
+        document.getElementById('cancel').addEventListener('click', function () {
+            window.location.href = '/cart.html';
+        });
+        document.getElementById('checkout-form').addEventListener('submit', function (event) {
+            event.preventDefault();
+        });
+    }
+
+    var pages = {
+        login: initLogin,
+        inventory: initInventory,
+        cart: initCart,
+        checkout: initCheckout
+    };
+    var init = pages[document.body.getAttribute('data-page')];
+    if (init) {
+        init();
+    }
+})();
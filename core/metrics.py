@@ -0,0 +1,293 @@
+"""性能指标 - 记录页面对象操作的耗时、等待时间、WebDriver请求数和导航计时
+
+作为pytest插件加载时，控制进程会汇总每个测试的指标摘要并写入
+``reports/metrics.json``（与 ``reports/report.html`` 位于同一目录）。
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from config import Config
+
+# 会产生页面导航的WebDriver命令
+NAVIGATION_COMMANDS = {"get", "goBack", "goForward", "refresh"}
+
+
+class CommandCounter:
+    """WebDriver请求计数器，通过包装 ``driver.execute`` 统计每一次HTTP往返"""
+    
+    def __init__(self, driver):
+        """安装计数器
+        
+        Args:
+            driver: WebDriver实例
+        """
+        self.count = 0
+        self.navigation_count = 0
+        self.by_command = {}
+        self._execute = driver.execute
+        driver.execute = self._counted_execute
+    
+    def _counted_execute(self, driver_command, params=None):
+        """执行并计数一条WebDriver命令"""
+        self.count += 1
+        self.by_command[driver_command] = self.by_command.get(driver_command, 0) + 1
+        if driver_command in NAVIGATION_COMMANDS:
+            self.navigation_count += 1
+        return self._execute(driver_command, params)
+
+
+def get_command_counter(driver):
+    """获取driver上的请求计数器，没有时自动安装
+    
+    Args:
+        driver: WebDriver实例
+        
+    Returns:
+        CommandCounter: 请求计数器
+    """
+    counter = getattr(driver, "_command_counter", None)
+    if counter is None:
+        counter = CommandCounter(driver)
+        driver._command_counter = counter
+    return counter
+
+
+class Span:
+    """一段被测量的操作"""
+    
+    def __init__(self, name):
+        """初始化测量区间
+        
+        Args:
+            name: 区间名称
+        """
+        self.name = name
+        self.elapsed = None
+        self.commands = None
+
+
+class MetricsRecorder:
+    """当前测试的指标收集器"""
+    
+    def __init__(self):
+        """初始化指标收集器"""
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+    
+    def reset(self, test_id=None):
+        """开始收集一个新测试的指标
+        
+        Args:
+            test_id: 测试标识
+        """
+        with self._lock:
+            self.test_id = test_id
+            self.events = []
+            self.navigations = []
+            self.spans = []
+            self.network = None
+            self.element_cache = {"hits": 0, "misses": 0, "stale": 0}
+    
+    @property
+    def last_navigation(self):
+        """最近一次导航的计时数据
+        
+        Returns:
+            dict: 导航计时，没有时为None
+        """
+        return self.navigations[-1] if self.navigations else None
+    
+    @contextmanager
+    def action(self):
+        """标记一次页面对象操作的嵌套层级
+        
+        Yields:
+            int: 当前操作的嵌套深度，0表示最外层操作
+        """
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        try:
+            yield depth
+        finally:
+            self._local.depth = depth
+    
+    def record_action(self, action, locator, wall_time, wait_time, commands, depth=0):
+        """记录一次页面对象操作
+        
+        Args:
+            action: 操作名称
+            locator: 元素定位器
+            wall_time: 总耗时（秒）
+            wait_time: 其中用于等待的时间（秒）
+            commands: WebDriver请求数
+            depth: 嵌套深度，0表示最外层操作
+        """
+        with self._lock:
+            self.events.append({
+                "action": action,
+                "locator": list(locator) if locator else None,
+                "wall_time": wall_time,
+                "wait_time": wait_time,
+                "commands": commands,
+                "nested": depth > 0
+            })
+    
+    def record_navigation(self, timing):
+        """记录一次导航的 Navigation Timing 数据，同一文档只记录一次
+        
+        Args:
+            timing: 包含 url、time_origin、ttfb、dom_content_loaded、load 的字典（毫秒）
+        """
+        with self._lock:
+            if any(navigation["time_origin"] == timing["time_origin"] for navigation in self.navigations):
+                return
+            self.navigations.append(timing)
+    
+    def record_cache(self, event):
+        """记录一次页面对象元素缓存事件
+        
+        Args:
+            event: hits（命中，省去一次查找请求）、misses 或 stale（缓存的元素已过期）
+        """
+        with self._lock:
+            self.element_cache[event] += 1
+    
+    def record_network(self, stats):
+        """记录当前测试的网络流量统计
+        
+        Args:
+            stats: NetworkShaper.collect 返回的统计字典
+        """
+        with self._lock:
+            self.network = stats
+    
+    @contextmanager
+    def measure(self, name, driver=None):
+        """测量一段代码的耗时和WebDriver请求数
+        
+        Args:
+            name: 区间名称
+            driver: 用于统计请求数的WebDriver实例
+            
+        Yields:
+            Span: 测量结果，退出上下文后 elapsed/commands 可用
+        """
+        span = Span(name)
+        counter = get_command_counter(driver) if driver is not None else None
+        commands_before = counter.count if counter else 0
+        start_time = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.elapsed = time.perf_counter() - start_time
+            span.commands = counter.count - commands_before if counter else None
+            with self._lock:
+                self.spans.append({"name": name, "elapsed": span.elapsed, "commands": span.commands})
+    
+    def summary(self):
+        """生成当前测试的指标摘要
+        
+        Returns:
+            dict: 按操作汇总的耗时、最外层操作的合计、导航计时、网络流量、元素缓存和自定义区间
+        """
+        with self._lock:
+            actions = {}
+            total = {"wall_time": 0.0, "wait_time": 0.0, "commands": 0}
+            for event in self.events:
+                stats = actions.setdefault(
+                    event["action"], {"count": 0, "wall_time": 0.0, "wait_time": 0.0, "commands": 0}
+                )
+                stats["count"] += 1
+                for key in ("wall_time", "wait_time", "commands"):
+                    stats[key] += event[key]
+                    if not event["nested"]:
+                        total[key] += event[key]
+            slowest = sorted(
+                (event for event in self.events if not event["nested"]),
+                key=lambda event: event["wall_time"],
+                reverse=True
+            )[:5]
+            return {
+                "test_id": self.test_id,
+                "total": total,
+                "actions": actions,
+                "slowest": slowest,
+                "navigations": list(self.navigations),
+                "network": self.network,
+                "element_cache": dict(self.element_cache),
+                "spans": list(self.spans)
+            }
+
+
+_recorder = MetricsRecorder()
+
+
+def get_recorder():
+    """获取进程共享的指标收集器
+    
+    Returns:
+        MetricsRecorder: 指标收集器
+    """
+    return _recorder
+
+
+class MetricsReportPlugin:
+    """汇总各测试指标摘要并写入JSON文件的pytest插件，并行时运行在控制进程中"""
+    
+    def __init__(self, path):
+        """初始化插件
+        
+        Args:
+            path: 输出文件路径
+        """
+        self.path = path
+        self.results = {}
+    
+    def pytest_runtest_logreport(self, report):
+        """从teardown阶段的报告中取出测试夹具写入的指标摘要"""
+        if report.when != "teardown":
+            return
+        for name, value in report.user_properties:
+            if name == "metrics":
+                self.results[report.nodeid] = value
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        """在测试摘要中输出元素缓存和网络流量合计"""
+        caches = [value["element_cache"] for value in self.results.values() if value.get("element_cache")]
+        hits = sum(cache["hits"] for cache in caches)
+        if hits:
+            terminalreporter.write_line(
+                f"元素缓存: 命中 {hits} 次（省去 {hits} 次查找请求），"
+                f"未命中 {sum(cache['misses'] for cache in caches)} 次，"
+                f"过期重查 {sum(cache['stale'] for cache in caches)} 次"
+            )
+        
+        traffic = [value["network"] for value in self.results.values() if value.get("network")]
+        if not traffic:
+            return
+        requests = sum(stats["requests"] for stats in traffic)
+        transferred = sum(stats["bytes"] for stats in traffic)
+        blocked = sum(stats["blocked"] for stats in traffic)
+        cached = sum(stats["cached"] for stats in traffic)
+        terminalreporter.write_line(
+            f"网络流量: {len(traffic)} 个测试共 {requests} 个请求，传输 {transferred / 1024:.1f}KB，"
+            f"拦截 {blocked} 个，缓存命中 {cached} 个"
+        )
+    
+    def pytest_sessionfinish(self, session):
+        """写入指标文件"""
+        if not self.results:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.results, f, indent=2, ensure_ascii=False)
+
+
+def pytest_configure(config):
+    """在控制进程（或串行运行时）注册指标汇总插件"""
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(MetricsReportPlugin(Config.METRICS_FILE), "metrics-report")
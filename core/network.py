@@ -0,0 +1,120 @@
+"""网络整形 - 通过Chrome DevTools Protocol拦截与断言无关的资源并统计网络流量"""
+
+import json
+from selenium.common.exceptions import WebDriverException
+from config import Config
+
+# 资源类型对应的URL模式，Network.setBlockedURLs 只支持按URL匹配。
+# 不包含 *.ico：会话引导需要打开同源的 favicon（Config.SESSION_BOOTSTRAP_PATH）来写入cookies
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav"],
+    "stylesheet": ["*.css"],
+    "analytics": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*backtrace.io*",
+        "*doubleclick.net*"
+    ]
+}
+
+
+class NetworkShaper:
+    """网络整形器
+    
+    创建浏览器前通过 ``configure_options`` 开启持久化磁盘缓存，需要统计流量时同时开启性能日志，
+    创建后通过 ``apply`` 下发拦截规则；``collect`` 从性能日志中统计请求数和传输字节数。
+    """
+    
+    def __init__(self, block_patterns=None, block_types=None, cache_dir=None, record_traffic=False):
+        """初始化网络整形器
+        
+        Args:
+            block_patterns: 要拦截的URL模式列表，支持 * 通配符
+            block_types: 要拦截的资源类型列表，见 RESOURCE_TYPE_PATTERNS
+            cache_dir: 磁盘缓存目录，设置后静态资源在多次启动之间从本地缓存读取
+            record_traffic: 是否开启性能日志供 ``collect`` 统计流量；不读取日志时开启会让日志在浏览器中一直累积
+        """
+        unknown = set(block_types or []) - set(RESOURCE_TYPE_PATTERNS)
+        if unknown:
+            raise ValueError(f"不支持的资源类型: {', '.join(sorted(unknown))}")
+        
+        self.block_types = list(block_types or [])
+        self.cache_dir = cache_dir
+        self.record_traffic = record_traffic
+        self.patterns = list(block_patterns or [])
+        for resource_type in self.block_types:
+            self.patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+    
+    @classmethod
+    def from_config(cls):
+        """按 Config 中的网络配置创建整形器
+        
+        Returns:
+            NetworkShaper: 网络整形器
+        """
+        return cls(
+            Config.BLOCK_URL_PATTERNS, Config.BLOCK_RESOURCE_TYPES, Config.NETWORK_CACHE_DIR,
+            record_traffic=Config.RECORD_NETWORK_TRAFFIC
+        )
+    
+    def configure_options(self, options):
+        """在创建浏览器前配置Chrome选项
+        
+        Args:
+            options: ChromeOptions 对象
+        """
+        if self.record_traffic:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        if self.cache_dir:
+            options.add_argument(f"--disk-cache-dir={self.cache_dir}")
+            options.add_argument("--disk-cache-size=268435456")
+    
+    def apply(self, driver):
+        """在浏览器上启用网络域并下发拦截规则
+        
+        Args:
+            driver: WebDriver实例
+        """
+        driver.execute_cdp_cmd("Network.enable", {})
+        if self.patterns:
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns})
+        if self.cache_dir:
+            driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+    
+    @staticmethod
+    def collect(driver):
+        """读取并清空性能日志，统计自上次读取以来的网络流量
+        
+        Args:
+            driver: WebDriver实例
+        
+        Returns:
+            dict: 请求数、传输字节数、被拦截和命中缓存的请求数，以及按资源类型的请求数；
+                浏览器不支持性能日志时返回None
+        """
+        try:
+            entries = driver.get_log("performance")
+        except WebDriverException:
+            return None
+        
+        stats = {"requests": 0, "bytes": 0, "blocked": 0, "cached": 0, "failed": 0, "by_type": {}}
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                stats["requests"] += 1
+                resource_type = params.get("type", "Other")
+                stats["by_type"][resource_type] = stats["by_type"].get(resource_type, 0) + 1
+            elif method == "Network.loadingFinished":
+                stats["bytes"] += int(params.get("encodedDataLength", 0))
+            elif method == "Network.requestServedFromCache":
+                stats["cached"] += 1
+            elif method == "Network.loadingFailed":
+                if params.get("blockedReason"):
+                    stats["blocked"] += 1
+                else:
+                    stats["failed"] += 1
+        return stats
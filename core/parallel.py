@@ -0,0 +1,254 @@
+"""并行执行 - 基于历史耗时的 pytest-xdist 负载均衡调度
+
+作为pytest插件加载：
+- 在 ``pytest_runtest_makereport`` 中记录每个测试各阶段的耗时和结果，追加写入耗时数据库
+- 使用 ``-n`` 并行运行时按历史耗时从长到短分发测试（LPT），空闲的worker每次领取一个测试
+- 使用 ``-n`` 并行运行时带 ``xdist_group`` 标记的同组测试一起分发到同一个worker，共享模块级夹具
+- 使用 ``--quick-feedback`` 时先运行最近失败过的测试，再运行冒烟测试，各组内耗时短的先运行
+"""
+
+import statistics
+from itertools import cycle
+import pytest
+from xdist.scheduler import LoadScheduling
+from .durations import DurationStore
+
+# 没有任何历史记录时使用的默认耗时（秒）
+DEFAULT_DURATION = 1.0
+
+# worker把 xdist_group 分组名追加到测试节点ID后，与 --dist=loadgroup 的格式相同
+GROUP_SEPARATOR = "@"
+
+
+def split_group(nodeid):
+    """拆分带分组后缀的测试节点ID
+    
+    Args:
+        nodeid: 测试节点ID，分组的测试形如 ``tests/test_a.py::test_b[x]@group``
+    
+    Returns:
+        tuple: (不带后缀的节点ID, 分组名)，没有分组时分组名为None
+    """
+    base, separator, group = nodeid.rpartition(GROUP_SEPARATOR)
+    if not separator or not base or any(char in group for char in "[]/:"):
+        return nodeid, None
+    return base, group
+
+
+def xdist_group(item):
+    """读取测试项的 xdist_group 分组名
+    
+    Args:
+        item: 测试项
+    
+    Returns:
+        str: 分组名，多个标记的分组名按字母顺序用下划线连接；没有标记时为None
+    """
+    names = {
+        str(mark.args[0] if mark.args else mark.kwargs.get("name", "default"))
+        for mark in item.iter_markers("xdist_group")
+    }
+    return "_".join(sorted(names)) if names else None
+
+
+class DurationScheduling(LoadScheduling):
+    """按历史耗时调度的负载均衡实现
+    
+    与默认的 ``LoadScheduling`` 按收集顺序批量分发不同，这里先按历史耗时
+    从长到短排序，然后每个worker只预取少量测试，完成后再领取下一个，
+    让最耗时的测试最先开始，缩短整体运行时间。
+    """
+    
+    def __init__(self, config, log=None, durations=None):
+        """初始化调度器
+        
+        Args:
+            config: pytest配置对象
+            log: xdist日志对象
+            durations: 测试节点ID到历史耗时的映射
+        """
+        super().__init__(config, log)
+        self.durations = durations if durations is not None else {}
+        # 每次只补充一个测试，由完成先后决定分配，而不是预先分块
+        self.maxschedchunk = 1
+    
+    def schedule(self):
+        """初始分发测试"""
+        assert self.collection_is_completed
+        
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+        
+        self.collection = next(iter(self.node2collection.values()))
+        self.groups = {}
+        for index, nodeid in enumerate(self.collection):
+            group = split_group(nodeid)[1]
+            if group is not None:
+                self.groups.setdefault(group, []).append(index)
+        if self.config.getoption("quick_feedback"):
+            # 各worker收集时已经按快速反馈顺序排列，保持收集顺序
+            self.pending[:] = range(len(self.collection))
+        else:
+            self.pending[:] = self.order_by_duration(self.collection)
+        if not self.collection:
+            return
+        
+        # 轮流分发，让最耗时的几个测试落在不同的worker上。
+        # worker需要至少持有两个待运行的测试才能正确处理 nextitem；
+        # 测试数量不足时全部分发，保证所有worker都能收到关闭信号
+        if len(self.pending) < 2 * len(self.nodes):
+            initial = len(self.pending)
+        else:
+            initial = 2 * len(self.nodes)
+        nodes = cycle(self.nodes)
+        for _ in range(initial):
+            self._send_tests(next(nodes), 1)
+        
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+    
+    def _send_tests(self, node, num):
+        """向worker发送待运行的测试，分组的测试连同同组的其余测试按收集顺序一起发送
+        
+        同组的测试共享模块级夹具（例如场景测试的前缀树），分散到多个worker或与其他模块的测试
+        交错运行都会让夹具重复执行。
+        
+        Args:
+            node: worker
+            num: 发送的测试数量
+        """
+        tests = []
+        for index in self.pending[:num]:
+            group = split_group(self.collection[index])[1]
+            tests.extend(self.groups[group] if group is not None else [index])
+        if tests:
+            sent = set(tests)
+            self.pending[:] = [index for index in self.pending if index not in sent]
+            self.node2pending[node].extend(tests)
+            node.send_runtest_some(tests)
+    
+    def order_by_duration(self, collection):
+        """按历史耗时从长到短排列测试索引
+        
+        Args:
+            collection: 测试节点ID列表
+            
+        Returns:
+            list: 排序后的测试索引
+        """
+        durations = {nodeid: self.durations.get(split_group(nodeid)[0]) for nodeid in collection}
+        known = [duration for duration in durations.values() if duration is not None]
+        default = statistics.median(known) if known else DEFAULT_DURATION
+        return sorted(
+            range(len(collection)),
+            key=lambda index: durations[collection[index]] if durations[collection[index]] is not None else default,
+            reverse=True
+        )
+
+
+def quick_feedback_order(items, durations, failures):
+    """按快速反馈顺序排列测试：最近失败过的测试、冒烟测试、其余测试，各组内按历史耗时从短到长
+    
+    Args:
+        items: 测试项列表
+        durations: 测试节点ID到历史耗时的映射
+        failures: 最近失败过的测试节点ID集合
+    
+    Returns:
+        list: 排序后的测试项
+    """
+    known = [durations[item.nodeid] for item in items if item.nodeid in durations]
+    default = statistics.median(known) if known else DEFAULT_DURATION
+    
+    def priority(item):
+        if item.nodeid in failures:
+            group = 0
+        elif item.get_closest_marker("smoke") is not None:
+            group = 1
+        else:
+            group = 2
+        return group, durations.get(item.nodeid, default)
+    
+    return sorted(items, key=priority)
+
+
+class DurationRecorder:
+    """记录测试耗时的pytest插件
+    
+    串行运行时在当前进程中记录；并行运行时控制进程创建运行记录，
+    各worker记录自己执行的测试并写入同一个运行。
+    """
+    
+    def __init__(self, store):
+        """初始化耗时记录插件
+        
+        Args:
+            store: 耗时存储
+        """
+        self.store = store
+        self.workers = 0
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        """记录测试阶段的耗时和结果，失败重试的测试只保留最后一次尝试"""
+        outcome = yield
+        report = outcome.get_result()
+        self.store.record(split_group(report.nodeid)[0], report.when, report.duration, report.outcome)
+    
+    def pytest_collection_modifyitems(self, config, items):
+        """使用 --quick-feedback 时按快速反馈顺序排列测试；worker给分组的测试节点ID加上分组后缀，供调度器识别"""
+        if config.getoption("quick_feedback"):
+            items[:] = quick_feedback_order(items, self.store.load(), self.store.recent_failures())
+        if getattr(config, "workerinput", {}).get("xdist_groups"):
+            for item in items:
+                group = xdist_group(item)
+                if group is not None:
+                    item._nodeid = f"{item.nodeid}{GROUP_SEPARATOR}{group}"
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        """控制进程创建本次运行的记录，把运行ID传给worker；使用耗时调度时让worker标出分组的测试"""
+        if self.store.run_id is None:
+            self.store.start_run()
+        self.workers += 1
+        node.workerinput["duration_run_id"] = self.store.run_id
+        node.workerinput["xdist_groups"] = node.config.getoption("dist") == "load"
+    
+    def pytest_sessionfinish(self, session):
+        """将本次运行的耗时写入数据库"""
+        self.store.save()
+        if not hasattr(session.config, "workerinput"):
+            self.store.finish_run(self.workers)
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        """在 --dist=load 模式下使用基于历史耗时的调度器"""
+        if config.getoption("dist") != "load":
+            return None
+        return DurationScheduling(config, log, durations=self.store.load())
+
+
+def pytest_addoption(parser):
+    """注册快速反馈排序选项"""
+    parser.addoption(
+        "--quick-feedback",
+        action="store_true",
+        default=False,
+        help="先运行最近失败过的测试和冒烟测试，各组内耗时短的先运行"
+    )
+
+
+def pytest_configure(config):
+    """注册耗时记录插件，worker使用控制进程创建的运行ID"""
+    store = DurationStore()
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        store.run_id = workerinput.get("duration_run_id")
+    config.pluginmanager.register(DurationRecorder(store), "duration-recorder")
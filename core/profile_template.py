@@ -0,0 +1,259 @@
+"""浏览器配置模板 - 预热一次Chrome用户数据目录，之后每个浏览器从模板的廉价副本启动
+
+用法::
+
+    # 比较使用模板前后从创建浏览器到第一次 driver.get 完成的耗时
+    python -m core.profile_template --runs 5
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+from config import Config
+
+# 模板标记文件，记录生成模板时的配置
+MARKER_FILE = ".template.json"
+
+# 本地站点的主机名，端口每次运行随机分配，不参与模板的配置标识
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+# Chrome运行时留下的锁文件和与会话相关的目录，复制前需要去掉
+TRANSIENT_ENTRIES = [
+    "SingletonLock",
+    "SingletonSocket",
+    "SingletonCookie",
+    "Crashpad",
+    os.path.join("Default", "Sessions"),
+    os.path.join("Default", "Session Storage")
+]
+
+
+class ProfileTemplate:
+    """预热的Chrome用户数据目录模板
+    
+    第一次使用时启动一次浏览器：写入偏好设置、完成首次运行、打开 ``Config.BASE_URL``
+    把站点静态资源缓存到磁盘。之后每个浏览器在tmpfs中获得模板的写时复制副本
+    （``cp --reflink=auto``，文件系统不支持时退化为普通复制），浏览器关闭时删除副本。
+    
+    每种Chrome参数组合和站点源的模板放在 ``template_dir`` 下以配置标识命名的子目录中。模板在临时目录中生成，
+    完成后原子地重命名为最终目录；已发布的模板不再修改或删除，并行的worker可以随时从中复制。
+    """
+    
+    def __init__(self, template_dir=None, clone_root=None, base_url=None):
+        """初始化配置模板
+        
+        Args:
+            template_dir: 模板根目录，默认为 Config.PROFILE_TEMPLATE_DIR
+            clone_root: 副本所在目录，默认为 Config.PROFILE_CLONE_ROOT
+            base_url: 预热的站点地址，默认为 Config.BASE_URL
+        """
+        self.template_dir = template_dir or Config.PROFILE_TEMPLATE_DIR
+        self.clone_root = clone_root or Config.PROFILE_CLONE_ROOT
+        self.base_url = base_url
+        self.build_time = None
+    
+    def origin(self):
+        """返回预热站点的源，作为配置标识的一部分
+        
+        本地站点只保留协议和主机：并行运行时每个worker的本地站点端口不同，按端口区分会让每次运行都重新生成模板。
+        
+        Returns:
+            str: 形如 https://www.saucedemo.com 的源
+        """
+        parts = urlsplit(self.base_url or Config.BASE_URL)
+        if parts.hostname in LOOPBACK_HOSTS:
+            return f"{parts.scheme}://{parts.hostname}"
+        return f"{parts.scheme}://{parts.netloc}"
+    
+    def key(self, arguments=None):
+        """计算模板的配置标识，Chrome参数或预热站点的源变化时使用新的模板
+        
+        Args:
+            arguments: 生成模板时使用的Chrome参数
+        
+        Returns:
+            str: 配置标识
+        """
+        payload = json.dumps({"arguments": sorted(arguments or []), "origin": self.origin()}, sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    
+    def path(self, key):
+        """返回配置标识对应的模板目录
+        
+        Args:
+            key: 配置标识
+        
+        Returns:
+            str: 模板目录
+        """
+        return os.path.join(self.template_dir, key)
+    
+    def is_fresh(self, key):
+        """模板是否已生成
+        
+        Args:
+            key: 配置标识
+        
+        Returns:
+            bool: 模板是否可用
+        """
+        try:
+            with open(os.path.join(self.path(key), MARKER_FILE), encoding="utf-8") as f:
+                return json.load(f).get("key") == key
+        except (OSError, ValueError):
+            return False
+    
+    def ensure(self, launch, key):
+        """确保模板存在，不存在时生成并发布
+        
+        Args:
+            launch: 使用指定用户数据目录启动浏览器的函数，接收目录路径，返回WebDriver
+            key: 配置标识
+        
+        Returns:
+            str: 模板目录
+        """
+        target = self.path(key)
+        if self.is_fresh(key):
+            return target
+        
+        start_time = time.perf_counter()
+        os.makedirs(self.template_dir, exist_ok=True)
+        building = tempfile.mkdtemp(prefix=".building-", dir=self.template_dir)
+        
+        try:
+            driver = launch(building)
+            try:
+                driver.get(self.base_url or Config.BASE_URL)
+                driver.execute_script("return document.readyState")
+            finally:
+                driver.quit()
+        except Exception:
+            shutil.rmtree(building, ignore_errors=True)
+            raise
+        
+        for entry in TRANSIENT_ENTRIES:
+            path = os.path.join(building, entry)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.lexists(path):
+                os.remove(path)
+        with open(os.path.join(building, MARKER_FILE), "w", encoding="utf-8") as f:
+            json.dump({"key": key, "base_url": self.base_url or Config.BASE_URL}, f)
+        
+        # 并行运行时多个worker可能同时生成同一个模板：重命名是原子的，先完成的发布生效，
+        # 其余worker丢弃自己生成的目录，不触碰其他进程可能正在复制的已发布模板
+        try:
+            os.rename(building, target)
+        except OSError:
+            shutil.rmtree(building, ignore_errors=True)
+            if not self.is_fresh(key):
+                raise
+        self.build_time = time.perf_counter() - start_time
+        return target
+    
+    def clone(self, key):
+        """创建模板的副本
+        
+        Args:
+            key: 配置标识
+        
+        Returns:
+            str: 副本目录，作为浏览器的 --user-data-dir
+        
+        Raises:
+            OSError: 模板不存在或复制失败，此时不留下不完整的副本
+        """
+        source = self.path(key)
+        if not self.is_fresh(key):
+            raise FileNotFoundError(f"浏览器配置模板不存在: {source}")
+        if self.clone_root:
+            os.makedirs(self.clone_root, exist_ok=True)
+        target = tempfile.mkdtemp(prefix="chrome-profile-", dir=self.clone_root)
+        try:
+            try:
+                subprocess.run(
+                    ["cp", "-a", "--reflink=auto", os.path.join(source, "."), target],
+                    check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+            except (OSError, subprocess.CalledProcessError):
+                shutil.copytree(source, target, symlinks=True, dirs_exist_ok=True)
+        except OSError:
+            shutil.rmtree(target, ignore_errors=True)
+            raise
+        return target
+    
+    @staticmethod
+    def remove_on_quit(driver, user_data_dir):
+        """浏览器关闭时删除它使用的副本目录
+        
+        Args:
+            driver: WebDriver实例
+            user_data_dir: 副本目录
+        """
+        quit_driver = driver.quit
+        
+        def quit_and_remove():
+            try:
+                quit_driver()
+            finally:
+                shutil.rmtree(user_data_dir, ignore_errors=True)
+        
+        driver.quit = quit_and_remove
+
+
+def measure_first_get(factory, use_template, runs=3, profile=None, url=None):
+    """测量从创建浏览器到第一次 driver.get 完成的耗时
+    
+    Args:
+        factory: DriverFactory 实例
+        use_template: 是否使用配置模板
+        runs: 测量次数
+        profile: 启动配置名称
+        url: 打开的地址，默认为 Config.BASE_URL
+    
+    Returns:
+        list: 每次的耗时（秒）
+    """
+    samples = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        driver = factory.create(profile, use_template=use_template)
+        try:
+            driver.get(url or Config.BASE_URL)
+            samples.append(time.perf_counter() - start_time)
+        finally:
+            driver.quit()
+    return samples
+
+
+def main(argv=None):
+    """命令行入口：比较使用模板前后的首次导航耗时"""
+    from core.driver_factory import DriverFactory
+    
+    parser = argparse.ArgumentParser(description="比较使用浏览器配置模板前后的首次导航耗时")
+    parser.add_argument("--runs", type=int, default=3, help="每种方式的测量次数")
+    parser.add_argument("--profile", default=None, help="启动配置名称")
+    args = parser.parse_args(argv)
+    
+    factory = DriverFactory(profile_template=ProfileTemplate())
+    # 先生成模板，生成耗时不计入比较
+    factory.create(args.profile, use_template=True).quit()
+    if factory.profile_template.build_time is not None:
+        print(f"模板生成耗时: {factory.profile_template.build_time:.2f}s")
+    
+    for label, use_template in (("不使用模板", False), ("使用模板", True)):
+        samples = measure_first_get(factory, use_template, args.runs, args.profile)
+        print(f"{label}: 平均 {sum(samples) / len(samples):.2f}s，最短 {min(samples):.2f}s，最长 {max(samples):.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+"""失败重试 - 按失败原因分类，只重试基础设施失败并统计重试耗时
+
+作为pytest插件加载：
+- setup或测试本身失败时按异常链分类为 timeout、stale、network、assertion 或 error
+- ``BasePage.find_element`` 等待超时后抛出 ``NoSuchElementException``，异常链中的 ``TimeoutException``
+  使其归为 timeout，与索引中不存在的商品这类真实失败区分开
+- 只重试 ``RETRY_CATEGORIES`` 中的失败，每个测试最多 ``--retries`` 次，每个进程最多 ``--retry-budget`` 次；
+  失败的浏览器不放回浏览器池，重试时使用新的浏览器
+- 只报告最后一次执行的结果，之前的尝试记录在 ``retry`` 属性中；测试摘要中输出失败分类，对比首次执行和重试的耗时
+"""
+
+import time
+import pytest
+import urllib3
+from _pytest.runner import runtestprotocol
+from selenium.common.exceptions import (
+    InvalidSessionIdException, StaleElementReferenceException, TimeoutException, WebDriverException
+)
+from config import Config
+
+# 失败分类的显示名称
+CATEGORY_NAMES = {
+    "timeout": "超时",
+    "stale": "元素过期",
+    "network": "网络",
+    "assertion": "断言",
+    "error": "其他错误"
+}
+
+# WebDriver错误信息中表示浏览器或网络连接失败的片段
+NETWORK_MARKERS = (
+    "net::ERR_",
+    "chrome not reachable",
+    "disconnected:",
+    "session deleted because of page crash",
+    "Connection refused"
+)
+
+# 当前执行第几次尝试（0为首次执行）
+ATTEMPT = pytest.StashKey()
+# 本次尝试中可重试的失败分类
+RETRYABLE_FAILURE = pytest.StashKey()
+
+
+def _exception_chain(exc):
+    """依次返回异常及其 __cause__/__context__
+    
+    Args:
+        exc: 异常
+    
+    Returns:
+        generator: 异常链中的异常
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__ or exc.__context__
+
+
+def classify(exc):
+    """按失败原因分类异常
+    
+    Args:
+        exc: 测试抛出的异常
+    
+    Returns:
+        str: timeout、stale、network、assertion 或 error
+    """
+    if isinstance(exc, (AssertionError, pytest.fail.Exception)):
+        return "assertion"
+    for cause in _exception_chain(exc):
+        if isinstance(cause, StaleElementReferenceException):
+            return "stale"
+        if isinstance(cause, (InvalidSessionIdException, urllib3.exceptions.HTTPError, ConnectionError)):
+            return "network"
+        if isinstance(cause, WebDriverException) and any(marker in (cause.msg or "") for marker in NETWORK_MARKERS):
+            return "network"
+        if isinstance(cause, (TimeoutException, TimeoutError)):
+            return "timeout"
+    return "error"
+
+
+def is_retry(item):
+    """当前是否为重试的尝试
+    
+    Args:
+        item: 测试项
+    
+    Returns:
+        bool: 是否为重试
+    """
+    return item.stash.get(ATTEMPT, 0) > 0
+
+
+def failed_on_infrastructure(item):
+    """本次尝试是否因可重试的基础设施问题失败，失败的浏览器不应放回浏览器池
+    
+    Args:
+        item: 测试项
+    
+    Returns:
+        bool: 是否因基础设施问题失败
+    """
+    return item.stash.get(RETRYABLE_FAILURE, None) is not None
+
+
+def _failure_message(report):
+    """取出失败报告的简短信息
+    
+    Args:
+        report: 失败的阶段报告
+    
+    Returns:
+        str: 失败信息的第一行
+    """
+    crash = getattr(report.longrepr, "reprcrash", None)
+    message = crash.message if crash is not None else str(report.longrepr)
+    return message.splitlines()[0][:200] if message else ""
+
+
+class RetryPlugin:
+    """失败重试插件
+    
+    重试在执行测试的进程中完成；统计在报告到达的进程中汇总，
+    并行运行时即为控制进程。
+    """
+    
+    def __init__(self, retries, budget, categories):
+        """初始化插件
+        
+        Args:
+            retries: 每个测试最多重试的次数
+            budget: 本进程最多重试的总次数
+            categories: 可重试的失败分类
+        """
+        self.retries = retries
+        self.budget = budget
+        self.categories = set(categories)
+        self.stats = {
+            "retries": 0,
+            "by_category": {},
+            "flaky": 0,
+            "over_budget": 0,
+            "failures": {},
+            "first_attempt_time": 0.0,
+            "retry_time": 0.0
+        }
+        self._durations = {}
+    
+    def should_retry(self, category, attempt):
+        """判断失败是否重试，重试时占用一次预算
+        
+        Args:
+            category: 失败分类
+            attempt: 已完成的尝试序号（0为首次执行）
+        
+        Returns:
+            bool: 是否重试
+        """
+        if category not in self.categories or attempt >= self.retries or self.budget <= 0:
+            return False
+        self.budget -= 1
+        return True
+    
+    def over_budget(self, category, attempt):
+        """判断失败本应重试、但本进程的重试预算已经用尽
+        
+        Args:
+            category: 失败分类
+            attempt: 已完成的尝试序号（0为首次执行）
+        
+        Returns:
+            bool: 是否因预算用尽而未重试
+        """
+        return category in self.categories and attempt < self.retries and self.budget <= 0
+    
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        """执行测试，可重试的失败在新的浏览器中重新执行
+        
+        失败的尝试不报告；最后一次尝试的teardown报告带有之前各次尝试的分类和耗时。
+        """
+        if self.retries <= 0:
+            return None
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        attempts = []
+        properties = len(item.user_properties)
+        while True:
+            # 失败尝试中添加的属性和附件不带到下一次尝试
+            del item.user_properties[properties:]
+            item.stash[ATTEMPT] = len(attempts)
+            item.stash[RETRYABLE_FAILURE] = None
+            start_time = time.perf_counter()
+            # 与正常执行相同地按 nextitem 拆除夹具；重试时被拆除的模块或会话级夹具会重新创建
+            reports = runtestprotocol(item, nextitem=nextitem, log=False)
+            elapsed = time.perf_counter() - start_time
+            failed = next((report for report in reports if report.failed and report.when != "teardown"), None)
+            category = item.stash[RETRYABLE_FAILURE]
+            if failed is None or category is None or not self.should_retry(category, len(attempts)):
+                break
+            attempts.append({"category": category, "duration": elapsed, "error": _failure_message(failed)})
+        
+        if attempts:
+            reports[-1].user_properties.append(("retry", {
+                "attempts": attempts,
+                "first_attempt": attempts[0]["duration"],
+                "retry_time": sum(attempt["duration"] for attempt in attempts[1:]) + elapsed,
+                "passed": failed is None
+            }))
+        # 预算在执行测试的进程中判断，标记随报告送到汇总统计的进程
+        if failed is not None and category is not None and self.over_budget(category, len(attempts)):
+            reports[-1].user_properties.append(("over_budget", True))
+        for report in reports:
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        """setup或测试本身失败时记录分类，分类随teardown报告输出；可重试的分类用于决定是否丢弃浏览器"""
+        outcome = yield
+        report = outcome.get_result()
+        if report.failed and call.when in ("setup", "call") and call.excinfo is not None:
+            category = classify(call.excinfo.value)
+            item.user_properties.append(("failure_category", category))
+            if category in self.categories:
+                item.stash[RETRYABLE_FAILURE] = category
+    
+    def pytest_runtest_logreport(self, report):
+        """汇总首次执行和重试的耗时、失败分类"""
+        self._durations[report.nodeid] = self._durations.get(report.nodeid, 0.0) + report.duration
+        if report.when != "teardown":
+            return
+        duration = self._durations.pop(report.nodeid)
+        properties = dict(report.user_properties)
+        retry = properties.get("retry")
+        if retry is None:
+            self.stats["first_attempt_time"] += duration
+        else:
+            self.stats["first_attempt_time"] += retry["first_attempt"]
+            self.stats["retry_time"] += retry["retry_time"]
+            self.stats["retries"] += len(retry["attempts"])
+            self.stats["flaky"] += int(retry["passed"])
+            for attempt in retry["attempts"]:
+                by_category = self.stats["by_category"]
+                by_category[attempt["category"]] = by_category.get(attempt["category"], 0) + 1
+        self.stats["over_budget"] += int(properties.get("over_budget", False))
+        category = properties.get("failure_category")
+        if category is not None:
+            self.stats["failures"][category] = self.stats["failures"].get(category, 0) + 1
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        """在测试摘要中输出失败分类和重试耗时"""
+        stats = self.stats
+        if stats["failures"]:
+            terminalreporter.write_line("失败分类: " + "，".join(
+                f"{CATEGORY_NAMES[category]} {count}" for category, count in sorted(stats["failures"].items())
+            ))
+        if stats["retries"] or stats["over_budget"]:
+            total = stats["first_attempt_time"] + stats["retry_time"]
+            share = stats["retry_time"] / total * 100 if total else 0.0
+            categories = "，".join(
+                f"{CATEGORY_NAMES[category]} {count}" for category, count in sorted(stats["by_category"].items())
+            )
+            terminalreporter.write_line(
+                f"失败重试: 重试 {stats['retries']} 次（{categories}），{stats['flaky']} 个测试重试后通过，"
+                f"预算用尽未重试 {stats['over_budget']} 次；首次执行 {stats['first_attempt_time']:.1f}s，"
+                f"重试 {stats['retry_time']:.1f}s（占 {share:.0f}%）"
+            )
+
+
+def pytest_addoption(parser):
+    """注册重试选项"""
+    group = parser.getgroup("retry", "失败重试")
+    group.addoption(
+        "--retries",
+        type=int,
+        default=Config.RETRIES,
+        help="超时、元素过期和网络错误这类失败每个测试最多重试的次数，0为不重试"
+    )
+    group.addoption(
+        "--retry-budget",
+        type=int,
+        default=Config.RETRY_BUDGET,
+        help="每个进程最多重试的总次数"
+    )
+
+
+def pytest_configure(config):
+    """注册失败重试插件"""
+    plugin = RetryPlugin(config.getoption("retries"), config.getoption("retry_budget"), Config.RETRY_CATEGORIES)
+    config.pluginmanager.register(plugin, "retry")
@@ -0,0 +1,330 @@
+"""场景引擎 - 按JSON/YAML描述的购物旅程驱动页面对象
+
+场景文件格式::
+
+    {"scenarios": [
+        {"name": "two_items_total", "steps": [
+            {"login": "standard_user"},
+            {"add": ["Sauce Labs Backpack", "Sauce Labs Bike Light"]},
+            "view_cart",
+            {"assert_total": 39.98}
+        ]}
+    ]}
+
+每个步骤是步骤名称（没有参数时）或只有一个键的字典 ``{步骤名称: 参数}``。动作步骤与负载生成器
+（``core.loadgen.STEPS``）相同，另外提供批量加购/移除和断言步骤。
+
+多个场景开头相同的步骤合并成前缀树，共同的前缀只执行一次：在分叉点记录浏览器快照，
+执行完一个分支后恢复快照再执行下一个分支。快照不包含只存在于DOM中的状态，
+所以恢复后会重放分叉点之前、最近一次导航之后的DOM步骤（例如排序）。
+"""
+
+import json
+import os
+import time
+from selenium.common.exceptions import WebDriverException
+from config import Config
+from .checkpoint import Checkpoint
+from .loadgen import STEPS as LOADGEN_STEPS, Shopper
+
+
+def _as_list(value):
+    """把单个值包装成列表
+    
+    Args:
+        value: 单个值或列表
+    
+    Returns:
+        list: 列表
+    """
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _cart_remove(shopper, names):
+    """在购物车页面逐个移除商品
+    
+    Args:
+        shopper: 模拟用户
+        names: 商品名称或名称列表
+    """
+    for name in _as_list(names):
+        shopper.cart_page.remove_item_by_name(name)
+
+
+def _assert_total(shopper, expected):
+    """断言购物车总价
+    
+    Args:
+        shopper: 模拟用户
+        expected: 期望的总价
+    """
+    actual = shopper.cart_page.get_total_price()
+    assert abs(actual - float(expected)) < 0.005, f"购物车总价应该为 {expected}，实际为 {actual:.2f}"
+
+
+def _assert_cart(shopper, names):
+    """断言购物车中的商品，不考虑顺序
+    
+    Args:
+        shopper: 模拟用户
+        names: 期望的商品名称或名称列表
+    """
+    actual = shopper.cart_page.get_cart_item_names()
+    assert sorted(actual) == sorted(_as_list(names)), f"购物车商品应该为 {names}，实际为 {actual}"
+
+
+def _assert_cart_count(shopper, expected):
+    """断言产品页面购物车徽章显示的数量
+    
+    Args:
+        shopper: 模拟用户
+        expected: 期望的数量
+    """
+    actual = shopper.products_page.get_cart_items_count()
+    assert actual == int(expected), f"购物车徽章应该显示 {expected}，实际为 {actual}"
+
+
+def _assert_first_product(shopper, expected):
+    """断言产品列表中的第一个商品，用于检查排序
+    
+    Args:
+        shopper: 模拟用户
+        expected: 期望的商品名称
+    """
+    names = shopper.products_page.get_product_names()
+    assert names and names[0] == expected, f"第一个商品应该为 {expected}，实际为 {names[:1]}"
+
+
+def _assert_url(shopper, fragment):
+    """断言当前地址包含指定片段
+    
+    Args:
+        shopper: 模拟用户
+        fragment: 地址片段，例如 cart.html
+    """
+    url = shopper.driver.current_url
+    assert fragment in url, f"当前地址应该包含 {fragment}，实际为 {url}"
+
+
+# 场景步骤：名称到 (shopper, 参数) 函数的映射
+STEPS = dict(LOADGEN_STEPS, **{
+    "add": lambda shopper, names: shopper.products_page.add_products_to_cart(_as_list(names)),
+    "remove": lambda shopper, names: shopper.products_page.remove_products_from_cart(_as_list(names)),
+    "cart_remove": _cart_remove,
+    "assert_total": _assert_total,
+    "assert_cart": _assert_cart,
+    "assert_cart_count": _assert_cart_count,
+    "assert_first_product": _assert_first_product,
+    "assert_url": _assert_url
+})
+
+# 打开新页面的步骤，执行后之前的DOM状态全部丢失
+NAVIGATION_STEPS = {"login", "view_cart", "checkout", "continue_shopping", "logout"}
+
+# 只改变DOM、不改变cookies和存储的步骤，恢复快照后需要重放
+DOM_STEPS = {"sort"}
+
+
+def normalize_step(step):
+    """把步骤转换成 (名称, 参数)
+    
+    Args:
+        step: 步骤名称，或只有一个键的字典 {步骤名称: 参数}
+    
+    Returns:
+        tuple: (步骤名称, 参数)
+    
+    Raises:
+        ValueError: 步骤格式不正确
+    """
+    if isinstance(step, str):
+        return step, None
+    if isinstance(step, dict) and len(step) == 1:
+        return next(iter(step.items()))
+    raise ValueError(f"场景步骤应该是名称或只有一个键的字典: {step}")
+
+
+def step_label(step):
+    """生成步骤的可读描述
+    
+    Args:
+        step: (名称, 参数)
+    
+    Returns:
+        str: 描述，例如 add: ["Sauce Labs Backpack"]
+    """
+    name, argument = step
+    return name if argument is None else f"{name}: {json.dumps(argument, ensure_ascii=False)}"
+
+
+def load_scenarios(path):
+    """读取场景文件，扩展名为 .yaml/.yml 时需要安装 PyYAML
+    
+    Args:
+        path: 场景文件路径
+    
+    Returns:
+        list: 场景列表，每个场景包含 name 和 steps
+    """
+    with open(path, encoding="utf-8") as f:
+        if os.path.splitext(path)[1] in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise RuntimeError("读取YAML场景文件需要安装 PyYAML，或改用JSON格式") from e
+            return yaml.safe_load(f)["scenarios"]
+        return json.load(f)["scenarios"]
+
+
+class ScenarioNode:
+    """前缀树节点，一个节点对应一个步骤"""
+    
+    def __init__(self, step=None):
+        """初始化节点
+        
+        Args:
+            step: (名称, 参数)，根节点为None
+        """
+        self.step = step
+        self.children = {}
+        self.scenarios = []
+    
+    def scenario_names(self):
+        """返回以该节点为前缀的所有场景名称
+        
+        Returns:
+            list: 场景名称
+        """
+        names = list(self.scenarios)
+        for child in self.children.values():
+            names.extend(child.scenario_names())
+        return names
+
+
+def build_tree(scenarios, steps=None):
+    """把场景合并成前缀树
+    
+    Args:
+        scenarios: 场景列表
+        steps: 可用的步骤，默认为 STEPS
+    
+    Returns:
+        ScenarioNode: 根节点
+    
+    Raises:
+        ValueError: 场景名称重复或使用了未知的步骤
+    """
+    steps = steps or STEPS
+    root = ScenarioNode()
+    names = set()
+    for scenario in scenarios:
+        if scenario["name"] in names:
+            raise ValueError(f"场景名称重复: {scenario['name']}")
+        names.add(scenario["name"])
+        node = root
+        for raw_step in scenario["steps"]:
+            step = normalize_step(raw_step)
+            if step[0] not in steps:
+                raise ValueError(f"场景 {scenario['name']} 使用了未知的步骤: {step[0]}")
+            key = json.dumps(step, sort_keys=True)
+            node = node.children.setdefault(key, ScenarioNode(step))
+        node.scenarios.append(scenario["name"])
+    return root
+
+
+class ScenarioRunner:
+    """场景运行器，在一个浏览器中按前缀树执行所有场景"""
+    
+    def __init__(self, driver, steps=None, base_url=None):
+        """初始化运行器
+        
+        Args:
+            driver: WebDriver实例
+            steps: 可用的步骤，默认为 STEPS
+            base_url: 站点地址，默认为 Config.BASE_URL
+        """
+        self.driver = driver
+        self.shopper = Shopper(driver)
+        self.steps = steps or STEPS
+        self.base_url = base_url or Config.BASE_URL
+        self.results = {}
+        self.stats = {}
+    
+    def run(self, scenarios):
+        """执行所有场景
+        
+        Args:
+            scenarios: 场景列表
+        
+        Returns:
+            dict: 场景名称到结果 {passed, error, step} 的映射
+        """
+        root = build_tree(scenarios, self.steps)
+        self.results = {}
+        self.stats = {
+            "scenarios": len(scenarios),
+            "scenario_steps": sum(len(scenario["steps"]) for scenario in scenarios),
+            "executed_steps": 0,
+            "replayed_steps": 0,
+            "checkpoints": 0,
+            "restores": 0,
+            "elapsed": 0.0
+        }
+        start_time = time.perf_counter()
+        # 从站点首页开始，根节点的快照即为未登录且没有任何存储的状态
+        self.driver.get(self.base_url)
+        self._run_children(root, [])
+        self.stats["elapsed"] = time.perf_counter() - start_time
+        return self.results
+    
+    def _execute(self, step, replay=False):
+        """执行一个步骤，每个步骤只计入执行或重放中的一项
+        
+        Args:
+            step: (名称, 参数)
+            replay: 是否为恢复快照后重放的DOM步骤
+        """
+        name, argument = step
+        self.steps[name](self.shopper, argument)
+        self.stats["replayed_steps" if replay else "executed_steps"] += 1
+    
+    def _run_children(self, node, dom_steps):
+        """依次执行节点的所有分支，第二个分支开始先恢复分叉点的快照
+        
+        Args:
+            node: 已执行完步骤的节点
+            dom_steps: 最近一次导航之后执行的DOM步骤
+        """
+        for name in node.scenarios:
+            self.results[name] = {"passed": True, "error": None, "step": None}
+        children = list(node.children.values())
+        checkpoint = None
+        if len(children) > 1:
+            checkpoint = Checkpoint.capture(self.driver)
+            self.stats["checkpoints"] += 1
+        
+        for index, child in enumerate(children):
+            # 失败时报告实际出错的环节：恢复快照、重放的DOM步骤或分支自己的步骤
+            current = None
+            try:
+                if index > 0:
+                    current = "恢复快照"
+                    checkpoint.restore(self.driver)
+                    self.stats["restores"] += 1
+                    for step in dom_steps:
+                        current = f"{step_label(step)}（恢复快照后重放）"
+                        self._execute(step, replay=True)
+                current = step_label(child.step)
+                self._execute(child.step)
+            except (AssertionError, WebDriverException, ValueError) as e:
+                # 步骤失败时该分支下的所有场景都失败，其他分支从快照继续
+                for name in child.scenario_names():
+                    self.results[name] = {"passed": False, "error": f"{type(e).__name__}: {e}", "step": current}
+                continue
+            if child.step[0] in NAVIGATION_STEPS:
+                child_dom_steps = []
+            elif child.step[0] in DOM_STEPS:
+                child_dom_steps = dom_steps + [child.step]
+            else:
+                child_dom_steps = dom_steps
+            self._run_children(child, child_dom_steps)
@@ -0,0 +1,10 @@
+"""流式测试报告 - 测试运行期间逐条追加写入NDJSON结果，附件保存为独立文件，由静态页面按需渲染"""
+
+from .writer import StreamReportWriter
+from .plugin import StreamReportPlugin, add_asset
+
+__all__ = [
+    'StreamReportWriter',
+    'StreamReportPlugin',
+    'add_asset'
+]
@@ -0,0 +1,36 @@
+"""在本地HTTP服务中打开流式报告
+
+用法::
+
+    python -m core.stream_report                 # 查看 reports/stream
+    python -m core.stream_report reports/stream --port 8000
+"""
+
+import argparse
+import functools
+import sys
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from config import Config
+
+
+def main(argv=None):
+    """命令行入口：以报告目录为根启动静态文件服务"""
+    parser = argparse.ArgumentParser(description="在浏览器中查看流式测试报告")
+    parser.add_argument("directory", nargs="?", default=Config.STREAM_REPORT_DIR, help="报告目录")
+    parser.add_argument("--port", type=int, default=0, help="监听端口，0表示随机端口")
+    args = parser.parse_args(argv)
+    
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=args.directory)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), handler)
+    print(f"报告地址: http://127.0.0.1:{server.server_address[1]}/index.html（Ctrl+C 退出）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""流式报告插件 - 每个测试结束时立即向 results.ndjson 追加一条记录
+
+作为pytest插件加载，只在控制进程（或串行运行时）写报告；worker的报告由xdist转发给控制进程。
+测试可以通过 ``add_asset`` 附加截图等文件，附件直接写入报告的 assets 目录，不内嵌在报告中。
+"""
+
+import base64
+import time
+from config import Config
+from .writer import StreamReportWriter, asset_filename
+
+# 失败信息和捕获输出的最大长度，避免单条记录过大
+MAX_TEXT = 20000
+
+
+def _truncate(text):
+    """截断过长的文本
+    
+    Args:
+        text: 原始文本
+    
+    Returns:
+        str: 不超过 MAX_TEXT 的文本
+    """
+    if len(text) <= MAX_TEXT:
+        return text
+    return text[:MAX_TEXT] + f"\n... 省略 {len(text) - MAX_TEXT} 个字符"
+
+
+def add_asset(node, name, content):
+    """为测试附加一个附件文件
+    
+    Args:
+        node: 测试项（request.node）
+        name: 附件名称，例如 screenshot.png
+        content: 附件内容（bytes或str）
+    
+    Returns:
+        str: 相对报告目录的附件路径，未启用流式报告时为None
+    """
+    directory = node.config.getoption("stream_report")
+    if not directory:
+        return None
+    path = StreamReportWriter(directory).write_asset(f"{node.nodeid}-{name}", content)
+    node.user_properties.append(("asset", {"name": name, "path": path}))
+    return path
+
+
+class StreamReportPlugin:
+    """流式报告插件，在测试的teardown报告到达时写出该测试的完整记录"""
+    
+    def __init__(self, writer):
+        """初始化插件
+        
+        Args:
+            writer: StreamReportWriter 实例
+        """
+        self.writer = writer
+        self.counts = {}
+        self._pending = {}
+        self._start_time = None
+    
+    def pytest_sessionstart(self, session):
+        """打开报告并写入会话记录"""
+        self._start_time = time.time()
+        self.writer.open()
+        self.writer.write({
+            "type": "session",
+            "started": self._start_time,
+            "rootdir": str(session.config.rootpath),
+            "args": list(session.config.invocation_params.args),
+            "base_url": Config.BASE_URL
+        })
+    
+    def pytest_runtest_logreport(self, report):
+        """累加测试各阶段的结果，teardown阶段结束后写出记录"""
+        record = self._pending.setdefault(report.nodeid, {
+            "type": "test",
+            "nodeid": report.nodeid,
+            "location": list(report.location),
+            "outcome": "passed",
+            "duration": 0.0,
+            "phases": {},
+            "worker": None,
+            "longrepr": None,
+            "sections": [],
+            "properties": {},
+            "assets": []
+        })
+        record["phases"][report.when] = {"outcome": report.outcome, "duration": report.duration}
+        record["duration"] += report.duration
+        node = getattr(report, "node", None)
+        if node is not None:
+            record["worker"] = node.gateway.id
+        
+        self._update_outcome(record, report)
+        if report.failed or (report.skipped and report.when != "teardown"):
+            record["longrepr"] = _truncate(str(report.longrepr))
+        self._collect_assets(record, report)
+        
+        if report.when == "teardown":
+            record["sections"] = [
+                {"title": title, "content": _truncate(content)} for title, content in report.sections
+            ]
+            for name, value in report.user_properties:
+                if name == "asset":
+                    record["assets"].append(value)
+                else:
+                    record["properties"][name] = value
+            self._flush(report.nodeid)
+    
+    @staticmethod
+    def _update_outcome(record, report):
+        """按pytest的约定合并阶段结果：setup/teardown失败为error，预期失败为xfailed/xpassed
+        
+        Args:
+            record: 测试记录
+            report: 阶段报告
+        """
+        if hasattr(report, "wasxfail"):
+            record["outcome"] = "xfailed" if report.skipped else "xpassed"
+        elif report.failed:
+            record["outcome"] = "failed" if report.when == "call" else "error"
+        elif report.skipped and record["outcome"] == "passed":
+            record["outcome"] = "skipped"
+    
+    def _collect_assets(self, record, report):
+        """把 pytest-html 内嵌的附件另存为文件
+        
+        Args:
+            record: 测试记录
+            report: 阶段报告
+        """
+        for index, extra in enumerate(getattr(report, "extras", None) or getattr(report, "extra", None) or []):
+            content = extra.get("content")
+            name = extra.get("name") or f"{report.when}-{index}"
+            if extra.get("format_type") == "url":
+                record["assets"].append({"name": name, "url": content})
+                continue
+            if extra.get("format_type") == "image" and not str(content).startswith(("http://", "https://")):
+                content = base64.b64decode(content)
+            extension = extra.get("extension") or "txt"
+            filename = f"{report.nodeid}-{report.when}-{index}-{asset_filename(name)}.{extension}"
+            record["assets"].append({"name": name, "path": self.writer.write_asset(filename, content)})
+    
+    def _flush(self, nodeid):
+        """写出一个测试的记录
+        
+        Args:
+            nodeid: 测试节点ID
+        """
+        record = self._pending.pop(nodeid)
+        self.counts[record["outcome"]] = self.counts.get(record["outcome"], 0) + 1
+        self.writer.write(record)
+    
+    def pytest_sessionfinish(self, session, exitstatus):
+        """写出未完成的测试和汇总记录，关闭报告"""
+        for nodeid in list(self._pending):
+            self._flush(nodeid)
+        self.writer.write({
+            "type": "summary",
+            "counts": self.counts,
+            "exitstatus": int(exitstatus),
+            "duration": time.time() - self._start_time,
+            "finished": time.time()
+        })
+        self.writer.close()
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        """在测试摘要中输出报告位置"""
+        terminalreporter.write_line(
+            f"流式报告: {self.writer.directory}/index.html（{self.writer.records} 条记录，"
+            f"使用 python -m core.stream_report 在浏览器中查看）"
+        )
+
+
+def pytest_addoption(parser):
+    """注册流式报告选项"""
+    group = parser.getgroup("stream-report", "流式测试报告")
+    group.addoption(
+        "--stream-report",
+        default=Config.STREAM_REPORT_DIR,
+        metavar="DIR",
+        help="流式报告目录，默认为 reports/stream"
+    )
+    group.addoption(
+        "--no-stream-report",
+        dest="stream_report",
+        action="store_const",
+        const=None,
+        help="不生成流式报告"
+    )
+
+
+def pytest_configure(config):
+    """在控制进程（或串行运行时）注册流式报告插件，只收集测试时不覆盖上一次的报告"""
+    directory = config.getoption("stream_report")
+    if directory and not config.option.collectonly and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(StreamReportPlugin(StreamReportWriter(directory)), "stream-report")
@@ -0,0 +1,95 @@
+"""NDJSON报告写入器 - 每条记录写完立即落盘，运行被中断时已完成的结果仍然可读"""
+
+import json
+import os
+import re
+import shutil
+import threading
+
+VIEWER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "viewer.html")
+RESULTS_FILE = "results.ndjson"
+ASSETS_DIR = "assets"
+
+
+class StreamReportWriter:
+    """流式报告写入器
+    
+    报告目录结构::
+    
+        index.html        静态查看页面
+        results.ndjson    每行一条JSON记录：session、test、summary
+        assets/           截图等附件，每个附件一个文件
+    """
+    
+    def __init__(self, directory):
+        """初始化写入器
+        
+        Args:
+            directory: 报告目录
+        """
+        self.directory = directory
+        self.results_path = os.path.join(directory, RESULTS_FILE)
+        self.assets_dir = os.path.join(directory, ASSETS_DIR)
+        self.records = 0
+        self._file = None
+        self._lock = threading.Lock()
+    
+    def open(self):
+        """清空上一次运行的结果和附件，写入查看页面并打开结果文件
+        
+        Returns:
+            StreamReportWriter: 写入器本身，便于链式调用
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        shutil.rmtree(self.assets_dir, ignore_errors=True)
+        os.makedirs(self.assets_dir, exist_ok=True)
+        shutil.copyfile(VIEWER_FILE, os.path.join(self.directory, "index.html"))
+        self._file = open(self.results_path, "w", encoding="utf-8")
+        return self
+    
+    def write(self, record):
+        """追加一条记录并立即刷新到磁盘
+        
+        Args:
+            record: 可JSON序列化的字典
+        """
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.records += 1
+    
+    def write_asset(self, name, content):
+        """把附件保存为独立文件
+        
+        Args:
+            name: 附件文件名，不安全的字符会被替换
+            content: 附件内容（bytes或str）
+        
+        Returns:
+            str: 相对报告目录的附件路径
+        """
+        filename = asset_filename(name)
+        mode = "wb" if isinstance(content, bytes) else "w"
+        with open(os.path.join(self.assets_dir, filename), mode) as f:
+            f.write(content)
+        return f"{ASSETS_DIR}/{filename}"
+    
+    def close(self):
+        """关闭结果文件"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def asset_filename(name):
+    """把测试节点ID等任意文本转换为安全的文件名
+    
+    Args:
+        name: 原始名称
+    
+    Returns:
+        str: 只包含字母、数字、点、横线和下划线的文件名
+    """
+    return re.sub(r"[^\w.-]+", "_", name).strip("_")[:200]
@@ -0,0 +1,58 @@
+"""进程统计 - 并行运行时把各进程内的统计交给控制进程汇总
+
+pytest-xdist 的每个worker都是独立的进程，驱动解析记录这类进程内的统计在控制进程中是空的。
+每个进程在测试会话结束时把统计写入 ``Config.WORKER_STATS_DIR``，控制进程在测试摘要中读取所有进程的统计。
+"""
+
+import json
+import os
+import shutil
+from config import Config
+
+
+def clear(directory=None):
+    """删除上一次运行写入的统计
+    
+    Args:
+        directory: 统计目录，默认为 Config.WORKER_STATS_DIR
+    """
+    shutil.rmtree(directory or Config.WORKER_STATS_DIR, ignore_errors=True)
+
+
+def write(name, data, directory=None):
+    """写入本进程的一项统计，没有数据时不写入
+    
+    Args:
+        name: 统计名称
+        data: 可以序列化为JSON的统计数据
+        directory: 统计目录，默认为 Config.WORKER_STATS_DIR
+    """
+    if not data:
+        return
+    directory = directory or Config.WORKER_STATS_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}-{os.getpid()}.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(path + ".tmp", path)
+
+
+def load(name, directory=None):
+    """读取所有进程写入的一项统计
+    
+    Args:
+        name: 统计名称
+        directory: 统计目录，默认为 Config.WORKER_STATS_DIR
+    
+    Returns:
+        list: 每个进程的统计数据
+    """
+    directory = directory or Config.WORKER_STATS_DIR
+    if not os.path.isdir(directory):
+        return []
+    results = []
+    for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+        if entry.name.startswith(f"{name}-") and entry.name.endswith(".json"):
+            with open(entry.path, encoding="utf-8") as f:
+                results.append(json.load(f))
+    return results
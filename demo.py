@@ -8,6 +8,8 @@
 
 import time
 from config import Config
+from core import get_factory
+from core import local_site
 from pages import LoginPage, ProductsPage, CartPage
 
 
@@ -16,8 +18,19 @@ def main():
     print("🚀 开始演示 Python Selenium PO Demo")
     print("=" * 50)
     
+    # 使用本地替身站点时，先在进程内启动站点
+    with local_site.for_target() as site:
+        if site is not None:
+            print(f"🏠 本地站点已启动: {Config.BASE_URL}")
+        run_demo()
+
+
+def run_demo():
+    """在 Config.BASE_URL 上演示登录、浏览、购物车和登出流程"""
     # 初始化WebDriver
-    driver = Config.get_driver()
+    factory = get_factory()
+    driver = factory.create()
+    print(f"🌐 浏览器已启动（{Config.DRIVER_PROFILE} 配置），耗时 {factory.startups[-1]['elapsed']:.2f}s")
     
     try:
         # 创建页面对象
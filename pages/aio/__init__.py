@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+Async Pages Package
+
+这个包包含了页面对象的 asyncio 版本，动作和等待都可以 await，
+一个事件循环可以同时驱动多个浏览器会话。
+"""
+
+from .base_page import AsyncBasePage
+from .login_page import AsyncLoginPage
+from .products_page import AsyncProductsPage
+from .cart_page import AsyncCartPage
+from .sessions import run_sessions
+
+__all__ = [
+    'AsyncBasePage',
+    'AsyncLoginPage',
+    'AsyncProductsPage',
+    'AsyncCartPage',
+    'run_sessions'
+]
@@ -0,0 +1,340 @@
+"""异步基础页面类 - 所有异步页面对象的父类"""
+
+import asyncio
+import functools
+import time
+from selenium.common.exceptions import JavascriptException, NoSuchElementException, TimeoutException
+from config import Config
+from .. import scripts
+from .. import waits
+from ..waits import is_navigation_error
+
+
+class AsyncBasePage:
+    """异步基础页面类，提供可 await 的页面操作方法
+    
+    WebDriver客户端的每次调用都是阻塞的HTTP请求，异步页面对象把这些调用放到线程池中执行，
+    事件循环在等待浏览器响应期间可以驱动其他浏览器会话。
+    
+    等待不轮询：每次等待只发出一个 execute_async_script，脚本在浏览器中通过
+    MutationObserver 或 load 事件判断条件，满足或超时时返回。
+    页面就绪条件 ``READY_CONDITION`` 与同步页面对象相同。
+    """
+    
+    READY_CONDITION = None
+    
+    def __init__(self, driver, executor=None):
+        """初始化异步页面对象
+        
+        Args:
+            driver: WebDriver实例
+            executor: 执行阻塞WebDriver调用的线程池，默认使用事件循环的默认线程池
+        """
+        self.driver = driver
+        self.executor = executor
+        self.wait_log = []
+        self.last_wait = None
+        self.last_navigation = None
+    
+    async def _call(self, function, *args):
+        """在线程池中执行一次阻塞的WebDriver调用
+        
+        Args:
+            function: 要执行的函数
+            *args: 函数参数
+        
+        Returns:
+            函数的返回值
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(function, *args))
+    
+    def _record_wait(self, name, locator, timeout, elapsed, success):
+        """记录一次等待
+        
+        Args:
+            name: 等待名称
+            locator: 相关的元素定位器
+            timeout: 等待超时时间
+            elapsed: 实际耗时（秒）
+            success: 条件是否满足
+        """
+        self.last_wait = {
+            "name": name,
+            "locator": locator,
+            "timeout": timeout,
+            "elapsed": elapsed,
+            "success": success
+        }
+        self.wait_log.append(self.last_wait)
+    
+    async def _wait_for_element(self, name, locator, state, timeout=None):
+        """等待元素达到指定状态，一次脚本调用完成
+        
+        Args:
+            name: 等待名称
+            locator: 元素定位器 (By, value)
+            state: present、visible、clickable 或 absent
+            timeout: 等待超时时间，默认为 Config.EXPLICIT_WAIT
+        
+        Returns:
+            dict: 脚本返回的 {matched, element}
+        """
+        timeout = Config.EXPLICIT_WAIT if timeout is None else timeout
+        start_time = time.perf_counter()
+        arguments = (scripts.WAIT_FOR_ELEMENT, locator[0], locator[1], state, int(timeout * 1000))
+        try:
+            result = await self._call(self.driver.execute_async_script, *arguments)
+        except JavascriptException as e:
+            if not is_navigation_error(e):
+                raise
+            # 页面跳转会中断异步脚本，等待新文档加载完成后重试一次
+            await self._wait_for_ready(None, timeout)
+            result = await self._call(self.driver.execute_async_script, *arguments)
+        self._record_wait(name, locator, timeout, time.perf_counter() - start_time, result["matched"])
+        return result
+    
+    async def open(self, url):
+        """打开页面并等待加载完成
+        
+        Args:
+            url: 页面URL
+        """
+        await self._call(self.driver.get, url)
+        await self.wait_for_page_load()
+    
+    async def find_element(self, locator):
+        """查找单个元素
+        
+        Args:
+            locator: 元素定位器 (By, value)
+        
+        Returns:
+            WebElement: 找到的元素
+        """
+        result = await self._wait_for_element("find_element", locator, "present")
+        if not result["matched"]:
+            raise NoSuchElementException(f"无法找到元素: {locator}")
+        return result["element"]
+    
+    async def find_elements(self, locator):
+        """查找多个元素，等待DOM稳定后立即返回，元素不存在时返回空列表
+        
+        Args:
+            locator: 元素定位器 (By, value)
+        
+        Returns:
+            list: 找到的元素列表
+        """
+        await self.wait_for_dom_settled()
+        return await self._call(self.driver.find_elements, *locator)
+    
+    async def click_element(self, locator):
+        """点击元素
+        
+        Args:
+            locator: 元素定位器 (By, value)
+        """
+        element = await self.wait_until_present(locator, state="clickable")
+        await self._call(element.click)
+    
+    async def input_text(self, locator, text):
+        """输入文本
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            text: 要输入的文本
+        """
+        element = await self.find_element(locator)
+        await self._call(element.clear)
+        await self._call(element.send_keys, text)
+    
+    async def get_text(self, locator):
+        """获取元素文本
+        
+        Args:
+            locator: 元素定位器 (By, value)
+        
+        Returns:
+            str: 元素文本内容
+        """
+        element = await self.find_element(locator)
+        return await self._call(lambda: element.text)
+    
+    async def read_records(self, locator, fields, timeout=None):
+        """批量读取元素信息，参数与 ``BasePage.read_records`` 相同
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            fields: 字段名到 (子元素定位器, 属性名) 的映射
+            timeout: 等待DOM稳定的超时时间，默认为 Config.EXPLICIT_WAIT
+        
+        Returns:
+            list: 每个匹配元素对应一个字段字典
+        
+        Raises:
+            TimeoutException: WebDriver的脚本超时先于脚本自身的超时到达
+        """
+        spec = waits.records_spec(locator, fields, timeout)
+        arguments = (scripts.READ_ELEMENTS, Config.DOM_SETTLE_QUIET_MS, spec)
+        start_time = time.perf_counter()
+        try:
+            try:
+                result = await self._call(self.driver.execute_async_script, *arguments)
+            except JavascriptException as e:
+                if not is_navigation_error(e):
+                    raise
+                await self._wait_for_ready(None, Config.EXPLICIT_WAIT)
+                result = await self._call(self.driver.execute_async_script, *arguments)
+        except TimeoutException:
+            self._record_wait("read_records", locator, spec["timeout_ms"] / 1000, time.perf_counter() - start_time, False)
+            raise TimeoutException(f"批量读取元素超时: {locator}")
+        self._record_wait(
+            "read_records", locator, spec["timeout_ms"] / 1000, time.perf_counter() - start_time,
+            result.get("settled", True)
+        )
+        
+        if "error" in result:
+            raise ValueError(f"批量读取元素失败: {locator}, {result['error']}")
+        return result["records"]
+    
+    async def read_texts(self, locator):
+        """批量读取所有匹配元素的可见文本
+        
+        Args:
+            locator: 元素定位器 (By, value)
+        
+        Returns:
+            list: 元素文本列表
+        """
+        records = await self.read_records(locator, {"text": (None, "text")})
+        return [record["text"] for record in records]
+    
+    async def wait_until_present(self, locator, timeout=None, state="visible"):
+        """断言元素出现：元素达到指定状态时立即返回
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            timeout: 等待超时时间，默认为 Config.EXPLICIT_WAIT
+            state: 元素状态，visible 或 clickable
+        
+        Returns:
+            WebElement: 满足状态的元素
+        
+        Raises:
+            TimeoutException: 超时后元素仍未达到指定状态
+        """
+        result = await self._wait_for_element("wait_until_present", locator, state, timeout)
+        if not result["matched"]:
+            raise TimeoutException(f"等待元素超时: {locator}")
+        return result["element"]
+    
+    async def wait_until_absent(self, locator, timeout=None):
+        """断言元素不存在：元素不可见时立即返回
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            timeout: 等待超时时间，默认为 Config.EXPLICIT_WAIT
+        
+        Returns:
+            bool: 元素是否已不可见
+        """
+        result = await self._wait_for_element("wait_until_absent", locator, "absent", timeout)
+        return result["matched"]
+    
+    async def wait_for_dom_settled(self, timeout=None):
+        """等待页面加载完成且DOM在一段静默期内不再变化，DOM在超时前一直变化时返回
+        
+        Args:
+            timeout: 等待超时时间，默认为 Config.EXPLICIT_WAIT
+        """
+        timeout = Config.EXPLICIT_WAIT if timeout is None else timeout
+        start_time = time.perf_counter()
+        arguments = (scripts.DOM_SETTLED, Config.DOM_SETTLE_QUIET_MS, int(min(timeout, Config.EXPLICIT_WAIT) * 1000))
+        try:
+            settled = await self._call(self.driver.execute_async_script, *arguments)
+        except TimeoutException:
+            settled = False
+        except JavascriptException as e:
+            if not is_navigation_error(e):
+                raise
+            self._record_wait("wait_for_dom_settled", None, timeout, time.perf_counter() - start_time, False)
+            await self._wait_for_ready(None, timeout)
+            return
+        self._record_wait("wait_for_dom_settled", None, timeout, time.perf_counter() - start_time, bool(settled))
+    
+    async def is_element_visible(self, locator, timeout=5):
+        """检查元素是否可见，元素出现时立即返回True
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            timeout: 等待超时时间
+        
+        Returns:
+            bool: 元素是否可见
+        """
+        result = await self._wait_for_element("is_element_visible", locator, "visible", timeout)
+        return result["matched"]
+    
+    async def is_element_displayed(self, locator):
+        """等待DOM稳定后检查元素当前是否可见，不为不存在的元素等待超时
+        
+        Args:
+            locator: 元素定位器 (By, value)
+        
+        Returns:
+            bool: 元素是否可见
+        """
+        await self.wait_for_dom_settled()
+        result = await self._wait_for_element("is_element_displayed", locator, "visible", 0)
+        return result["matched"]
+    
+    async def wait_for_page_load(self, timeout=30):
+        """等待页面加载完成且页面对象的就绪条件（``READY_CONDITION``）满足
+        
+        Args:
+            timeout: 等待超时时间
+            
+        Raises:
+            TimeoutException: 超时后页面仍未就绪
+        """
+        await self._wait_for_ready(self.READY_CONDITION, timeout)
+    
+    async def _wait_for_ready(self, condition, timeout):
+        """在浏览器内等待文档加载完成且就绪条件满足，不轮询 document.readyState
+        
+        重试规则与 ``BasePage._wait_for_ready`` 相同，见 ``waits.ReadyPoll``。
+        
+        Args:
+            condition: 就绪条件，为None时只等待文档加载完成
+            timeout: 等待超时时间
+            
+        Raises:
+            TimeoutException: 超时后页面仍未就绪
+            JavascriptException: 脚本执行出错（不是页面跳转引起的中断）
+        """
+        poll = waits.ReadyPoll(condition, timeout)
+        for arguments in poll:
+            try:
+                poll.state = await self._call(self.driver.execute_async_script, scripts.WAIT_FOR_READY, *arguments)
+            except (JavascriptException, TimeoutException) as e:
+                poll.failed(e)
+        self._record_wait("wait_for_page_load", poll.locator, timeout, poll.elapsed, poll.ready)
+        # 多个会话并发运行，导航计时保存在页面对象上而不是进程共享的指标收集器中
+        self.last_navigation = poll.navigation()
+    
+    async def get_current_url(self):
+        """获取当前页面URL
+        
+        Returns:
+            str: 当前页面URL
+        """
+        return await self._call(lambda: self.driver.current_url)
+    
+    async def get_page_title(self):
+        """获取页面标题
+        
+        Returns:
+            str: 页面标题
+        """
+        return await self._call(lambda: self.driver.title)
@@ -0,0 +1,95 @@
+"""异步购物车页面对象类"""
+
+from selenium.webdriver.common.by import By
+from ..cart_page import CartPage
+from .base_page import AsyncBasePage
+from .locator_registry import AsyncLocatorRegistry
+
+
+class AsyncCartPage(AsyncBasePage):
+    """异步购物车页面类，定位器与 CartPage 共用"""
+    
+    READY_CONDITION = CartPage.READY_CONDITION
+    
+    PAGE_TITLE = CartPage.PAGE_TITLE
+    CONTINUE_SHOPPING_BUTTON = CartPage.CONTINUE_SHOPPING_BUTTON
+    CHECKOUT_BUTTON = CartPage.CHECKOUT_BUTTON
+    CART_ITEMS = CartPage.CART_ITEMS
+    CART_ITEM_NAMES = CartPage.CART_ITEM_NAMES
+    CART_ITEM_PRICES = CartPage.CART_ITEM_PRICES
+    CART_ITEM_QUANTITIES = CartPage.CART_ITEM_QUANTITIES
+    ITEM_FIELDS = CartPage.ITEM_FIELDS
+    
+    def __init__(self, driver, executor=None):
+        """初始化异步购物车页面
+        
+        Args:
+            driver: WebDriver实例
+            executor: 执行阻塞WebDriver调用的线程池
+        """
+        super().__init__(driver, executor)
+        self.locators = AsyncLocatorRegistry(self, self.CART_ITEMS, self.ITEM_FIELDS)
+    
+    async def is_cart_page(self):
+        """检查是否在购物车页面
+        
+        Returns:
+            bool: 是否在购物车页面
+        """
+        return await self.is_element_visible(self.PAGE_TITLE) and \
+               "Your Cart" in await self.get_text(self.PAGE_TITLE)
+    
+    async def click_continue_shopping(self):
+        """点击继续购物按钮"""
+        await self.click_element(self.CONTINUE_SHOPPING_BUTTON)
+    
+    async def click_checkout(self):
+        """点击结账按钮"""
+        await self.click_element(self.CHECKOUT_BUTTON)
+    
+    async def get_cart_items_count(self):
+        """获取购物车中商品数量
+        
+        Returns:
+            int: 购物车中商品数量
+        """
+        return len(await self.find_elements(self.CART_ITEMS))
+    
+    async def get_cart_item_names(self):
+        """获取购物车中所有商品名称
+        
+        Returns:
+            list: 商品名称列表
+        """
+        return await self.read_texts(self.CART_ITEM_NAMES)
+    
+    async def get_cart_item_prices(self):
+        """获取购物车中所有商品价格
+        
+        Returns:
+            list: 商品价格列表
+        """
+        return await self.read_texts(self.CART_ITEM_PRICES)
+    
+    async def remove_item_by_name(self, product_name):
+        """根据商品名称移除商品
+        
+        Args:
+            product_name: 商品名称或标识
+        
+        Raises:
+            NoSuchElementException: 购物车中没有该商品
+        """
+        entry = await self.locators.lookup(product_name)
+        await self.click_element((By.ID, entry["remove_id"]))
+        # 移除后条目位置发生变化
+        self.locators.invalidate()
+    
+    async def get_total_price(self):
+        """计算购物车总价格
+        
+        Returns:
+            float: 总价格
+        """
+        prices = await self.get_cart_item_prices()
+        return sum(float(price.replace('$', '')) for price in prices)
@@ -0,0 +1,47 @@
+"""异步商品定位器索引 - ``LocatorRegistry`` 的 asyncio 版本"""
+
+from selenium.common.exceptions import TimeoutException
+from config import Config
+from ..locator_registry import LocatorRegistry
+
+
+class AsyncLocatorRegistry(LocatorRegistry):
+    """按页面加载缓存的商品定位器索引，建立索引时 await 异步页面对象的等待和读取"""
+    
+    async def index(self):
+        """返回当前页面的索引，页面发生导航后重新建立
+        
+        Returns:
+            ItemIndex: 商品索引
+        """
+        if not self._is_current():
+            await self._build()
+        return self._index
+    
+    async def _build(self):
+        """短暂确认页面就绪后读取商品列表建立索引，页面未就绪时建立空索引"""
+        try:
+            await self.page._wait_for_ready(self.page.READY_CONDITION, Config.READY_PROBE_TIMEOUT)
+        except TimeoutException:
+            self._store([])
+            return
+        self._store(await self.page.read_records(self.item_locator, self.fields))
+    
+    async def lookup(self, key):
+        """按商品名称或标识查找定位信息
+        
+        Args:
+            key: 商品名称或标识
+        
+        Returns:
+            dict: name、slug、add_id、remove_id、price、position
+        
+        Raises:
+            NoSuchElementException: 重新读取商品列表后仍然没有该商品
+        """
+        builds = self.builds
+        index = await self.index()
+        if key not in index and self.builds == builds:
+            await self._build()
+            index = self._index
+        return index.lookup(key)
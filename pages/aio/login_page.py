@@ -0,0 +1,61 @@
+"""异步登录页面对象类"""
+
+from ..login_page import LoginPage
+from .base_page import AsyncBasePage
+
+
+class AsyncLoginPage(AsyncBasePage):
+    """异步登录页面类，定位器与 LoginPage 共用"""
+    
+    READY_CONDITION = LoginPage.READY_CONDITION
+    
+    USERNAME_INPUT = LoginPage.USERNAME_INPUT
+    PASSWORD_INPUT = LoginPage.PASSWORD_INPUT
+    LOGIN_BUTTON = LoginPage.LOGIN_BUTTON
+    ERROR_MESSAGE = LoginPage.ERROR_MESSAGE
+    ERROR_BUTTON = LoginPage.ERROR_BUTTON
+    
+    async def login(self, username, password):
+        """执行登录操作
+        
+        Args:
+            username: 用户名
+            password: 密码
+        """
+        await self.input_text(self.USERNAME_INPUT, username)
+        await self.input_text(self.PASSWORD_INPUT, password)
+        await self.click_element(self.LOGIN_BUTTON)
+    
+    async def get_error_message(self):
+        """获取错误信息
+        
+        Returns:
+            str: 错误信息文本，没有错误时为None
+        """
+        if await self.is_element_displayed(self.ERROR_MESSAGE):
+            return await self.get_text(self.ERROR_MESSAGE)
+        return None
+    
+    async def is_error_displayed(self):
+        """检查错误信息是否显示
+        
+        Returns:
+            bool: 错误信息是否显示
+        """
+        return await self.is_element_displayed(self.ERROR_MESSAGE)
+    
+    async def close_error_message(self):
+        """关闭错误信息"""
+        if await self.is_element_displayed(self.ERROR_BUTTON):
+            await self.click_element(self.ERROR_BUTTON)
+            await self.wait_until_absent(self.ERROR_MESSAGE)
+    
+    async def is_login_page(self):
+        """检查是否在登录页面
+        
+        Returns:
+            bool: 是否在登录页面
+        """
+        return await self.is_element_visible(self.LOGIN_BUTTON) and \
+               await self.is_element_visible(self.USERNAME_INPUT) and \
+               await self.is_element_visible(self.PASSWORD_INPUT)
@@ -0,0 +1,123 @@
+"""异步产品页面对象类"""
+
+from selenium.webdriver.common.by import By
+from ..products_page import ProductsPage
+from .base_page import AsyncBasePage
+from .locator_registry import AsyncLocatorRegistry
+
+
+class AsyncProductsPage(AsyncBasePage):
+    """异步产品页面类，定位器与 ProductsPage 共用"""
+    
+    READY_CONDITION = ProductsPage.READY_CONDITION
+    
+    PAGE_TITLE = ProductsPage.PAGE_TITLE
+    MENU_BUTTON = ProductsPage.MENU_BUTTON
+    LOGOUT_LINK = ProductsPage.LOGOUT_LINK
+    CART_ICON = ProductsPage.CART_ICON
+    CART_BADGE = ProductsPage.CART_BADGE
+    SORT_DROPDOWN = ProductsPage.SORT_DROPDOWN
+    PRODUCT_ITEMS = ProductsPage.PRODUCT_ITEMS
+    PRODUCT_NAMES = ProductsPage.PRODUCT_NAMES
+    PRODUCT_PRICES = ProductsPage.PRODUCT_PRICES
+    PRODUCT_BUTTON = ProductsPage.PRODUCT_BUTTON
+    GRID_FIELDS = ProductsPage.GRID_FIELDS
+    
+    def __init__(self, driver, executor=None):
+        """初始化异步产品页面
+        
+        Args:
+            driver: WebDriver实例
+            executor: 执行阻塞WebDriver调用的线程池
+        """
+        super().__init__(driver, executor)
+        self.locators = AsyncLocatorRegistry(self, self.PRODUCT_ITEMS, self.GRID_FIELDS)
+    
+    async def is_products_page(self):
+        """检查是否在产品页面
+        
+        Returns:
+            bool: 是否在产品页面
+        """
+        return await self.is_element_visible(self.PAGE_TITLE) and \
+               "Products" in await self.get_text(self.PAGE_TITLE)
+    
+    async def logout(self):
+        """执行登出操作"""
+        await self.click_element(self.MENU_BUTTON)
+        await self.click_element(self.LOGOUT_LINK)
+    
+    async def click_cart_icon(self):
+        """点击购物车图标"""
+        await self.click_element(self.CART_ICON)
+    
+    async def get_cart_items_count(self):
+        """获取购物车中商品数量
+        
+        Returns:
+            int: 购物车中商品数量
+        """
+        # 购物车为空时没有徽章，不能等待它出现
+        if await self.is_element_displayed(self.CART_BADGE):
+            count_text = await self.get_text(self.CART_BADGE)
+            return int(count_text) if count_text.isdigit() else 0
+        return 0
+    
+    async def get_product_names(self):
+        """获取所有产品名称
+        
+        Returns:
+            list: 产品名称列表
+        """
+        return await self.read_texts(self.PRODUCT_NAMES)
+    
+    async def get_product_prices(self):
+        """获取所有产品价格
+        
+        Returns:
+            list: 产品价格列表
+        """
+        return await self.read_texts(self.PRODUCT_PRICES)
+    
+    async def get_product_grid(self):
+        """一次读取整个产品列表
+        
+        Returns:
+            list: 产品记录列表，每条记录包含 name、price、button_id
+        """
+        return await self.read_records(self.PRODUCT_ITEMS, self.GRID_FIELDS)
+    
+    async def add_product_to_cart_by_name(self, product_name):
+        """根据产品名称添加产品到购物车
+        
+        Args:
+            product_name: 产品名称或标识
+        
+        Raises:
+            NoSuchElementException: 当前页面没有该产品
+        """
+        entry = await self.locators.lookup(product_name)
+        await self.click_element((By.ID, entry["add_id"]))
+    
+    async def remove_product_from_cart_by_name(self, product_name):
+        """根据产品名称从购物车移除产品
+        
+        Args:
+            product_name: 产品名称或标识
+        
+        Raises:
+            NoSuchElementException: 当前页面没有该产品
+        """
+        entry = await self.locators.lookup(product_name)
+        await self.click_element((By.ID, entry["remove_id"]))
+    
+    async def select_sort_option(self, option_value):
+        """选择排序选项
+        
+        Args:
+            option_value: 排序选项值 (za, az, lohi, hilo)
+        """
+        from selenium.webdriver.support.ui import Select
+        dropdown = await self.find_element(self.SORT_DROPDOWN)
+        await self._call(lambda: Select(dropdown).select_by_value(option_value))
+        self.locators.invalidate()
@@ -0,0 +1,38 @@
+"""并发会话 - 在一个事件循环中驱动多个浏览器会话"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+async def run_sessions(scenario, sessions, create_driver=None, max_workers=None):
+    """并发运行多个浏览器会话
+    
+    每个会话在共享的线程池中创建浏览器，执行 ``scenario`` 后关闭浏览器。
+    线程池只承载阻塞的WebDriver请求，会话本身都运行在同一个事件循环中。
+    
+    Args:
+        scenario: 异步函数，接收 (driver, executor)，返回会话结果
+        sessions: 会话数量
+        create_driver: 创建浏览器的函数，默认为 core.driver_factory.create_driver
+        max_workers: 线程池大小，默认为会话数量
+        
+    Returns:
+        list: 每个会话的结果，会话失败时为对应的异常
+    """
+    if create_driver is None:
+        from core.driver_factory import create_driver
+    
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max_workers or sessions, thread_name_prefix="webdriver")
+    
+    async def run_one():
+        driver = await loop.run_in_executor(executor, create_driver)
+        try:
+            return await scenario(driver, executor)
+        finally:
+            await loop.run_in_executor(executor, driver.quit)
+    
+    try:
+        return await asyncio.gather(*(run_one() for _ in range(sessions)), return_exceptions=True)
+    finally:
+        executor.shutdown(wait=False)
@@ -1,26 +1,195 @@
 """基础页面类 - 所有页面对象的父类"""
 
+import functools
+import time
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from config import Config
+from core.metrics import get_command_counter, get_recorder
+from . import scripts
+from . import waits
+from .waits import is_navigation_error
+
+
+def instrumented(action):
+    """记录页面对象操作的总耗时、等待时间、定位器和WebDriver请求数
+    
+    Args:
+        action: 操作名称
+        
+    Returns:
+        function: 方法装饰器
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            recorder = self.recorder
+            counter = get_command_counter(self.driver)
+            locator = args[0] if args and isinstance(args[0], tuple) else None
+            commands_before = counter.count
+            waits_before = len(self.wait_log)
+            start_time = time.perf_counter()
+            with recorder.action() as depth:
+                try:
+                    return method(self, *args, **kwargs)
+                finally:
+                    recorder.record_action(
+                        action,
+                        locator,
+                        time.perf_counter() - start_time,
+                        sum(wait["elapsed"] for wait in self.wait_log[waits_before:]),
+                        counter.count - commands_before,
+                        depth
+                    )
+        return wrapper
+    return decorator
 
 
 class BasePage:
-    """基础页面类，提供通用的页面操作方法"""
+    """基础页面类，提供通用的页面操作方法
+    
+    所有等待都由 ``_wait`` 统一执行：驱动不设置隐式等待，显式等待使用同一个
+    轮询间隔（``Config.POLL_INTERVAL``），每次等待的实际耗时记录在 ``wait_log`` 中。
+    
+    使用 ``instrumented`` 装饰的方法会把耗时、等待时间、定位器和WebDriver请求数
+    记录到 ``core.metrics`` 的指标收集器中。
+    
+    子类在 ``READY_CONDITION`` 中声明页面就绪的条件，``wait_for_page_load`` 在浏览器内
+    通过一次 execute_async_script 等待文档加载完成且条件满足，不轮询 document.readyState。
+    
+    子类在 ``CACHEABLE`` 中列出一次页面访问内不会被替换的静态元素，这些元素查找一次后
+    缓存在页面对象上；发生导航时缓存自动失效，缓存的元素过期时透明地重新查找一次。
+    """
+    
+    # 页面就绪条件: {"locator": 定位器, "min_count": 最少元素数（默认1）, "settle_ms": 满足后的DOM静默期（默认0）}，
+    # 为None时只等待文档加载完成
+    READY_CONDITION = None
     
-    def __init__(self, driver):
+    # 可缓存的静态元素定位器
+    CACHEABLE = ()
+    
+    def __init__(self, driver, recorder=None):
         """初始化页面对象
         
         Args:
             driver: WebDriver实例
+            recorder: 记录操作指标的收集器，默认为进程共享的收集器
         """
         self.driver = driver
-        self.wait = WebDriverWait(driver, Config.EXPLICIT_WAIT)
+        self.recorder = recorder or get_recorder()
+        self.wait_log = []
+        self.last_wait = None
+        self.cache_stats = {"hits": 0, "misses": 0, "stale": 0}
+        self._element_cache = {}
+        self._cache_epoch = None
+        get_command_counter(driver)
+    
+    def _wait(self, name, locator, condition, timeout=None):
+        """统一的等待入口，记录每次等待的实际耗时
+        
+        Args:
+            name: 等待名称
+            locator: 相关的元素定位器，没有时为None
+            condition: 等待条件，接收driver参数
+            timeout: 等待超时时间，默认为 Config.EXPLICIT_WAIT
+            
+        Returns:
+            条件返回的真值
+            
+        Raises:
+            TimeoutException: 超时后条件仍未满足
+        """
+        timeout = Config.EXPLICIT_WAIT if timeout is None else timeout
+        start_time = time.perf_counter()
+        success = False
+        try:
+            wait = WebDriverWait(self.driver, timeout, poll_frequency=Config.POLL_INTERVAL)
+            result = wait.until(condition)
+            success = True
+            return result
+        finally:
+            self._record_wait(name, locator, timeout, time.perf_counter() - start_time, success)
+    
+    def _record_wait(self, name, locator, timeout, elapsed, success):
+        """记录一次等待
+        
+        Args:
+            name: 等待名称
+            locator: 相关的元素定位器
+            timeout: 等待超时时间
+            elapsed: 实际耗时（秒）
+            success: 条件是否满足
+        """
+        self.last_wait = {
+            "name": name,
+            "locator": locator,
+            "timeout": timeout,
+            "elapsed": elapsed,
+            "success": success
+        }
+        self.wait_log.append(self.last_wait)
+    
+    def _cached_element(self, locator):
+        """从元素缓存中取出元素，导航计数变化时先清空缓存
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            
+        Returns:
+            WebElement: 缓存的元素，不可缓存或未缓存时为None
+        """
+        if locator not in self.CACHEABLE:
+            return None
+        epoch = get_command_counter(self.driver).navigation_count
+        if epoch != self._cache_epoch:
+            self._element_cache.clear()
+            self._cache_epoch = epoch
+        element = self._element_cache.get(locator)
+        self._record_cache("hits" if element is not None else "misses")
+        return element
+    
+    def _cache_element(self, locator, element):
+        """把可缓存的元素放入缓存
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            element: 找到的元素
+        """
+        if locator in self.CACHEABLE:
+            self._element_cache[locator] = element
+    
+    def _evict_element(self, locator):
+        """缓存的元素已过期（文档被替换或元素被重新渲染）时移出缓存
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            
+        Returns:
+            bool: 元素是否来自缓存，来自缓存时调用方可以重新查找一次
+        """
+        if self._element_cache.pop(locator, None) is None:
+            return False
+        self._record_cache("stale")
+        return True
+    
+    def _record_cache(self, event):
+        """记录一次元素缓存事件
+        
+        Args:
+            event: hits、misses 或 stale
+        """
+        self.cache_stats[event] += 1
+        self.recorder.record_cache(event)
     
+    @instrumented("find_element")
     def find_element(self, locator):
-        """查找单个元素
+        """查找单个元素，可缓存的元素优先从缓存中返回
         
         Args:
             locator: 元素定位器 (By, value)
@@ -28,13 +197,37 @@ class BasePage:
         Returns:
             WebElement: 找到的元素
         """
+        element = self._cached_element(locator)
+        if element is not None:
+            return element
         try:
-            return self.wait.until(EC.presence_of_element_located(locator))
+            element = self._wait("find_element", locator, EC.presence_of_element_located(locator))
         except TimeoutException:
             raise NoSuchElementException(f"无法找到元素: {locator}")
+        self._cache_element(locator, element)
+        return element
+    
+    def with_element(self, locator, operation):
+        """查找元素并执行操作，缓存的元素已过期时重新查找后再执行一次
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            operation: 接收 WebElement 的函数
+            
+        Returns:
+            操作的返回值
+        """
+        element = self.find_element(locator)
+        try:
+            return operation(element)
+        except StaleElementReferenceException:
+            if not self._evict_element(locator):
+                raise
+            return operation(self.find_element(locator))
     
+    @instrumented("find_elements")
     def find_elements(self, locator):
-        """查找多个元素
+        """查找多个元素，等待DOM稳定后立即返回，元素不存在时返回空列表
         
         Args:
             locator: 元素定位器 (By, value)
@@ -42,20 +235,66 @@ class BasePage:
         Returns:
             list: 找到的元素列表
         """
-        try:
-            return self.wait.until(EC.presence_of_all_elements_located(locator))
-        except TimeoutException:
-            return []
+        self.wait_for_dom_settled()
+        return self.driver.find_elements(*locator)
     
+    @instrumented("click_element")
     def click_element(self, locator):
         """点击元素
         
         Args:
             locator: 元素定位器 (By, value)
         """
-        element = self.wait.until(EC.element_to_be_clickable(locator))
+        element = self._cached_element(locator)
+        if element is not None:
+            try:
+                self._wait("click_element", locator, EC.element_to_be_clickable(element)).click()
+                return
+            except StaleElementReferenceException:
+                self._evict_element(locator)
+        
+        element = self._wait("click_element", locator, EC.element_to_be_clickable(locator))
+        self._cache_element(locator, element)
         element.click()
     
+    @instrumented("click_all")
+    def click_all(self, locators, expect, timeout=None):
+        """批量点击：页面就绪后在一次脚本调用中点击所有目标元素，然后只等待一次期望的状态
+        
+        点击不可重复执行，所以脚本被页面跳转中断时不重试；任何一个目标不存在时不点击任何元素。
+        
+        Args:
+            locators: 点击目标的定位器列表，每个定位器匹配的所有元素都会被点击
+            expect: (定位器, 元素数) 列表，所有定位器匹配的元素数都等于期望值时视为完成
+            timeout: 等待超时时间，默认为 Config.EXPLICIT_WAIT
+        
+        Returns:
+            int: 点击的元素数量
+        
+        Raises:
+            NoSuchElementException: 点击目标不存在
+            TimeoutException: 超时后仍未达到期望的状态
+        """
+        timeout = Config.EXPLICIT_WAIT if timeout is None else timeout
+        self._wait_for_ready(self.READY_CONDITION, timeout)
+        spec = {
+            "clicks": [{"by": by, "value": value} for by, value in locators],
+            "expect": [{"by": locator[0], "value": locator[1], "count": count} for locator, count in expect]
+        }
+        start_time = time.perf_counter()
+        result = self.driver.execute_async_script(
+            scripts.CLICK_AND_WAIT, spec, int(min(timeout, Config.EXPLICIT_WAIT) * 1000)
+        )
+        self._record_wait("click_all", None, timeout, time.perf_counter() - start_time, result["matched"])
+        
+        if result["missing"]:
+            missing = [(target["by"], target["value"]) for target in result["missing"]]
+            raise NoSuchElementException(f"无法找到元素: {missing}")
+        if not result["matched"]:
+            raise TimeoutException(f"批量点击后等待状态超时: {expect}")
+        return result["clicked"]
+    
+    @instrumented("input_text")
     def input_text(self, locator, text):
         """输入文本
         
@@ -63,10 +302,13 @@ class BasePage:
             locator: 元素定位器 (By, value)
             text: 要输入的文本
         """
-        element = self.find_element(locator)
-        element.clear()
-        element.send_keys(text)
+        def clear_and_type(element):
+            element.clear()
+            element.send_keys(text)
+        
+        self.with_element(locator, clear_and_type)
     
+    @instrumented("get_text")
     def get_text(self, locator):
         """获取元素文本
         
@@ -76,11 +318,136 @@ class BasePage:
         Returns:
             str: 元素文本内容
         """
-        element = self.find_element(locator)
-        return element.text
+        return self.with_element(locator, lambda element: element.text)
     
+    @instrumented("read_records")
+    def read_records(self, locator, fields, timeout=None):
+        """批量读取元素信息：等待DOM稳定后，通过一次脚本调用返回所有匹配元素的记录
+        
+        DOM在超时前一直变化时读取当前的元素，这次等待记为未成功，不抛出异常。
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            fields: 字段名到 (子元素定位器, 属性名) 的映射；子元素定位器为None时读取
+                元素本身，属性名为 "text" 时读取可见文本
+            timeout: 等待DOM稳定的超时时间，默认为 Config.EXPLICIT_WAIT
+            
+        Returns:
+            list: 每个匹配元素对应一个字段字典，子元素不存在时字段值为None
+            
+        Raises:
+            TimeoutException: WebDriver的脚本超时先于脚本自身的超时到达
+        """
+        spec = waits.records_spec(locator, fields, timeout)
+        start_time = time.perf_counter()
+        try:
+            try:
+                result = self.driver.execute_async_script(scripts.READ_ELEMENTS, Config.DOM_SETTLE_QUIET_MS, spec)
+            except JavascriptException as e:
+                if not is_navigation_error(e):
+                    raise
+                # 页面跳转会中断异步脚本，等待新文档加载完成后重试一次
+                self._wait_for_ready(None, Config.EXPLICIT_WAIT)
+                result = self.driver.execute_async_script(scripts.READ_ELEMENTS, Config.DOM_SETTLE_QUIET_MS, spec)
+        except TimeoutException:
+            self._record_wait("read_records", locator, spec["timeout_ms"] / 1000, time.perf_counter() - start_time, False)
+            raise TimeoutException(f"批量读取元素超时: {locator}")
+        self._record_wait(
+            "read_records", locator, spec["timeout_ms"] / 1000, time.perf_counter() - start_time,
+            result.get("settled", True)
+        )
+        
+        if "error" in result:
+            raise ValueError(f"批量读取元素失败: {locator}, {result['error']}")
+        return result["records"]
+    
+    def read_texts(self, locator):
+        """批量读取所有匹配元素的可见文本
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            
+        Returns:
+            list: 元素文本列表
+        """
+        return [record["text"] for record in self.read_records(locator, {"text": (None, "text")})]
+    
+    def read_attributes(self, locator, *attributes):
+        """批量读取所有匹配元素的属性
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            *attributes: 属性名，"text" 表示可见文本
+            
+        Returns:
+            list: 每个元素对应一个属性名到属性值的字典
+        """
+        return self.read_records(locator, {attribute: (None, attribute) for attribute in attributes})
+    
+    @instrumented("wait_until_present")
+    def wait_until_present(self, locator, timeout=None):
+        """断言元素出现：元素可见时立即返回
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            timeout: 等待超时时间，默认为 Config.EXPLICIT_WAIT
+            
+        Returns:
+            WebElement: 可见的元素
+            
+        Raises:
+            TimeoutException: 超时后元素仍不可见
+        """
+        return self._wait("wait_until_present", locator, EC.visibility_of_element_located(locator), timeout)
+    
+    @instrumented("wait_until_absent")
+    def wait_until_absent(self, locator, timeout=None):
+        """断言元素不存在：DOM稳定后元素不可见即立即返回
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            timeout: 等待超时时间，默认为 Config.EXPLICIT_WAIT
+            
+        Returns:
+            bool: 元素是否已不可见
+        """
+        self.wait_for_dom_settled(timeout)
+        try:
+            self._wait("wait_until_absent", locator, EC.invisibility_of_element_located(locator), timeout)
+            return True
+        except TimeoutException:
+            return False
+    
+    def wait_for_dom_settled(self, timeout=None):
+        """等待页面加载完成且DOM在一段静默期内不再变化
+        
+        通过一次 execute_async_script 完成，不需要反复轮询；DOM在超时前一直变化时脚本返回，不抛出异常。
+        
+        Args:
+            timeout: 等待超时时间，默认为 Config.EXPLICIT_WAIT
+        """
+        timeout = Config.EXPLICIT_WAIT if timeout is None else timeout
+        start_time = time.perf_counter()
+        try:
+            settled = self.driver.execute_async_script(
+                scripts.DOM_SETTLED, Config.DOM_SETTLE_QUIET_MS, int(min(timeout, Config.EXPLICIT_WAIT) * 1000)
+            )
+        except TimeoutException:
+            settled = False
+        except JavascriptException as e:
+            if not is_navigation_error(e):
+                raise
+            # 页面跳转会中断异步脚本，此时退回到等待新文档加载完成
+            self._record_wait("wait_for_dom_settled", None, timeout, time.perf_counter() - start_time, False)
+            self._wait_for_ready(None, timeout)
+            return
+        self._record_wait("wait_for_dom_settled", None, timeout, time.perf_counter() - start_time, bool(settled))
+    
+    @instrumented("is_element_visible")
     def is_element_visible(self, locator, timeout=5):
-        """检查元素是否可见
+        """检查元素是否可见，元素出现时立即返回True
+        
+        适用于期望元素出现的检查；期望元素可能不存在时使用 ``is_element_displayed``。
         
         Args:
             locator: 元素定位器 (By, value)
@@ -90,20 +457,68 @@ class BasePage:
             bool: 元素是否可见
         """
         try:
-            wait = WebDriverWait(self.driver, timeout)
-            wait.until(EC.visibility_of_element_located(locator))
+            self.wait_until_present(locator, timeout)
             return True
         except TimeoutException:
             return False
     
+    @instrumented("is_element_displayed")
+    def is_element_displayed(self, locator):
+        """等待DOM稳定后检查元素当前是否可见，不为不存在的元素等待超时
+        
+        Args:
+            locator: 元素定位器 (By, value)
+            
+        Returns:
+            bool: 元素是否可见
+        """
+        self.wait_for_dom_settled()
+        try:
+            return any(element.is_displayed() for element in self.driver.find_elements(*locator))
+        except StaleElementReferenceException:
+            # 检查期间元素被重新渲染，重新查找一次
+            return any(element.is_displayed() for element in self.driver.find_elements(*locator))
+    
+    @instrumented("wait_for_page_load")
     def wait_for_page_load(self, timeout=30):
-        """等待页面加载完成
+        """等待页面加载完成且页面对象的就绪条件（``READY_CONDITION``）满足
         
         Args:
             timeout: 等待超时时间
+            
+        Raises:
+            TimeoutException: 超时后页面仍未就绪
         """
-        wait = WebDriverWait(self.driver, timeout)
-        wait.until(lambda driver: driver.execute_script("return document.readyState") == "complete")
+        self._wait_for_ready(self.READY_CONDITION, timeout)
+    
+    def _wait_for_ready(self, condition, timeout):
+        """在浏览器内等待文档加载完成且就绪条件满足，并记录导航计时
+        
+        每次脚本调用的等待时长和可以重试的错误由 ``waits.ReadyPoll`` 决定：
+        脚本执行期间发生页面跳转或执行上下文丢失时在新文档上重新等待，脚本本身的错误直接抛出。
+        
+        Args:
+            condition: 就绪条件，为None时只等待文档加载完成
+            timeout: 等待超时时间
+            
+        Raises:
+            TimeoutException: 超时后页面仍未就绪
+            JavascriptException: 脚本执行出错（不是页面跳转引起的中断）
+        """
+        poll = waits.ReadyPoll(condition, timeout)
+        for arguments in poll:
+            try:
+                poll.state = self.driver.execute_async_script(scripts.WAIT_FOR_READY, *arguments)
+            except (JavascriptException, TimeoutException) as e:
+                poll.failed(e)
+        self._record_wait("wait_for_page_load", poll.locator, timeout, poll.elapsed, poll.ready)
+        
+        navigation = poll.navigation()
+        if navigation:
+            self.recorder.record_navigation(navigation)
+    
+    # 就绪条件转换成脚本参数的规则与异步页面对象共用
+    ready_condition_spec = staticmethod(waits.ready_condition_spec)
     
     def get_current_url(self):
         """获取当前页面URL
@@ -119,4 +534,4 @@ class BasePage:
         Returns:
             str: 页面标题
         """
-        return self.driver.title
\ No newline at end of file
+        return self.driver.title
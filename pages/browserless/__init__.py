@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""
+Browserless Pages Package
+
+这个包包含了页面对象只读部分的HTTP版本：直接请求服务端渲染的页面，
+用标准库解析HTML，并复用同步页面对象的定位器；以及与Selenium交叉验证的一致性校验页面。
+"""
+
+from .dom import HtmlNode, parse_html, select_all, select_one
+from .products_page import HttpProductsPage
+from .parity import ParityProductsPage
+
+__all__ = [
+    'HtmlNode',
+    'parse_html',
+    'select_all',
+    'select_one',
+    'HttpProductsPage',
+    'ParityProductsPage'
+]
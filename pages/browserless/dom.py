@@ -0,0 +1,299 @@
+"""HTML文档模型 - 用标准库 html.parser 解析服务端渲染的页面，并按页面对象的定位器查找元素"""
+
+import re
+from html.parser import HTMLParser
+from selenium.webdriver.common.by import By
+
+# 没有结束标签的元素
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr"
+}
+
+# 支持的CSS选择器片段：标签名（只能位于开头）、#id、.class 和属性条件
+_SIMPLE_SELECTOR = re.compile(
+    r"(?P<tag>^[a-zA-Z][a-zA-Z0-9-]*|^\*)"
+    r"|#(?P<id>[\w-]+)"
+    r"|\.(?P<class>[\w-]+)"
+    r"|\[\s*(?P<attribute>[\w-]+)\s*(?:(?P<operator>[\^$*~]?=)\s*(?P<quote>['\"]?)(?P<value>.*?)(?P=quote))?\s*\]"
+)
+
+
+class HtmlNode:
+    """HTML元素节点"""
+    
+    def __init__(self, tag, attributes=None, parent=None):
+        """初始化元素节点
+        
+        Args:
+            tag: 标签名
+            attributes: 属性字典
+            parent: 父节点
+        """
+        self.tag = tag
+        self.attributes = attributes or {}
+        self.parent = parent
+        self.children = []
+    
+    def get_attribute(self, name):
+        """获取属性值
+        
+        Args:
+            name: 属性名
+        
+        Returns:
+            str: 属性值，不存在时为None
+        """
+        return self.attributes.get(name)
+    
+    @property
+    def text(self):
+        """元素的文本内容，空白折叠方式与 WebElement.text 一致；带 hidden 属性的元素没有文本
+        
+        Returns:
+            str: 文本内容
+        """
+        parts = []
+        self._collect_text(parts)
+        return " ".join("".join(parts).split())
+    
+    def _collect_text(self, parts):
+        """递归收集文本片段
+        
+        Args:
+            parts: 文本片段列表
+        """
+        if "hidden" in self.attributes:
+            return
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child)
+            else:
+                child._collect_text(parts)
+    
+    def iter_elements(self):
+        """按文档顺序遍历所有后代元素
+        
+        Yields:
+            HtmlNode: 后代元素
+        """
+        for child in self.children:
+            if isinstance(child, HtmlNode):
+                yield child
+                yield from child.iter_elements()
+
+
+class _TreeBuilder(HTMLParser):
+    """把HTML解析为 HtmlNode 树"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = HtmlNode("#document")
+        self._current = self.root
+    
+    def handle_starttag(self, tag, attrs):
+        node = HtmlNode(tag, {name: "" if value is None else value for name, value in attrs}, self._current)
+        self._current.children.append(node)
+        if tag not in VOID_ELEMENTS:
+            self._current = node
+    
+    def handle_startendtag(self, tag, attrs):
+        node = HtmlNode(tag, {name: "" if value is None else value for name, value in attrs}, self._current)
+        self._current.children.append(node)
+    
+    def handle_endtag(self, tag):
+        # 容忍未闭合的元素：回到最近的同名祖先
+        node = self._current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self._current = node.parent
+    
+    def handle_data(self, data):
+        self._current.children.append(data)
+
+
+def parse_html(markup):
+    """解析HTML文档
+    
+    Args:
+        markup: HTML文本
+    
+    Returns:
+        HtmlNode: 文档根节点
+    """
+    builder = _TreeBuilder()
+    builder.feed(markup)
+    builder.close()
+    return builder.root
+
+
+def _parse_compound(compound, selector):
+    """解析一个复合选择器，例如 button[data-test^='add-to-cart']
+    
+    Args:
+        compound: 复合选择器文本
+        selector: 完整的选择器，用于错误信息
+    
+    Returns:
+        list: 条件列表，每个条件为 (类型, 名称, 运算符, 值)
+    """
+    conditions = []
+    position = 0
+    while position < len(compound):
+        match = _SIMPLE_SELECTOR.match(compound, position)
+        if not match or match.end() == position:
+            raise ValueError(f"不支持的CSS选择器: {selector}")
+        if match.group("tag"):
+            if match.group("tag") != "*":
+                conditions.append(("tag", match.group("tag").lower(), None, None))
+        elif match.group("id"):
+            conditions.append(("attribute", "id", "=", match.group("id")))
+        elif match.group("class"):
+            conditions.append(("attribute", "class", "~=", match.group("class")))
+        else:
+            conditions.append(("attribute", match.group("attribute"), match.group("operator"), match.group("value")))
+        position = match.end()
+    return conditions
+
+
+def _split_outside_brackets(text, separator):
+    """在方括号和引号之外按分隔符拆分
+    
+    Args:
+        text: 选择器文本
+        separator: 分隔符，"," 或 None（空白）
+    
+    Returns:
+        list: 拆分结果
+    """
+    parts, current, depth, quote = [], "", 0, None
+    for character in text:
+        if quote:
+            quote = None if character == quote else quote
+        elif character in "'\"":
+            quote = character
+        elif character == "[":
+            depth += 1
+        elif character == "]":
+            depth -= 1
+        elif depth == 0 and (character == separator or (separator is None and character.isspace())):
+            parts.append(current)
+            current = ""
+            continue
+        current += character
+    parts.append(current)
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _matches(node, conditions):
+    """元素是否满足复合选择器的全部条件
+    
+    Args:
+        node: 元素节点
+        conditions: _parse_compound 返回的条件列表
+    
+    Returns:
+        bool: 是否匹配
+    """
+    for kind, name, operator, value in conditions:
+        if kind == "tag":
+            if node.tag != name:
+                return False
+            continue
+        actual = node.attributes.get(name)
+        if actual is None:
+            return False
+        if operator is None:
+            continue
+        if operator == "=" and actual != value:
+            return False
+        if operator == "^=" and not (value and actual.startswith(value)):
+            return False
+        if operator == "$=" and not (value and actual.endswith(value)):
+            return False
+        if operator == "*=" and not (value and value in actual):
+            return False
+        if operator == "~=" and value not in actual.split():
+            return False
+    return True
+
+
+def _compile(locator):
+    """把页面对象的定位器编译为选择器链列表
+    
+    Args:
+        locator: 元素定位器 (By, value)
+    
+    Returns:
+        list: 每个逗号分隔的选择器对应一条复合选择器链（后代组合）
+    """
+    by, value = locator
+    if by == By.ID:
+        return [[[("attribute", "id", "=", value)]]]
+    if by == By.NAME:
+        return [[[("attribute", "name", "=", value)]]]
+    if by == By.CLASS_NAME:
+        return [[[("attribute", "class", "~=", value)]]]
+    if by == By.TAG_NAME:
+        return [[[("tag", value.lower(), None, None)]]]
+    if by == By.CSS_SELECTOR:
+        # 只支持后代组合，不支持子代、兄弟组合和伪类
+        if re.search(r"[>+~:]", re.sub(r"\[[^\]]*\]", "", value)):
+            raise ValueError(f"不支持的CSS选择器: {value}")
+        return [
+            [_parse_compound(compound, value) for compound in _split_outside_brackets(group, None)]
+            for group in _split_outside_brackets(value, ",")
+        ]
+    raise ValueError(f"不支持的定位方式: {by}")
+
+
+def _matches_chain(node, chain):
+    """元素是否匹配一条后代选择器链
+    
+    Args:
+        node: 元素节点
+        chain: 复合选择器条件列表，最后一个对应元素本身
+    
+    Returns:
+        bool: 是否匹配
+    """
+    if not _matches(node, chain[-1]):
+        return False
+    ancestor = node.parent
+    for conditions in reversed(chain[:-1]):
+        while ancestor is not None and not (ancestor.tag != "#document" and _matches(ancestor, conditions)):
+            ancestor = ancestor.parent
+        if ancestor is None:
+            return False
+        ancestor = ancestor.parent
+    return True
+
+
+def select_all(root, locator):
+    """查找所有匹配定位器的元素
+    
+    Args:
+        root: 查找范围的根节点
+        locator: 元素定位器 (By, value)，支持 id、name、class name、tag name，
+            以及由标签名、#id、.class、属性条件和后代组合构成的CSS选择器
+    
+    Returns:
+        list: 按文档顺序排列的元素
+    """
+    chains = _compile(locator)
+    return [node for node in root.iter_elements() if any(_matches_chain(node, chain) for chain in chains)]
+
+
+def select_one(root, locator):
+    """查找第一个匹配定位器的元素
+    
+    Args:
+        root: 查找范围的根节点
+        locator: 元素定位器 (By, value)
+    
+    Returns:
+        HtmlNode: 找到的元素，不存在时为None
+    """
+    matches = select_all(root, locator)
+    return matches[0] if matches else None
@@ -0,0 +1,73 @@
+"""一致性校验 - 同时在HTTP后端和Selenium页面对象上执行读取，结果不一致时报错"""
+
+
+class ParityProductsPage:
+    """交叉验证HTTP后端的产品页面
+    
+    每个读取方法都分别在 ``HttpProductsPage`` 和 ``ProductsPage`` 上执行，
+    两者结果相同时返回该结果，不同时抛出 AssertionError；排序同时作用于两个后端。
+    """
+    
+    # 需要交叉验证的读取方法
+    READ_METHODS = (
+        "is_products_page",
+        "get_page_title_text",
+        "get_product_names",
+        "get_product_prices",
+        "get_product_grid",
+        "get_products_count"
+    )
+    
+    def __init__(self, http_page, selenium_page):
+        """初始化一致性校验页面
+        
+        Args:
+            http_page: HttpProductsPage 实例
+            selenium_page: 已登录的 ProductsPage 实例
+        """
+        self.http_page = http_page
+        self.selenium_page = selenium_page
+        self.checks = 0
+    
+    def __getattr__(self, name):
+        """把读取方法转发到两个后端并比较结果
+        
+        Args:
+            name: 方法名
+        
+        Returns:
+            callable: 无参数的读取方法
+        """
+        if name not in self.READ_METHODS:
+            raise AttributeError(name)
+        return lambda: self._compare(name)
+    
+    def _compare(self, name):
+        """在两个后端上执行同一个读取方法并比较结果
+        
+        Args:
+            name: 方法名
+        
+        Returns:
+            两个后端一致的结果
+        
+        Raises:
+            AssertionError: 两个后端的结果不一致
+        """
+        expected = getattr(self.selenium_page, name)()
+        actual = getattr(self.http_page, name)()
+        self.checks += 1
+        if actual != expected:
+            raise AssertionError(
+                f"HTTP后端与Selenium结果不一致: {name}()\n  Selenium: {expected!r}\n  HTTP:     {actual!r}"
+            )
+        return expected
+    
+    def select_sort_option(self, option_value):
+        """在两个后端上选择排序选项
+        
+        Args:
+            option_value: 排序选项值 (za, az, lohi, hilo)
+        """
+        self.selenium_page.select_sort_option(option_value)
+        self.http_page.select_sort_option(option_value)
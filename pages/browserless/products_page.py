@@ -0,0 +1,142 @@
+"""HTTP产品页面 - 不启动浏览器，直接请求服务端渲染的商品列表并解析HTML"""
+
+import urllib.request
+from urllib.parse import urlencode
+from config import Config
+from ..products_page import ProductsPage
+from .dom import parse_html, select_all, select_one
+
+
+class HttpProductsPage:
+    """产品页面的只读HTTP版本，方法与 ``ProductsPage`` 的读取方法同名、返回值相同
+    
+    定位器直接引用 ``ProductsPage`` 的类属性，选择器只维护一份。
+    只适用于在服务端渲染商品列表的站点（本地替身站点，``TARGET_SITE=local``）；
+    线上 Sauce Demo 由前端渲染，对它调用 ``open`` 会因为找不到商品而报错。
+    排序通过 ``?sort=`` 查询参数交给服务端完成。
+    """
+    
+    PAGE_TITLE = ProductsPage.PAGE_TITLE
+    PRODUCT_ITEMS = ProductsPage.PRODUCT_ITEMS
+    PRODUCT_NAMES = ProductsPage.PRODUCT_NAMES
+    PRODUCT_PRICES = ProductsPage.PRODUCT_PRICES
+    PRODUCT_BUTTON = ProductsPage.PRODUCT_BUTTON
+    
+    def __init__(self, base_url=None, username=None, timeout=10):
+        """初始化HTTP产品页面
+        
+        Args:
+            base_url: 站点地址，默认为 Config.BASE_URL
+            username: 写入会话cookie的用户名，默认为 Config.VALID_USERNAME
+            timeout: 请求超时时间（秒）
+        """
+        self.base_url = (base_url or Config.BASE_URL).rstrip("/")
+        self.username = username or Config.VALID_USERNAME
+        self.timeout = timeout
+        self.sort_option = None
+        self.request_count = 0
+        self.document = None
+    
+    def open(self, sort_option=None):
+        """请求商品列表页面
+        
+        Args:
+            sort_option: 排序选项 (az, za, lohi, hilo)，默认为站点的默认排序
+        
+        Returns:
+            HttpProductsPage: 页面本身，便于链式调用
+        
+        Raises:
+            ValueError: 页面中没有服务端渲染的商品列表
+        """
+        url = self.base_url + Config.INVENTORY_PATH
+        if sort_option:
+            url += "?" + urlencode({"sort": sort_option})
+        request = urllib.request.Request(url, headers={"Cookie": f"session-username={self.username}"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            markup = response.read().decode(response.headers.get_content_charset() or "utf-8")
+        self.request_count += 1
+        
+        document = parse_html(markup)
+        if not select_all(document, self.PRODUCT_ITEMS):
+            raise ValueError(f"页面中没有服务端渲染的商品列表，不能使用HTTP后端: {url}")
+        self.document = document
+        self.sort_option = sort_option
+        return self
+    
+    def _document(self):
+        """获取当前页面文档，尚未请求时先请求页面
+        
+        Returns:
+            HtmlNode: 文档根节点
+        """
+        if self.document is None:
+            self.open()
+        return self.document
+    
+    def is_products_page(self):
+        """检查是否在产品页面
+        
+        Returns:
+            bool: 是否在产品页面
+        """
+        return "Products" in self.get_page_title_text()
+    
+    def get_page_title_text(self):
+        """获取页面标题文本
+        
+        Returns:
+            str: 页面标题文本
+        """
+        title = select_one(self._document(), self.PAGE_TITLE)
+        return title.text if title is not None else ""
+    
+    def get_product_names(self):
+        """获取所有产品名称
+        
+        Returns:
+            list: 产品名称列表
+        """
+        return [node.text for node in select_all(self._document(), self.PRODUCT_NAMES)]
+    
+    def get_product_prices(self):
+        """获取所有产品价格
+        
+        Returns:
+            list: 产品价格列表
+        """
+        return [node.text for node in select_all(self._document(), self.PRODUCT_PRICES)]
+    
+    def get_product_grid(self):
+        """一次读取整个产品列表
+        
+        Returns:
+            list: 产品记录列表，每条记录包含 name、price、button_id
+        """
+        records = []
+        for item in select_all(self._document(), self.PRODUCT_ITEMS):
+            name = select_one(item, self.PRODUCT_NAMES)
+            price = select_one(item, self.PRODUCT_PRICES)
+            button = select_one(item, self.PRODUCT_BUTTON)
+            records.append({
+                "name": name.text if name is not None else None,
+                "price": price.text if price is not None else None,
+                "button_id": button.get_attribute("id") if button is not None else None
+            })
+        return records
+    
+    def get_products_count(self):
+        """获取产品总数
+        
+        Returns:
+            int: 产品总数
+        """
+        return len(select_all(self._document(), self.PRODUCT_ITEMS))
+    
+    def select_sort_option(self, option_value):
+        """选择排序选项，重新请求按该选项排序的商品列表
+        
+        Args:
+            option_value: 排序选项值 (za, az, lohi, hilo)
+        """
+        self.open(option_value)
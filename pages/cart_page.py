@@ -1,9 +1,12 @@
 """购物车页面对象类"""
 
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from config import Config
 from .base_page import BasePage
+from .locator_registry import LocatorRegistry
 
 
 class CartPage(BasePage):
@@ -21,16 +24,35 @@ class CartPage(BasePage):
     CART_ITEM_QUANTITIES = (By.CSS_SELECTOR, "[data-test='item-quantity']")
     REMOVE_BUTTONS = (By.CSS_SELECTOR, "[data-test^='remove']")
     
+    # 购物车列表每个条目读取的字段
+    ITEM_FIELDS = {
+        "name": (CART_ITEM_NAMES, "text"),
+        "price": (CART_ITEM_PRICES, "text"),
+        "button_id": (REMOVE_BUTTONS, "id")
+    }
+    
     # 空购物车元素
     EMPTY_CART_MESSAGE = (By.CSS_SELECTOR, ".cart_list")
     
-    def __init__(self, driver):
+    # 购物车列表出现且DOM静默后页面就绪（购物车可能为空，不能要求存在商品）
+    CART_LIST = (By.CSS_SELECTOR, ".cart_list")
+    READY_CONDITION = {"locator": CART_LIST, "settle_ms": Config.DOM_SETTLE_QUIET_MS}
+    
+    # 点击结账按钮后，结账信息表单出现时结账页面就绪
+    CHECKOUT_READY_CONDITION = {"locator": (By.CSS_SELECTOR, "[data-test='firstName']")}
+    
+    # 一次页面访问内不会被替换的静态元素
+    CACHEABLE = (PAGE_TITLE, CONTINUE_SHOPPING_BUTTON, CHECKOUT_BUTTON)
+    
+    def __init__(self, driver, recorder=None):
         """初始化购物车页面
         
         Args:
             driver: WebDriver实例
+            recorder: 记录操作指标的收集器，默认为进程共享的收集器
         """
-        super().__init__(driver)
+        super().__init__(driver, recorder)
+        self.locators = LocatorRegistry(self, self.CART_ITEMS, self.ITEM_FIELDS)
     
     def is_cart_page(self):
         """检查是否在购物车页面
@@ -59,6 +81,18 @@ class CartPage(BasePage):
         """点击结账按钮"""
         self.click_element(self.CHECKOUT_BUTTON)
     
+    def proceed_to_checkout(self, timeout=30):
+        """点击结账按钮并等待结账信息页面就绪
+        
+        Args:
+            timeout: 等待超时时间
+        
+        Raises:
+            TimeoutException: 超时后结账页面仍未就绪
+        """
+        self.click_checkout()
+        self._wait_for_ready(self.CHECKOUT_READY_CONDITION, timeout)
+    
     def get_cart_items_count(self):
         """获取购物车中商品数量
         
@@ -74,8 +108,7 @@ class CartPage(BasePage):
         Returns:
             list: 商品名称列表
         """
-        elements = self.find_elements(self.CART_ITEM_NAMES)
-        return [element.text for element in elements]
+        return self.read_texts(self.CART_ITEM_NAMES)
     
     def get_cart_item_prices(self):
         """获取购物车中所有商品价格
@@ -83,8 +116,7 @@ class CartPage(BasePage):
         Returns:
             list: 商品价格列表
         """
-        elements = self.find_elements(self.CART_ITEM_PRICES)
-        return [element.text for element in elements]
+        return self.read_texts(self.CART_ITEM_PRICES)
     
     def get_cart_item_quantities(self):
         """获取购物车中所有商品数量
@@ -92,19 +124,18 @@ class CartPage(BasePage):
         Returns:
             list: 商品数量列表
         """
-        elements = self.find_elements(self.CART_ITEM_QUANTITIES)
-        return [int(element.text) for element in elements if element.text.isdigit()]
+        texts = self.read_texts(self.CART_ITEM_QUANTITIES)
+        return [int(text) for text in texts if text.isdigit()]
     
     def remove_item_by_name(self, product_name):
         """根据商品名称移除商品
         
         Args:
-            product_name: 商品名称
+            product_name: 商品名称或标识
         """
-        # 构建动态定位器
-        product_id = product_name.lower().replace(" ", "-")
-        remove_button_locator = (By.ID, f"remove-{product_id}")
-        self.click_element(remove_button_locator)
+        self.click_element((By.ID, self.locators.lookup(product_name)["remove_id"]))
+        # 移除后购物车列表中的位置变化
+        self.locators.invalidate()
     
     def is_item_in_cart(self, product_name):
         """检查商品是否在购物车中
@@ -127,10 +158,18 @@ class CartPage(BasePage):
         return self.get_cart_items_count() == 0
     
     def clear_cart(self):
-        """清空购物车"""
-        remove_buttons = self.find_elements(self.REMOVE_BUTTONS)
-        for button in remove_buttons:
-            button.click()
+        """清空购物车：在一次脚本调用中点击所有移除按钮，然后等待购物车列表为空
+        
+        Returns:
+            int: 移除的商品数量
+        """
+        try:
+            return self.click_all([self.REMOVE_BUTTONS], [(self.CART_ITEMS, 0)])
+        except NoSuchElementException:
+            # 没有移除按钮说明购物车已经为空
+            return 0
+        finally:
+            self.locators.invalidate()
     
     def get_total_price(self):
         """计算购物车总价格
@@ -153,8 +192,7 @@ class CartPage(BasePage):
             bool: 结账按钮是否可用
         """
         if self.is_element_visible(self.CHECKOUT_BUTTON):
-            button = self.find_element(self.CHECKOUT_BUTTON)
-            return button.is_enabled()
+            return self.with_element(self.CHECKOUT_BUTTON, lambda button: button.is_enabled())
         return False
     
     def is_continue_shopping_button_visible(self):
@@ -0,0 +1,169 @@
+"""商品定位器索引 - 一次读取商品列表，按商品名称或标识直接查到按钮id、价格和位置
+
+按钮id取自页面上实际渲染的按钮，不再由商品名称推算；名称中含有标点的商品也能正确定位，
+不存在的商品立即报错，不需要等待显式等待超时。
+"""
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from config import Config
+from core.metrics import get_command_counter
+
+ADD_PREFIX = "add-to-cart-"
+REMOVE_PREFIX = "remove-"
+
+
+def item_slug(button_id):
+    """从加购或移除按钮的id中取出商品标识
+    
+    Args:
+        button_id: 按钮id，例如 add-to-cart-sauce-labs-backpack
+    
+    Returns:
+        str: 商品标识，按钮id格式不符时为None
+    """
+    for prefix in (ADD_PREFIX, REMOVE_PREFIX):
+        if button_id and button_id.startswith(prefix):
+            return button_id[len(prefix):]
+    return None
+
+
+class ItemIndex:
+    """商品名称和标识到定位信息的索引"""
+    
+    def __init__(self, records):
+        """根据商品列表记录建立索引
+        
+        Args:
+            records: 商品记录列表，每条记录包含 name、price、button_id
+        """
+        self.entries = []
+        self._by_key = {}
+        for position, record in enumerate(records):
+            slug = item_slug(record.get("button_id"))
+            if slug is None:
+                continue
+            entry = {
+                "name": record["name"],
+                "slug": slug,
+                "add_id": ADD_PREFIX + slug,
+                "remove_id": REMOVE_PREFIX + slug,
+                "price": record.get("price"),
+                "position": position
+            }
+            self.entries.append(entry)
+            self._by_key[entry["name"]] = entry
+            self._by_key[slug] = entry
+    
+    def __contains__(self, key):
+        """索引中是否有该商品名称或标识"""
+        return key in self._by_key
+    
+    def __len__(self):
+        """索引中的商品数量"""
+        return len(self.entries)
+    
+    def lookup(self, key):
+        """按商品名称或标识查找
+        
+        Args:
+            key: 商品名称（Sauce Labs Backpack）或标识（sauce-labs-backpack）
+        
+        Returns:
+            dict: name、slug、add_id、remove_id、price、position
+        
+        Raises:
+            NoSuchElementException: 当前页面没有该商品
+        """
+        entry = self._by_key.get(key)
+        if entry is None:
+            names = [entry["name"] for entry in self.entries]
+            raise NoSuchElementException(f"当前页面没有商品 '{key}'，现有商品: {names}")
+        return entry
+
+
+class LocatorRegistry:
+    """按页面加载缓存的商品定位器索引
+    
+    第一次查找时读取一次商品列表建立索引，同一次页面访问内的后续查找不再访问浏览器。
+    ``driver.get``、后退、刷新等导航命令会使索引失效；点击造成的跳转无法感知，
+    所以缓存的索引中找不到商品时重新读取一次再判断。
+    """
+    
+    def __init__(self, page, item_locator, fields):
+        """初始化索引
+        
+        Args:
+            page: 页面对象
+            item_locator: 商品条目定位器
+            fields: 传给 ``read_records`` 的字段，需要包含 name、price、button_id
+        """
+        self.page = page
+        self.item_locator = item_locator
+        self.fields = fields
+        self.builds = 0
+        self._index = None
+        self._epoch = None
+    
+    def _is_current(self):
+        """缓存的索引是否属于当前页面
+        
+        Returns:
+            bool: 索引已建立且之后没有发生导航
+        """
+        return self._index is not None and self._epoch == get_command_counter(self.page.driver).navigation_count
+    
+    def _store(self, records):
+        """根据读取的商品列表保存索引
+        
+        Args:
+            records: 商品记录列表，页面未就绪时为空列表
+        """
+        self._index = ItemIndex(records)
+        self._epoch = get_command_counter(self.page.driver).navigation_count
+        self.builds += 1
+    
+    def index(self):
+        """返回当前页面的索引，页面发生导航后重新建立
+        
+        Returns:
+            ItemIndex: 商品索引
+        """
+        if not self._is_current():
+            self._build()
+        return self._index
+    
+    def _build(self):
+        """短暂确认页面就绪后读取商品列表建立索引
+        
+        就绪条件在 ``Config.READY_PROBE_TIMEOUT`` 内不满足时（例如不在该页面上）建立空索引，
+        查找立即报告商品不存在。
+        """
+        try:
+            self.page._wait_for_ready(self.page.READY_CONDITION, Config.READY_PROBE_TIMEOUT)
+        except TimeoutException:
+            self._store([])
+            return
+        self._store(self.page.read_records(self.item_locator, self.fields))
+    
+    def lookup(self, key):
+        """按商品名称或标识查找定位信息
+        
+        Args:
+            key: 商品名称或标识
+        
+        Returns:
+            dict: name、slug、add_id、remove_id、price、position
+        
+        Raises:
+            NoSuchElementException: 重新读取商品列表后仍然没有该商品
+        """
+        builds = self.builds
+        index = self.index()
+        if key not in index and self.builds == builds:
+            self._build()
+            index = self._index
+        return index.lookup(key)
+    
+    def invalidate(self):
+        """商品列表被排序或修改后使索引失效"""
+        self._index = None
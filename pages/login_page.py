@@ -16,13 +16,20 @@ class LoginPage(BasePage):
     ERROR_MESSAGE = (By.CSS_SELECTOR, "[data-test='error']")
     ERROR_BUTTON = (By.CSS_SELECTOR, "[data-test='error-button']")
     
-    def __init__(self, driver):
+    # 登录按钮渲染后页面就绪
+    READY_CONDITION = {"locator": LOGIN_BUTTON}
+    
+    # 一次页面访问内不会被替换的静态元素
+    CACHEABLE = (USERNAME_INPUT, PASSWORD_INPUT, LOGIN_BUTTON)
+    
+    def __init__(self, driver, recorder=None):
         """初始化登录页面
         
         Args:
             driver: WebDriver实例
+            recorder: 记录操作指标的收集器，默认为进程共享的收集器
         """
-        super().__init__(driver)
+        super().__init__(driver, recorder)
     
     def open(self, url):
         """打开登录页面
@@ -70,7 +77,7 @@ class LoginPage(BasePage):
         Returns:
             str: 错误信息文本
         """
-        if self.is_element_visible(self.ERROR_MESSAGE):
+        if self.is_element_displayed(self.ERROR_MESSAGE):
             return self.get_text(self.ERROR_MESSAGE)
         return None
     
@@ -80,12 +87,13 @@ class LoginPage(BasePage):
         Returns:
             bool: 是否显示错误信息
         """
-        return self.is_element_visible(self.ERROR_MESSAGE)
+        return self.is_element_displayed(self.ERROR_MESSAGE)
     
     def close_error_message(self):
         """关闭错误信息"""
-        if self.is_element_visible(self.ERROR_BUTTON):
+        if self.is_element_displayed(self.ERROR_BUTTON):
             self.click_element(self.ERROR_BUTTON)
+            self.wait_until_absent(self.ERROR_MESSAGE)
     
     def is_login_page(self):
         """检查是否在登录页面
@@ -99,13 +107,11 @@ class LoginPage(BasePage):
     
     def clear_username(self):
         """清空用户名输入框"""
-        element = self.find_element(self.USERNAME_INPUT)
-        element.clear()
+        self.with_element(self.USERNAME_INPUT, lambda element: element.clear())
     
     def clear_password(self):
         """清空密码输入框"""
-        element = self.find_element(self.PASSWORD_INPUT)
-        element.clear()
+        self.with_element(self.PASSWORD_INPUT, lambda element: element.clear())
     
     def get_username_value(self):
         """获取用户名输入框的值
@@ -113,8 +119,7 @@ class LoginPage(BasePage):
         Returns:
             str: 用户名输入框的值
         """
-        element = self.find_element(self.USERNAME_INPUT)
-        return element.get_attribute("value")
+        return self.with_element(self.USERNAME_INPUT, lambda element: element.get_attribute("value"))
     
     def get_password_value(self):
         """获取密码输入框的值
@@ -122,5 +127,4 @@ class LoginPage(BasePage):
         Returns:
             str: 密码输入框的值
         """
-        element = self.find_element(self.PASSWORD_INPUT)
-        return element.get_attribute("value")
\ No newline at end of file
+        return self.with_element(self.PASSWORD_INPUT, lambda element: element.get_attribute("value"))
\ No newline at end of file
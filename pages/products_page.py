@@ -1,7 +1,9 @@
 """产品页面对象类"""
 
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
 from .base_page import BasePage
+from .locator_registry import LocatorRegistry
 
 
 class ProductsPage(BasePage):
@@ -21,19 +23,35 @@ class ProductsPage(BasePage):
     PRODUCT_PRICES = (By.CSS_SELECTOR, "[data-test='inventory-item-price']")
     ADD_TO_CART_BUTTONS = (By.CSS_SELECTOR, "[data-test^='add-to-cart']")
     REMOVE_BUTTONS = (By.CSS_SELECTOR, "[data-test^='remove']")
+    PRODUCT_BUTTON = (By.CSS_SELECTOR, "button[data-test^='add-to-cart'], button[data-test^='remove']")
     
     # 具体产品的添加到购物车按钮
     ADD_BACKPACK_BUTTON = (By.ID, "add-to-cart-sauce-labs-backpack")
     ADD_BIKE_LIGHT_BUTTON = (By.ID, "add-to-cart-sauce-labs-bike-light")
     ADD_BOLT_TSHIRT_BUTTON = (By.ID, "add-to-cart-sauce-labs-bolt-t-shirt")
     
-    def __init__(self, driver):
+    # 商品列表每个条目读取的字段
+    GRID_FIELDS = {
+        "name": (PRODUCT_NAMES, "text"),
+        "price": (PRODUCT_PRICES, "text"),
+        "button_id": (PRODUCT_BUTTON, "id")
+    }
+    
+    # 商品列表渲染出来后页面就绪
+    READY_CONDITION = {"locator": PRODUCT_ITEMS, "min_count": 1}
+    
+    # 一次页面访问内不会被替换的静态元素
+    CACHEABLE = (PAGE_TITLE, MENU_BUTTON, CART_ICON, SORT_DROPDOWN)
+    
+    def __init__(self, driver, recorder=None):
         """初始化产品页面
         
         Args:
             driver: WebDriver实例
+            recorder: 记录操作指标的收集器，默认为进程共享的收集器
         """
-        super().__init__(driver)
+        super().__init__(driver, recorder)
+        self.locators = LocatorRegistry(self, self.PRODUCT_ITEMS, self.GRID_FIELDS)
     
     def is_products_page(self):
         """检查是否在产品页面
@@ -62,7 +80,7 @@ class ProductsPage(BasePage):
         """执行登出操作"""
         self.click_menu_button()
         # 等待菜单展开
-        self.wait.until(lambda driver: self.is_element_visible(self.LOGOUT_LINK))
+        self.wait_until_present(self.LOGOUT_LINK)
         self.click_element(self.LOGOUT_LINK)
     
     def click_cart_icon(self):
@@ -75,7 +93,8 @@ class ProductsPage(BasePage):
         Returns:
             int: 购物车中商品数量
         """
-        if self.is_element_visible(self.CART_BADGE):
+        # 购物车为空时没有徽章，不能等待它出现
+        if self.is_element_displayed(self.CART_BADGE):
             count_text = self.get_text(self.CART_BADGE)
             return int(count_text) if count_text.isdigit() else 0
         return 0
@@ -86,8 +105,7 @@ class ProductsPage(BasePage):
         Returns:
             list: 产品名称列表
         """
-        elements = self.find_elements(self.PRODUCT_NAMES)
-        return [element.text for element in elements]
+        return self.read_texts(self.PRODUCT_NAMES)
     
     def get_product_prices(self):
         """获取所有产品价格
@@ -95,8 +113,15 @@ class ProductsPage(BasePage):
         Returns:
             list: 产品价格列表
         """
-        elements = self.find_elements(self.PRODUCT_PRICES)
-        return [element.text for element in elements]
+        return self.read_texts(self.PRODUCT_PRICES)
+    
+    def get_product_grid(self):
+        """一次读取整个产品列表
+        
+        Returns:
+            list: 产品记录列表，每条记录包含 name、price、button_id
+        """
+        return self.read_records(self.PRODUCT_ITEMS, self.GRID_FIELDS)
     
     def get_products_count(self):
         """获取产品总数
@@ -111,12 +136,9 @@ class ProductsPage(BasePage):
         """根据产品名称添加产品到购物车
         
         Args:
-            product_name: 产品名称
+            product_name: 产品名称或标识
         """
-        # 构建动态定位器
-        product_id = product_name.lower().replace(" ", "-")
-        add_button_locator = (By.ID, f"add-to-cart-{product_id}")
-        self.click_element(add_button_locator)
+        self.click_element((By.ID, self.locators.lookup(product_name)["add_id"]))
     
     def add_backpack_to_cart(self):
         """添加背包到购物车"""
@@ -130,29 +152,58 @@ class ProductsPage(BasePage):
         """添加T恤到购物车"""
         self.click_element(self.ADD_BOLT_TSHIRT_BUTTON)
     
+    def add_products_to_cart(self, product_names):
+        """在一次脚本调用中把多个产品添加到购物车，然后等待所有产品都变为已添加
+        
+        Args:
+            product_names: 产品名称或标识列表
+        
+        Returns:
+            int: 点击的按钮数量
+        """
+        entries = [self.locators.lookup(product_name) for product_name in product_names]
+        return self.click_all(
+            [(By.ID, entry["add_id"]) for entry in entries],
+            [((By.ID, entry["remove_id"]), 1) for entry in entries]
+        )
+    
     def remove_product_from_cart_by_name(self, product_name):
         """根据产品名称从购物车移除产品
         
         Args:
-            product_name: 产品名称
+            product_name: 产品名称或标识
+        """
+        self.click_element((By.ID, self.locators.lookup(product_name)["remove_id"]))
+    
+    def remove_products_from_cart(self, product_names):
+        """在一次脚本调用中从购物车移除多个产品，然后等待所有产品都变为未添加
+        
+        Args:
+            product_names: 产品名称或标识列表
+        
+        Returns:
+            int: 点击的按钮数量
         """
-        # 构建动态定位器
-        product_id = product_name.lower().replace(" ", "-")
-        remove_button_locator = (By.ID, f"remove-{product_id}")
-        self.click_element(remove_button_locator)
+        entries = [self.locators.lookup(product_name) for product_name in product_names]
+        return self.click_all(
+            [(By.ID, entry["remove_id"]) for entry in entries],
+            [((By.ID, entry["add_id"]), 1) for entry in entries]
+        )
     
     def is_product_added_to_cart(self, product_name):
         """检查产品是否已添加到购物车
         
         Args:
-            product_name: 产品名称
+            product_name: 产品名称或标识
             
         Returns:
-            bool: 产品是否已添加到购物车
+            bool: 产品是否已添加到购物车，页面上没有该产品时为False
         """
-        product_id = product_name.lower().replace(" ", "-")
-        remove_button_locator = (By.ID, f"remove-{product_id}")
-        return self.is_element_visible(remove_button_locator, timeout=2)
+        try:
+            entry = self.locators.lookup(product_name)
+        except NoSuchElementException:
+            return False
+        return self.is_element_displayed((By.ID, entry["remove_id"]))
     
     def select_sort_option(self, option_value):
         """选择排序选项
@@ -161,6 +212,6 @@ class ProductsPage(BasePage):
             option_value: 排序选项值 (za, az, lohi, hilo)
         """
         from selenium.webdriver.support.ui import Select
-        dropdown_element = self.find_element(self.SORT_DROPDOWN)
-        select = Select(dropdown_element)
-        select.select_by_value(option_value)
\ No newline at end of file
+        self.with_element(self.SORT_DROPDOWN, lambda dropdown: Select(dropdown).select_by_value(option_value))
+        # 排序后商品位置变化
+        self.locators.invalidate()
\ No newline at end of file
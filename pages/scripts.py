@@ -0,0 +1,318 @@
+"""页面脚本 - 页面对象通过 execute_script / execute_async_script 注入的JavaScript片段"""
+
+# 等待DOM稳定：文档加载完成后，在 quietMs 毫秒内没有任何DOM变化即视为稳定。
+# 参数: quietMs, timeoutMs；稳定时返回true，timeoutMs 内没有稳定（DOM持续变化或文档未加载完成）时返回false。
+# 最后一个参数是WebDriver提供的异步回调
+DOM_SETTLED = """
+var quietMs = arguments[0];
+var timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+var timer = null;
+var observer = new MutationObserver(function () {
+    clearTimeout(timer);
+    timer = setTimeout(function () { finish(true); }, quietMs);
+});
+var deadline = setTimeout(function () { finish(false); }, timeoutMs);
+function finish(settled) {
+    clearTimeout(timer);
+    clearTimeout(deadline);
+    observer.disconnect();
+    window.removeEventListener('load', start);
+    done(settled);
+}
+function start() {
+    observer.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    timer = setTimeout(function () { finish(true); }, quietMs);
+}
+if (document.readyState === 'complete') {
+    start();
+} else {
+    window.addEventListener('load', start);
+}
+"""
+
+# 按WebDriver定位策略查找元素的函数，供其他脚本拼接使用
+FIND_ALL = """
+function findAll(root, by, value) {
+    switch (by) {
+        case 'css selector':
+            return Array.prototype.slice.call(root.querySelectorAll(value));
+        case 'id':
+            return Array.prototype.slice.call(root.querySelectorAll('#' + CSS.escape(value)));
+        case 'class name':
+            return Array.prototype.slice.call(root.querySelectorAll('.' + CSS.escape(value)));
+        case 'name':
+            return Array.prototype.slice.call(root.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+        case 'tag name':
+            return Array.prototype.slice.call(root.getElementsByTagName(value));
+        case 'link text':
+        case 'partial link text':
+            return Array.prototype.slice.call(root.querySelectorAll('a')).filter(function (a) {
+                var text = a.innerText.trim();
+                return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+            });
+        case 'xpath':
+            var snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) {
+                nodes.push(snapshot.snapshotItem(i));
+            }
+            return nodes;
+    }
+    throw new Error('unsupported locator strategy: ' + by);
+}
+"""
+
+# 批量读取元素：等待DOM稳定后，一次性读取定位器匹配的所有元素的文本或属性。
+# DOM在 spec.timeout_ms 内一直没有稳定（计时器、轮播、轮询）时读取当前的元素并返回，settled 为false。
+# 参数: quietMs, spec；最后一个参数是WebDriver提供的异步回调
+# spec: {by, value, timeout_ms, fields: [{name, by, value, attribute}]}
+#   字段的 by/value 为空时读取元素本身；attribute 为 "text" 时读取可见文本
+# 返回: {records, settled} 或 {error}
+READ_ELEMENTS = """
+var quietMs = arguments[0];
+var spec = arguments[1];
+var done = arguments[arguments.length - 1];
+""" + FIND_ALL + """
+function readValue(element, attribute) {
+    if (!element) {
+        return null;
+    }
+    if (attribute === 'text') {
+        return element.innerText.trim();
+    }
+    var value = element.getAttribute(attribute);
+    return value === null && attribute in element ? element[attribute] : value;
+}
+
+function read() {
+    return findAll(document, spec.by, spec.value).map(function (element) {
+        var record = {};
+        spec.fields.forEach(function (field) {
+            var target = field.by ? findAll(element, field.by, field.value)[0] : element;
+            record[field.name] = readValue(target, field.attribute);
+        });
+        return record;
+    });
+}
+
+var timer = null;
+var observer = new MutationObserver(function () {
+    clearTimeout(timer);
+    timer = setTimeout(function () { finish(true); }, quietMs);
+});
+var deadline = setTimeout(function () { finish(false); }, spec.timeout_ms);
+function finish(settled) {
+    clearTimeout(timer);
+    clearTimeout(deadline);
+    observer.disconnect();
+    window.removeEventListener('load', start);
+    try {
+        done({records: read(), settled: settled});
+    } catch (error) {
+        done({error: String(error)});
+    }
+}
+function start() {
+    observer.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    timer = setTimeout(function () { finish(true); }, quietMs);
+}
+if (document.readyState === 'complete') {
+    start();
+} else {
+    window.addEventListener('load', start);
+}
+"""
+
+# 等待元素状态：通过MutationObserver在DOM变化时检查元素状态，满足或超时时返回，不需要轮询。
+# 参数: by, value, state, timeoutMs；最后一个参数是WebDriver提供的异步回调
+# state: present（存在）、visible（可见）、clickable（可见且可用）、absent（不存在或不可见）
+# 返回: {matched, element}，element 为满足状态的第一个元素（absent 时为空）
+WAIT_FOR_ELEMENT = """
+var by = arguments[0];
+var value = arguments[1];
+var state = arguments[2];
+var timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+""" + FIND_ALL + """
+function isVisible(element) {
+    var style = window.getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.display !== 'none' &&
+        (element.offsetWidth > 0 || element.offsetHeight > 0 || element.getClientRects().length > 0);
+}
+
+function check() {
+    var elements = findAll(document, by, value);
+    if (state === 'absent') {
+        return elements.some(isVisible) ? null : {matched: true, element: null};
+    }
+    for (var i = 0; i < elements.length; i++) {
+        var element = elements[i];
+        if (state === 'present' ||
+            (state === 'visible' && isVisible(element)) ||
+            (state === 'clickable' && isVisible(element) && !element.disabled)) {
+            return {matched: true, element: element};
+        }
+    }
+    return null;
+}
+
+var timer = null;
+var observer = new MutationObserver(function () {
+    var result = check();
+    if (result) {
+        finish(result);
+    }
+});
+function finish(result) {
+    observer.disconnect();
+    clearTimeout(timer);
+    done(result);
+}
+var initial = check();
+if (initial) {
+    done(initial);
+} else {
+    observer.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    timer = setTimeout(function () {
+        finish({matched: false, element: null});
+    }, timeoutMs);
+}
+"""
+
+# 等待页面就绪：文档加载完成后，通过MutationObserver等待页面对象声明的就绪条件满足，
+# 满足或超时时返回，并附带 Navigation Timing 数据（毫秒，相对于导航开始）。
+# 参数: condition, timeoutMs；最后一个参数是WebDriver提供的异步回调
+# condition: {by, value, min_count, settle_ms}，为空时只等待文档加载完成；
+#   匹配元素数达到 min_count 后，还需在 settle_ms 毫秒内没有DOM变化才视为就绪
+# 返回: {ready, navigation}
+WAIT_FOR_READY = """
+var condition = arguments[0];
+var timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+""" + FIND_ALL + """
+function navigation() {
+    var entry = performance.getEntriesByType('navigation')[0];
+    return entry && entry.loadEventEnd > 0 ? {
+        url: entry.name,
+        time_origin: performance.timeOrigin,
+        ttfb: entry.responseStart,
+        dom_content_loaded: entry.domContentLoadedEventEnd,
+        load: entry.loadEventEnd
+    } : null;
+}
+
+var finished = false;
+var observer = null;
+var settleTimer = null;
+function finish(ready) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    if (observer) {
+        observer.disconnect();
+    }
+    clearTimeout(settleTimer);
+    clearTimeout(timeoutTimer);
+    // load 事件处理函数执行完后 loadEventEnd 才有值
+    setTimeout(function () {
+        done({ready: ready, navigation: navigation()});
+    }, 0);
+}
+function check() {
+    clearTimeout(settleTimer);
+    if (condition && findAll(document, condition.by, condition.value).length < condition.min_count) {
+        return;
+    }
+    if (condition && condition.settle_ms > 0) {
+        settleTimer = setTimeout(function () { finish(true); }, condition.settle_ms);
+    } else {
+        finish(true);
+    }
+}
+function start() {
+    observer = new MutationObserver(check);
+    observer.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    check();
+}
+var timeoutTimer = setTimeout(function () { finish(false); }, timeoutMs);
+if (document.readyState === 'complete') {
+    start();
+} else {
+    window.addEventListener('load', start);
+}
+"""
+
+# 批量点击：在一次脚本调用中点击所有目标元素，然后通过MutationObserver等待期望的状态，不需要轮询。
+# 参数: spec, timeoutMs；最后一个参数是WebDriver提供的异步回调
+# spec: {clicks: [{by, value}], expect: [{by, value, count}]}
+#   每个点击目标点击所有匹配的元素；元素在前面的点击后被重新渲染时按id重新查找
+#   expect 中每个定位器匹配的元素数都等于 count 时视为完成
+# 返回: {clicked, missing, matched}，missing 为没有匹配任何元素的点击目标（此时不点击任何元素）
+CLICK_AND_WAIT = """
+var spec = arguments[0];
+var timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+""" + FIND_ALL + """
+var targets = spec.clicks.map(function (target) {
+    return {target: target, elements: findAll(document, target.by, target.value)};
+});
+var missing = targets.filter(function (entry) {
+    return entry.elements.length === 0;
+}).map(function (entry) {
+    return entry.target;
+});
+var clicked = 0;
+if (missing.length === 0) {
+    targets.forEach(function (entry) {
+        entry.elements.forEach(function (element) {
+            if (!element.isConnected && element.id) {
+                element = document.getElementById(element.id);
+            }
+            if (element && element.isConnected) {
+                element.click();
+                clicked++;
+            }
+        });
+    });
+}
+
+function check() {
+    return spec.expect.every(function (condition) {
+        return findAll(document, condition.by, condition.value).length === condition.count;
+    });
+}
+
+var timer = null;
+var observer = new MutationObserver(function () {
+    if (check()) {
+        finish(true);
+    }
+});
+function finish(matched) {
+    observer.disconnect();
+    clearTimeout(timer);
+    done({clicked: clicked, missing: missing, matched: matched});
+}
+if (missing.length > 0) {
+    done({clicked: 0, missing: missing, matched: false});
+} else if (check()) {
+    done({clicked: clicked, missing: missing, matched: true});
+} else {
+    observer.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    timer = setTimeout(function () {
+        finish(false);
+    }, timeoutMs);
+}
+"""
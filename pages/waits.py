@@ -0,0 +1,147 @@
+"""等待策略 - 同步和异步页面对象共用的脚本参数和重试规则
+
+同步的 ``BasePage`` 和异步的 ``AsyncBasePage`` 只负责发出脚本调用（直接调用或放到线程池中），
+脚本参数的格式、每次调用的等待时长和哪些错误可以重试都在这里维护。
+"""
+
+import time
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from config import Config
+
+# 页面跳转、框架卸载或渲染进程切换中断异步脚本时，浏览器返回的错误信息片段
+NAVIGATION_MARKERS = (
+    "document unloaded",
+    "document was unloaded",
+    "execution context was destroyed",
+    "cannot find context with specified id",
+    "inspected target navigated or closed",
+    "target frame detached"
+)
+
+
+def is_navigation_error(exc):
+    """判断异步脚本是否因页面跳转或执行上下文丢失而中断，这类错误在新文档上重试
+    
+    脚本本身的错误（语法错误、定位器无效等）不是导航错误，重试也不会成功，应直接抛出。
+    
+    Args:
+        exc: 执行脚本时抛出的异常
+    
+    Returns:
+        bool: 是否为导航或上下文丢失引起的中断
+    """
+    if not isinstance(exc, JavascriptException):
+        return False
+    message = (exc.msg or "").lower()
+    return any(marker in message for marker in NAVIGATION_MARKERS)
+
+
+def records_spec(locator, fields, timeout=None):
+    """把定位器和字段映射转换成 READ_ELEMENTS 脚本的参数
+    
+    Args:
+        locator: 元素定位器 (By, value)
+        fields: 字段名到 (子元素定位器, 属性名) 的映射；子元素定位器为None时读取
+            元素本身，属性名为 "text" 时读取可见文本
+        timeout: 等待DOM稳定的最长时间，默认且最多为 Config.EXPLICIT_WAIT，不超过WebDriver的脚本超时
+    
+    Returns:
+        dict: 脚本参数
+    """
+    timeout = Config.EXPLICIT_WAIT if timeout is None else min(timeout, Config.EXPLICIT_WAIT)
+    return {
+        "by": locator[0],
+        "value": locator[1],
+        "timeout_ms": int(timeout * 1000),
+        "fields": [
+            {
+                "name": name,
+                "by": child[0] if child else None,
+                "value": child[1] if child else None,
+                "attribute": attribute
+            }
+            for name, (child, attribute) in fields.items()
+        ]
+    }
+
+
+def ready_condition_spec(condition):
+    """把就绪条件转换成 WAIT_FOR_READY 脚本的参数
+    
+    Args:
+        condition: 就绪条件，见 ``BasePage.READY_CONDITION``
+    
+    Returns:
+        dict: 脚本参数，条件为None时返回None
+    """
+    if condition is None:
+        return None
+    return {
+        "by": condition["locator"][0],
+        "value": condition["locator"][1],
+        "min_count": condition.get("min_count", 1),
+        "settle_ms": condition.get("settle_ms", 0)
+    }
+
+
+class ReadyPoll:
+    """一次页面就绪等待的重试规则
+    
+    迭代时依次生成每次 WAIT_FOR_READY 调用的参数：每次调用最多等待 Config.EXPLICIT_WAIT，
+    不超过WebDriver的脚本超时；就绪或超过总超时后结束。调用方把脚本结果写入 ``state``，
+    调用抛出的异常交给 ``failed``。
+    """
+    
+    def __init__(self, condition, timeout):
+        """初始化就绪等待
+        
+        Args:
+            condition: 就绪条件，为None时只等待文档加载完成
+            timeout: 等待超时时间
+        """
+        self.spec = ready_condition_spec(condition)
+        self.locator = condition["locator"] if condition else None
+        self.start_time = time.perf_counter()
+        self.deadline = self.start_time + timeout
+        self.state = {"ready": False, "navigation": None}
+    
+    def __iter__(self):
+        """依次生成脚本参数 (spec, timeoutMs)"""
+        while not self.state["ready"] and time.perf_counter() < self.deadline:
+            remaining = min(self.deadline - time.perf_counter(), Config.EXPLICIT_WAIT)
+            yield self.spec, int(remaining * 1000)
+    
+    def failed(self, exc):
+        """处理一次脚本调用的异常：WebDriver脚本超时和页面跳转引起的中断在剩余时间内重试，其他错误直接抛出
+        
+        Args:
+            exc: 脚本调用抛出的异常
+        
+        Raises:
+            Exception: 不可重试的异常
+        """
+        if not isinstance(exc, TimeoutException) and not is_navigation_error(exc):
+            raise exc
+    
+    @property
+    def ready(self):
+        """页面是否已就绪"""
+        return bool(self.state["ready"])
+    
+    @property
+    def elapsed(self):
+        """从开始等待到现在的耗时（秒）"""
+        return time.perf_counter() - self.start_time
+    
+    def navigation(self):
+        """返回就绪脚本读取的导航计时
+        
+        Returns:
+            dict: 导航计时，页面没有导航记录时为None
+        
+        Raises:
+            TimeoutException: 超时后页面仍未就绪
+        """
+        if not self.ready:
+            raise TimeoutException(f"等待页面就绪超时: {self.locator}")
+        return self.state["navigation"]
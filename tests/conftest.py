@@ -3,66 +3,72 @@
 import pytest
 import os
 import sys
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from collections import Counter
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import Config
+from core import DriverPool, NetworkShaper, get_factory, get_resolver
+from core.driver_factory import summarize_startups
+from core import artifacts, checkpoint, metrics, worker_stats
+from core.metrics import get_recorder
+from core.session import SessionBootstrap
+from core.local_site import for_target
 from pages import LoginPage, ProductsPage, CartPage
+from pages.browserless import HttpProductsPage, ParityProductsPage
+
+# 并行执行时按历史耗时调度测试，并汇总各worker的耗时记录；测试结果流式写入 reports/stream；
+# 超时、元素过期和网络错误这类失败在新的浏览器中重试
+pytest_plugins = ["core.parallel", "core.stream_report.plugin", "core.retry"]
+
+
+def create_browser():
+    """通过驱动工厂创建一个新的Chrome浏览器实例
+    
+    Returns:
+        WebDriver: 新的浏览器实例
+    """
+    print(f"\n[Pytest Fixture] 启动浏览器（{Config.DRIVER_PROFILE}）...")
+    return get_factory().create()
+
+
+@pytest.fixture(scope="session")
+def driver_pool():
+    """浏览器池夹具 - 整个测试会话共享
+    
+    Returns:
+        DriverPool: 浏览器池
+    """
+    pool = DriverPool(create_browser)
+    yield pool
+    
+    print("\n[Pytest Fixture] 关闭浏览器池...")
+    pool.shutdown()
 
 
 @pytest.fixture(scope="function")
-def driver():
+def driver(request, driver_pool):
     """
     定义一个名为 'driver' 的 fixture。
-    scope="function" 表示每个测试函数都会执行一次这个fixture，
-    确保测试之间的独立性。
+    浏览器从会话级的浏览器池中获取，测试结束后重置状态
+    （cookies、本地存储、多余窗口）并归还，避免每个测试都冷启动Chrome。
+    使用 @pytest.mark.fresh_browser 标记的测试会获得全新的浏览器，
+    并在测试结束后关闭。
     """
-    print("\n[Pytest Fixture] 启动浏览器...")
-    
-    # --- 开始修改 ---
-    
-    # 1. 创建 ChromeOptions 对象
-    chrome_options = Options()
-    
-    # 2. 创建一个字典，用于存储实验性选项的偏好设置
-    prefs = {
-        "credentials_enable_service": False,  # 禁用凭据服务，这是关键
-        "profile.password_manager_enabled": False  # 禁用密码管理器
-    }
-    
-    # 3. 将偏好设置添加到 ChromeOptions 中
-    chrome_options.add_experimental_option("prefs", prefs)
+    # core.retry 由 pytest_plugins 加载，在夹具中导入避免先于插件注册被导入
+    from core import retry
     
-    # 4. (可选) 禁用 "Chrome正受到自动测试软件的控制" 的信息栏
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    fresh = not Config.REUSE_BROWSER or \
+        request.node.get_closest_marker("fresh_browser") is not None
+    # 因超时、元素过期或网络错误重试时使用新的浏览器，失败的浏览器不放回池中
+    browser = driver_pool.acquire(fresh=fresh or retry.is_retry(request.node))
     
-    # 5. 添加其他有用的选项
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    
-    # 6. 检查是否需要无头模式
-    if os.getenv('HEADLESS', 'false').lower() == 'true':
-        chrome_options.add_argument("--headless")
-    
-    # --- 修改结束 ---
-
-    # 7. 在创建WebDriver实例时，传入配置好的 options
-    service = Service(ChromeDriverManager().install())
-    browser = webdriver.Chrome(service=service, options=chrome_options)
-    browser.implicitly_wait(5)  # 设置隐式等待
-
     # 'yield' 关键字是fixture的核心，它将driver对象提供给测试函数
     yield browser
-
+    
     # --- 后置操作 ---
-    print("\n[Pytest Fixture] 关闭浏览器...")
-    browser.quit()
+    driver_pool.release(browser, discard=fresh or retry.failed_on_infrastructure(request.node))
 
 
 @pytest.fixture(scope="function")
@@ -107,36 +113,120 @@ def cart_page(driver):
 
 
 @pytest.fixture(scope="function")
-def logged_in_user(login_page, products_page):
+def logged_in_user(request, driver, products_page):
     """已登录用户夹具 - 自动登录标准用户
     
+    默认直接写入缓存的会话状态（LOGIN_MODE=session），跳过登录表单；
+    使用 @pytest.mark.login_mode("ui") 标记或设置 LOGIN_MODE=ui 时通过登录表单登录。
+    
     Args:
-        login_page: 登录页面对象
+        request: pytest请求对象
+        driver: WebDriver实例
         products_page: 产品页面对象
         
     Returns:
         ProductsPage: 登录后的产品页面对象
     """
-    login_page.login(Config.VALID_USERNAME, Config.VALID_PASSWORD)
+    marker = request.node.get_closest_marker("login_mode")
+    mode = marker.args[0] if marker else Config.LOGIN_MODE
+    
+    # 同时使用 login_page 的测试需要先打开登录页面，保证夹具的执行顺序与之前一致
+    login_page = request.getfixturevalue("login_page") if "login_page" in request.fixturenames else None
+    
+    if mode == "ui":
+        if login_page is None:
+            login_page = request.getfixturevalue("login_page")
+        login_page.login(Config.VALID_USERNAME, Config.VALID_PASSWORD)
+    else:
+        SessionBootstrap(driver).login(Config.VALID_USERNAME, Config.VALID_PASSWORD)
+    
     assert products_page.is_products_page(), "登录失败，未跳转到产品页面"
     return products_page
 
 
+@pytest.fixture(scope="function")
+def product_catalog(request):
+    """商品列表只读断言夹具 - 按 PRODUCTS_BACKEND 选择后端
+    
+    selenium 返回已登录的产品页面对象；http 不启动浏览器，直接解析本地替身站点服务端渲染的商品列表；
+    parity 同时使用两者，每次读取都交叉验证结果。HTTP后端只支持本地替身站点，
+    目标为线上站点时退回 selenium。
+    
+    Args:
+        request: pytest请求对象
+        
+    Returns:
+        ProductsPage、HttpProductsPage 或 ParityProductsPage: 提供相同读取方法的产品页面
+    """
+    backend = Config.PRODUCTS_BACKEND
+    if backend not in ("selenium", "http", "parity"):
+        raise ValueError(f"不支持的商品列表后端: {backend}")
+    if backend == "selenium" or Config.TARGET_SITE != "local":
+        return request.getfixturevalue("logged_in_user")
+    
+    http_page = HttpProductsPage(Config.BASE_URL).open()
+    if backend == "http":
+        return http_page
+    return ParityProductsPage(http_page, request.getfixturevalue("logged_in_user"))
+
+
+@pytest.fixture(scope="session")
+def local_site():
+    """本地替身站点夹具 - 在进程内随机端口启动，TARGET_SITE 为 local 时同时作为测试网站
+    
+    Returns:
+        LocalSite: 本地站点
+    """
+    with for_target(always=True) as site:
+        yield site
+
+
 @pytest.fixture(scope="session", autouse=True)
-def setup_test_environment():
+def setup_test_environment(request):
     """测试环境设置夹具 - 在所有测试开始前执行"""
     # 创建测试报告目录
     reports_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reports")
     os.makedirs(reports_dir, exist_ok=True)
     
+    # 使用本地替身站点时启动站点，夹具会替换测试网站URL
+    if Config.TARGET_SITE == "local":
+        request.getfixturevalue("local_site")
+    
     print("\n=== 测试环境设置完成 ===")
     print(f"测试网站: {Config.BASE_URL}")
     print(f"浏览器: {Config.BROWSER}")
-    print(f"无头模式: {Config.HEADLESS}")
+    print(f"启动配置: {Config.DRIVER_PROFILE}")
     print(f"报告目录: {reports_dir}")
     print("=" * 50)
 
 
+@pytest.fixture(scope="function", autouse=True)
+def page_metrics(request):
+    """性能指标夹具 - 收集每个测试中页面对象操作的耗时、导航计时和网络流量
+    
+    测试结束后指标摘要写入 user_properties，并汇总到 reports/metrics.json。
+    
+    Args:
+        request: pytest请求对象
+        
+    Returns:
+        MetricsRecorder: 当前测试的指标收集器
+    """
+    recorder = get_recorder()
+    recorder.reset(request.node.nodeid)
+    
+    # 使用浏览器的测试先清空复用浏览器中上一个测试留下的性能日志
+    browser = request.getfixturevalue("driver") if "driver" in request.fixturenames else None
+    if browser is not None:
+        NetworkShaper.collect(browser)
+    
+    yield recorder
+    
+    if browser is not None:
+        recorder.record_network(NetworkShaper.collect(browser))
+    request.node.user_properties.append(("metrics", recorder.summary()))
+
+
 @pytest.fixture(scope="function")
 def test_data():
     """测试数据夹具
@@ -171,6 +261,12 @@ def test_data():
 
 def pytest_configure(config):
     """pytest配置钩子"""
+    # 性能指标插件已随页面对象导入，直接注册模块，汇总各测试的指标
+    if not config.pluginmanager.is_registered(metrics):
+        config.pluginmanager.register(metrics, "core.metrics")
+    # metrics 夹具读取性能日志统计每个测试的网络流量
+    Config.RECORD_NETWORK_TRAFFIC = os.getenv("RECORD_NETWORK_TRAFFIC", "true").lower() == "true"
+    
     # 添加自定义标记
     config.addinivalue_line(
         "markers", "smoke: 标记冒烟测试用例"
@@ -184,10 +280,83 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "cart: 标记购物车相关测试用例"
     )
+    config.addinivalue_line(
+        "markers", "fresh_browser: 使用全新的浏览器而不是浏览器池中的复用实例"
+    )
+    config.addinivalue_line(
+        "markers", "login_mode(mode): logged_in_user 的登录方式，session 或 ui"
+    )
+    
+    # 控制进程（或串行运行时）清空上一次运行的失败现场和进程统计
+    if not hasattr(config, "workerinput") and not config.option.collectonly:
+        artifacts.clear()
+        worker_stats.clear()
+
 
+def pytest_terminal_summary(terminalreporter):
+    """在测试摘要中输出驱动解析和浏览器启动耗时，并行运行时汇总所有worker写入的统计"""
+    histories = [history for history in worker_stats.load("resolver") if history]
+    if histories:
+        firsts = [history[0] for history in histories]
+        sources = Counter(first["source"] for first in firsts)
+        slowest = max(first["elapsed"] for first in firsts)
+        total = sum(resolution["elapsed"] for history in histories for resolution in history)
+        terminalreporter.write_line(
+            f"驱动解析: 首次来源 {'、'.join(f'{source} {count}' for source, count in sources.items())} "
+            f"最长耗时 {slowest * 1000:.1f}ms，共 {sum(map(len, histories))} 次，"
+            f"合计 {total * 1000:.1f}ms ({firsts[0]['path']})"
+        )
+    startups = [startup for worker in worker_stats.load("startups") for startup in worker]
+    for profile, stats in summarize_startups(startups).items():
+        terminalreporter.write_line(
+            f"浏览器启动: {profile} 配置共 {stats['count']} 次，平均 {stats['mean'] * 1000:.0f}ms，"
+            f"最短 {stats['min'] * 1000:.0f}ms，最长 {stats['max'] * 1000:.0f}ms"
+        )
+    stats = dict.fromkeys(checkpoint.stats, 0)
+    for worker in worker_stats.load("checkpoint"):
+        for key, value in worker.items():
+            stats[key] += value
+    if stats["restores"]:
+        terminalreporter.write_line(
+            f"夹具快照: 记录 {stats['captures']} 次，平均准备 "
+            f"{stats['setup_time'] / max(stats['captures'], 1) * 1000:.0f}ms；恢复 {stats['restores']} 次，"
+            f"平均 {stats['restore_time'] / stats['restores'] * 1000:.0f}ms"
+        )
+    stats = artifacts.load_stats()
+    if stats:
+        terminalreporter.write_line(
+            f"失败现场: {stats['captures']} 个测试，读取浏览器 {stats['capture_time'] * 1000:.0f}ms，"
+            f"后台写入 {stats['write_time'] * 1000:.0f}ms，{stats['raw_bytes'] / 1024:.0f}KB 压缩为 "
+            f"{stats['written_bytes'] / 1024:.0f}KB，淘汰 {stats['evicted']} 个 ({Config.ARTIFACTS_DIR})"
+        )
 
+
+@pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    """测试报告生成钩子"""
-    if call.when == "call":
-        # 可以在这里添加截图等功能
-        pass
\ No newline at end of file
+    """测试报告生成钩子 - setup或测试本身失败时保存失败现场
+    
+    截图、DOM、控制台日志和网络记录在浏览器归还浏览器池之前读取，
+    压缩和写盘在后台线程中完成；现场文件作为附件链接到流式报告中。
+    """
+    outcome = yield
+    report = outcome.get_result()
+    browser = getattr(item, "funcargs", {}).get("driver")
+    if not Config.CAPTURE_ARTIFACTS or not report.failed or report.when not in ("setup", "call") or browser is None:
+        return
+    
+    capture = artifacts.get_collector().capture(item.nodeid, browser)
+    stream_dir = item.config.getoption("stream_report", None)
+    for name, path in capture["files"]:
+        relative = os.path.relpath(path, stream_dir) if stream_dir else path
+        if stream_dir and not relative.startswith(os.pardir):
+            item.user_properties.append(("asset", {"name": name, "path": relative.replace(os.sep, "/")}))
+    item.user_properties.append(("artifacts", {"capture_ms": capture["capture_ms"], "files": len(capture["files"])}))
+
+
+def pytest_sessionfinish(session):
+    """等待后台线程写完失败现场，并写入本进程的统计供控制进程汇总"""
+    artifacts.shutdown()
+    worker_stats.write("resolver", get_resolver().history)
+    worker_stats.write("startups", get_factory().startups)
+    if checkpoint.stats["captures"] or checkpoint.stats["restores"]:
+        worker_stats.write("checkpoint", checkpoint.stats)
\ No newline at end of file
@@ -0,0 +1,261 @@
+"""测试替身 - 不启动浏览器的测试共用的模拟WebDriver和元素
+
+``FakeDriver`` 与真实的WebDriver一样通过 ``execute`` 发出每一条命令，页面对象的请求计数器、
+导航计数和元素缓存都按真实的方式工作。脚本的返回值可以通过 ``responses`` 按脚本配置，
+没有配置的脚本按一个总是就绪的页面返回。
+"""
+
+import itertools
+import time
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+from selenium.webdriver.remote.webelement import WebElement
+from core.checkpoint import CAPTURE_SCRIPT, RESTORE_SCRIPT
+from pages import scripts
+
+_ids = itertools.count()
+
+# 商品列表记录：已加购的商品渲染移除按钮，名称含标点的商品的按钮id不能由名称推算
+GRID = [
+    {"name": "Sauce Labs Backpack", "price": "$29.99", "button_id": "add-to-cart-sauce-labs-backpack"},
+    {"name": "Sauce Labs Bike Light", "price": "$9.99", "button_id": "remove-sauce-labs-bike-light"},
+    {"name": "Test.allTheThings() T-Shirt (Red)", "price": "$15.99",
+     "button_id": "remove-test.allthethings()-t-shirt-(red)"}
+]
+
+
+def _respond(response, args):
+    """按配置生成一次脚本调用的结果
+    
+    Args:
+        response: 结果、按顺序返回的结果列表（最后一个一直重复）、异常实例或接收脚本参数的函数
+        args: 脚本参数
+    
+    Returns:
+        脚本结果
+    """
+    if isinstance(response, list):
+        response = response.pop(0) if len(response) > 1 else response[0]
+    if isinstance(response, Exception):
+        raise response
+    if callable(response):
+        return response(*args)
+    return response
+
+
+class FakeSwitchTo:
+    """模拟窗口切换"""
+    
+    def __init__(self, driver):
+        """初始化模拟窗口切换
+        
+        Args:
+            driver: 模拟的WebDriver
+        """
+        self.driver = driver
+    
+    def window(self, handle):
+        """切换到窗口"""
+        self.driver.current_window_handle = handle
+
+
+class FakeElement(WebElement):
+    """模拟元素，点击和输入记录在所属的模拟WebDriver上，过期后任何操作都抛出 StaleElementReferenceException"""
+    
+    def __init__(self, driver, locator, text="Products"):
+        """初始化模拟元素
+        
+        Args:
+            driver: 模拟的WebDriver
+            locator: 查找该元素的定位器 (By, value)
+            text: 元素文本
+        """
+        super().__init__(driver, f"element-{next(_ids)}")
+        self.locator = locator
+        self.stale = False
+        self._text = text
+    
+    def _check(self):
+        """元素过期时抛出异常"""
+        if self.stale:
+            raise StaleElementReferenceException("stale element reference")
+    
+    @property
+    def text(self):
+        """元素文本"""
+        self._check()
+        return self._text
+    
+    def is_displayed(self):
+        """元素是否可见"""
+        self._check()
+        return True
+    
+    def is_enabled(self):
+        """元素是否可用"""
+        self._check()
+        return True
+    
+    def clear(self):
+        """清空输入框"""
+        self._check()
+    
+    def send_keys(self, *value):
+        """输入文本"""
+        self._check()
+        self.parent.typed.append((self.locator[1], "".join(value)))
+    
+    def click(self):
+        """点击元素"""
+        self._check()
+        self.parent.clicked.append(self.locator[1])
+
+
+class FakeDriver:
+    """模拟WebDriver
+    
+    异步脚本的默认结果：页面总是就绪，READ_ELEMENTS 立即稳定并返回 ``records``，WAIT_FOR_ELEMENT 按 ``visible``
+    判断元素状态，其他脚本返回True。同步脚本实现快照的读取和恢复，其他脚本返回None。
+    """
+    
+    page_source = "<html><body></body></html>"
+    
+    def __init__(self, responses=None, records=(), visible=(), logs=None, url="about:blank", delay=0.0):
+        """初始化模拟WebDriver
+        
+        Args:
+            responses: 脚本或CDP命令到结果的映射，结果的格式见 ``_respond``
+            records: READ_ELEMENTS 返回的记录
+            visible: 当前可见元素的定位值
+            logs: 日志类型到日志条目的映射，不在其中的日志类型不支持读取
+            url: 当前地址
+            delay: 每个请求的耗时（秒）
+        """
+        self.responses = dict(responses or {})
+        self.records = list(records)
+        self.visible = set(visible)
+        self.logs = dict(logs or {})
+        self.delay = delay
+        self.current_url = url
+        self.session_id = f"session-{next(_ids)}"
+        self.current_window_handle = "main"
+        self.window_handles = ["main"]
+        self.switch_to = FakeSwitchTo(self)
+        self.cookies = []
+        self.storage = {"local_storage": {}, "session_storage": {}}
+        self.commands = []
+        self.calls = []
+        self.cdp_commands = []
+        self.visited = []
+        self.elements = []
+        self.clicked = []
+        self.typed = []
+        self.quit_called = False
+    
+    def execute(self, driver_command, params=None):
+        """记录一条WebDriver命令"""
+        self.commands.append(driver_command)
+        return {"value": None}
+    
+    def script_calls(self, script):
+        """返回某个异步脚本每次调用的参数
+        
+        Args:
+            script: 脚本
+        
+        Returns:
+            list: 参数元组列表
+        """
+        return [args for called, args in self.calls if called == script]
+    
+    def get(self, url):
+        """打开地址"""
+        time.sleep(self.delay)
+        self.execute("get", {"url": url})
+        self.current_url = url
+        self.visited.append(url)
+    
+    def execute_async_script(self, script, *args):
+        """执行异步脚本"""
+        time.sleep(self.delay)
+        self.execute("w3cExecuteScriptAsync")
+        self.calls.append((script, args))
+        if script in self.responses:
+            return _respond(self.responses[script], args)
+        if script == scripts.WAIT_FOR_READY:
+            return {"ready": True, "navigation": None}
+        if script == scripts.READ_ELEMENTS:
+            return {"records": self.records, "settled": True}
+        if script == scripts.WAIT_FOR_ELEMENT:
+            by, value, state = args[:3]
+            matched = (value not in self.visible) if state == "absent" else (value in self.visible)
+            element = FakeElement(self, (by, value)) if matched and state != "absent" else None
+            return {"matched": matched, "element": element}
+        return True
+    
+    def execute_script(self, script, *args):
+        """执行同步脚本"""
+        self.execute("w3cExecuteScript")
+        if script in self.responses:
+            return _respond(self.responses[script], args)
+        if script == CAPTURE_SCRIPT:
+            return dict(self.storage, url=self.current_url)
+        if script == RESTORE_SCRIPT:
+            state = args[0]
+            if state["cookies"] is not None:
+                self.cookies = list(state["cookies"])
+            self.storage = {
+                "local_storage": dict(state["local_storage"]),
+                "session_storage": dict(state["session_storage"])
+            }
+        return None
+    
+    def execute_cdp_cmd(self, cmd, params):
+        """记录CDP命令"""
+        self.cdp_commands.append((cmd, params))
+        return _respond(self.responses[cmd], (params,)) if cmd in self.responses else {}
+    
+    def find_element(self, by, value):
+        """查找元素，每次返回新的元素"""
+        self.execute("findElement", {"using": by, "value": value})
+        element = FakeElement(self, (by, value))
+        self.elements.append(element)
+        return element
+    
+    def find_elements(self, by, value):
+        """查找元素，可见的定位值返回一个元素"""
+        self.execute("findElements", {"using": by, "value": value})
+        return [FakeElement(self, (by, value))] if value in self.visible else []
+    
+    def get_cookies(self):
+        """返回cookies"""
+        self.execute("getCookies")
+        return list(self.cookies)
+    
+    def add_cookie(self, cookie):
+        """添加cookie"""
+        self.execute("addCookie", {"cookie": cookie})
+        self.cookies.append(cookie)
+    
+    def delete_all_cookies(self):
+        """删除所有cookies"""
+        self.execute("deleteAllCookies")
+        self.cookies = []
+    
+    def get_screenshot_as_png(self):
+        """返回假的截图"""
+        return b"\x89PNG fake screenshot"
+    
+    def get_log(self, log_type):
+        """读取并清空日志，不支持的日志类型抛出异常"""
+        if log_type not in self.logs:
+            raise WebDriverException(f"log type '{log_type}' not found")
+        entries, self.logs[log_type] = self.logs[log_type], []
+        return entries
+    
+    def close(self):
+        """关闭当前窗口"""
+        self.window_handles.remove(self.current_window_handle)
+    
+    def quit(self):
+        """关闭浏览器"""
+        self.quit_called = True
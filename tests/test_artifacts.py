@@ -0,0 +1,107 @@
+"""失败现场测试用例 - 验证现场读取、后台压缩写盘、大小上限淘汰和统计汇总"""
+
+import gzip
+import json
+import os
+import time
+import pytest
+from core.artifacts import RESOURCE_TIMING, ArtifactCollector, load_stats, to_har
+from tests.fakes import FakeDriver
+
+
+URL = "http://127.0.0.1/inventory.html"
+PAGE_SOURCE = "<html><body>" + "商品" * 2000 + "</body></html>"
+RESOURCES = [{"name": URL, "type": "navigation", "startTime": 0, "duration": 120.5, "transferSize": 2048,
+              "encodedBodySize": 1900, "status": 200, "protocol": "http/1.1"}]
+
+
+def fake_browser(console=True):
+    """生成失败时的假浏览器
+    
+    Args:
+        console: 是否支持读取控制台日志
+    
+    Returns:
+        FakeDriver: 模拟的WebDriver
+    """
+    logs = {"browser": [{"level": "SEVERE", "message": "Uncaught TypeError", "timestamp": 1}]} if console else None
+    driver = FakeDriver(responses={RESOURCE_TIMING: [RESOURCES]}, logs=logs, url=URL)
+    driver.page_source = PAGE_SOURCE
+    return driver
+
+
+def read_gzip_json(path):
+    """读取gzip压缩的JSON文件
+    
+    Args:
+        path: 文件路径
+    
+    Returns:
+        JSON内容
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestArtifacts:
+    """失败现场测试类"""
+    
+    def test_capture_writes_compressed_artifacts(self, tmp_path):
+        """测试截图原样保存，DOM、控制台日志和网络记录压缩保存"""
+        collector = ArtifactCollector(str(tmp_path))
+        capture = collector.capture("tests/test_x.py::test_a", fake_browser())
+        stats = collector.close()
+        
+        files = dict(capture["files"])
+        assert set(files) == {"screenshot.png", "dom.html.gz", "console.json.gz", "network.har.gz"}
+        with open(files["screenshot.png"], "rb") as f:
+            assert f.read() == b"\x89PNG fake screenshot"
+        with gzip.open(files["dom.html.gz"], "rt", encoding="utf-8") as f:
+            assert f.read() == PAGE_SOURCE
+        assert read_gzip_json(files["console.json.gz"])[0]["message"] == "Uncaught TypeError"
+        har = read_gzip_json(files["network.har.gz"])
+        assert har["log"]["entries"][0]["response"]["status"] == 200
+        
+        assert stats["captures"] == 1
+        assert stats["written_bytes"] < stats["raw_bytes"]
+    
+    def test_unavailable_log_skipped(self, tmp_path):
+        """测试浏览器不支持的日志类型被跳过，其余现场照常保存"""
+        collector = ArtifactCollector(str(tmp_path))
+        capture = collector.capture("test_a", fake_browser(console=False))
+        stats = collector.close()
+        assert "console.json.gz" not in dict(capture["files"])
+        assert stats["errors"] == 1
+        assert os.path.exists(dict(capture["files"])["screenshot.png"])
+    
+    def test_evicts_least_recently_written(self, tmp_path):
+        """测试超过大小上限时删除最早写入的测试现场"""
+        collector = ArtifactCollector(str(tmp_path), max_bytes=10 ** 9)
+        first = collector.capture("test_first", fake_browser())
+        collector._queue.join()
+        first_dir = os.path.dirname(first["files"][0][1])
+        old = time.time() - 60
+        os.utime(first_dir, (old, old))
+        
+        # 上限只够保存一个测试的现场；两次现场压缩后的大小可能相差几个字节，留出余量
+        collector.max_bytes = sum(entry.stat().st_size for entry in os.scandir(first_dir)) * 3 // 2
+        second = collector.capture("test_second", fake_browser())
+        stats = collector.close()
+        assert stats["evicted"] == 1
+        assert not os.path.exists(first_dir)
+        assert os.path.exists(os.path.dirname(second["files"][0][1]))
+    
+    def test_stats_summed_across_processes(self, tmp_path):
+        """测试汇总各进程写入的统计"""
+        for captures in (1, 2):
+            with open(tmp_path / f".stats-{captures}.json", "w", encoding="utf-8") as f:
+                json.dump({"captures": captures, "capture_time": 0.1}, f)
+        assert load_stats(str(tmp_path)) == {"captures": 3, "capture_time": pytest.approx(0.2)}
+        assert load_stats(str(tmp_path / "missing")) is None
+    
+    def test_har_format(self):
+        """测试网络记录转换为HAR 1.2格式"""
+        har = to_har(RESOURCES, URL)
+        assert har["log"]["version"] == "1.2"
+        assert har["log"]["pages"][0]["title"] == URL
+        assert har["log"]["entries"][0]["request"]["url"].endswith("/inventory.html")
@@ -0,0 +1,95 @@
+"""异步页面对象测试用例 - 使用模拟的WebDriver验证事件驱动等待和并发会话"""
+
+import asyncio
+import threading
+import time
+import pytest
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from config import Config
+from pages import scripts
+from pages.aio import AsyncLoginPage, AsyncProductsPage, run_sessions
+from tests.fakes import FakeDriver
+
+
+class TestAsyncPages:
+    """异步页面对象测试类"""
+    
+    def test_login_uses_one_script_per_wait(self):
+        """测试登录时每次等待只发出一次脚本调用"""
+        driver = FakeDriver(visible={"user-name", "password", "login-button"})
+        page = AsyncLoginPage(driver)
+        asyncio.run(page.login("standard_user", "secret_sauce"))
+        assert driver.typed == [("user-name", "standard_user"), ("password", "secret_sauce")]
+        assert driver.clicked == ["login-button"]
+        assert [script for script, _ in driver.calls] == [scripts.WAIT_FOR_ELEMENT] * 3
+    
+    def test_wait_until_present_times_out(self):
+        """测试元素未出现时抛出超时异常"""
+        page = AsyncProductsPage(FakeDriver())
+        with pytest.raises(TimeoutException):
+            asyncio.run(page.wait_until_present(AsyncProductsPage.PAGE_TITLE, timeout=1))
+        assert page.last_wait["success"] is False
+    
+    def test_missing_badge_does_not_wait(self):
+        """测试购物车徽章不存在时立即返回0"""
+        page = AsyncProductsPage(FakeDriver())
+        assert asyncio.run(page.get_cart_items_count()) == 0
+    
+    def test_sessions_run_concurrently(self):
+        """测试一个事件循环并发驱动多个会话"""
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+        
+        def create_driver():
+            return FakeDriver(visible={"[data-test='title']"}, delay=0.05)
+        
+        async def scenario(driver, executor):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            page = AsyncProductsPage(driver, executor)
+            await page.open("http://127.0.0.1")
+            result = await page.is_products_page()
+            with lock:
+                active["now"] -= 1
+            return result
+        
+        start_time = time.perf_counter()
+        results = asyncio.run(run_sessions(scenario, 8, create_driver))
+        elapsed = time.perf_counter() - start_time
+        assert results == [True] * 8
+        assert active["max"] > 1
+        # 每个会话4个请求共0.2秒，串行需要1.6秒
+        assert elapsed < 1.0
+    
+    def test_ready_wait_shares_sync_retry_policy(self):
+        """测试异步页面对象的就绪等待与同步页面对象使用同样的重试规则：页面跳转后重试，脚本错误直接抛出"""
+        driver = FakeDriver(responses={scripts.WAIT_FOR_READY: [
+            JavascriptException("javascript error: Execution context was destroyed"),
+            {"ready": True, "navigation": None}
+        ]})
+        page = AsyncProductsPage(driver)
+        asyncio.run(page.wait_for_page_load())
+        assert len(driver.script_calls(scripts.WAIT_FOR_READY)) == 2
+        assert page.last_wait["success"] is True
+        
+        driver = FakeDriver(responses={scripts.WAIT_FOR_READY: JavascriptException("javascript error: bad selector")})
+        with pytest.raises(JavascriptException, match="bad selector"):
+            asyncio.run(AsyncProductsPage(driver).wait_for_page_load())
+        assert len(driver.script_calls(scripts.WAIT_FOR_READY)) == 1
+    
+    def test_read_records_shares_sync_timeout(self):
+        """测试异步页面对象的批量读取与同步页面对象使用同样的超时参数和超时处理"""
+        driver = FakeDriver(responses={scripts.READ_ELEMENTS: {"records": [{"text": "Sauce Labs Backpack"}],
+                                                               "settled": False}})
+        page = AsyncProductsPage(driver)
+        assert asyncio.run(page.get_product_names()) == ["Sauce Labs Backpack"]
+        quiet_ms, spec = driver.script_calls(scripts.READ_ELEMENTS)[0]
+        assert spec["timeout_ms"] == Config.EXPLICIT_WAIT * 1000
+        assert page.last_wait["success"] is False
+        
+        driver = FakeDriver(responses={scripts.READ_ELEMENTS: TimeoutException("script timeout")})
+        page = AsyncProductsPage(driver)
+        with pytest.raises(TimeoutException, match="批量读取元素超时"):
+            asyncio.run(page.get_product_names())
+        assert page.last_wait["success"] is False
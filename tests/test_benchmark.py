@@ -0,0 +1,83 @@
+"""性能基准测试用例 - 验证统计计算和回退判定"""
+
+import pytest
+from core.benchmark import EXIT_NO_BASELINE, percentile, mann_whitney_u, compare_results, main, save_results, summarize
+
+
+def make_results(samples, commands=None):
+    """构造只有一个流程的基准结果
+    
+    Args:
+        samples: 耗时样本
+        commands: 每次迭代的WebDriver请求数
+        
+    Returns:
+        dict: 基准结果
+    """
+    return {
+        "flows": {
+            "login": {
+                "samples": samples,
+                "latency": summarize(samples),
+                "commands": commands or [5] * len(samples)
+            }
+        }
+    }
+
+
+class TestBenchmark:
+    """性能基准统计测试类"""
+    
+    def test_percentile_interpolates(self):
+        """测试百分位数线性插值"""
+        values = [4, 1, 3, 2]
+        assert percentile(values, 0.5) == 2.5
+        assert percentile(values, 0.0) == 1
+        assert percentile(values, 1.0) == 4
+        assert percentile([], 0.5) is None
+    
+    def test_mann_whitney_detects_slower_samples(self):
+        """测试明显变慢的样本p值很小"""
+        baseline = [0.10 + i * 0.001 for i in range(20)]
+        current = [0.20 + i * 0.001 for i in range(20)]
+        assert mann_whitney_u(baseline, current) < 0.001
+        assert mann_whitney_u(current, baseline) > 0.99
+    
+    def test_mann_whitney_identical_samples(self):
+        """测试完全相同的样本不会判定为显著"""
+        assert mann_whitney_u([0.1] * 10, [0.1] * 10) == 1.0
+    
+    def test_compare_flags_latency_regression(self):
+        """测试耗时显著变慢且超过阈值时判定为回退"""
+        baseline = make_results([0.10 + i * 0.001 for i in range(20)])
+        current = make_results([0.15 + i * 0.001 for i in range(20)])
+        comparison = compare_results(baseline, current)[0]
+        assert comparison["regression"]
+        assert comparison["change"] == pytest.approx(0.05 / 0.1095)
+    
+    def test_compare_ignores_change_below_threshold(self):
+        """测试显著但低于阈值的变化不判定为回退"""
+        baseline = make_results([0.100 + i * 0.0001 for i in range(20)])
+        current = make_results([0.105 + i * 0.0001 for i in range(20)])
+        assert not compare_results(baseline, current)[0]["regression"]
+    
+    def test_compare_flags_command_regression(self):
+        """测试WebDriver请求数增加判定为回退"""
+        samples = [0.1] * 10
+        comparison = compare_results(make_results(samples), make_results(samples, [6] * 10))[0]
+        assert comparison["regression"]
+    
+    def test_compare_without_baseline(self, tmp_path, capsys):
+        """测试基线不存在时提示先保存基线，并返回单独的退出码"""
+        results = tmp_path / "benchmark.json"
+        save_results(make_results([0.1, 0.2, 0.3]), str(results))
+        code = main(["compare", str(results), "--baseline", str(tmp_path / "missing.json")])
+        assert code == EXIT_NO_BASELINE
+        assert "--save-baseline" in capsys.readouterr().out
+    
+    def test_iterations_must_be_positive(self, capsys):
+        """测试计时次数小于1时参数解析报错"""
+        with pytest.raises(SystemExit) as error:
+            main(["run", "--iterations", "0"])
+        assert error.value.code == 2
+        assert "必须不小于1" in capsys.readouterr().err
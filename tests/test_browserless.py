@@ -0,0 +1,107 @@
+"""HTTP后端测试用例 - 验证HTML解析、共享定位器的查找和与Selenium的一致性校验"""
+
+import pytest
+from selenium.webdriver.common.by import By
+from config import Config
+from core.local_site import PRODUCTS, product_slug
+from core.local_site.catalog import sort_products
+from pages import ProductsPage
+from pages.browserless import HttpProductsPage, ParityProductsPage, parse_html, select_all, select_one
+
+MARKUP = """
+<div class="inventory_list" data-test="inventory-list">
+  <div class="inventory_item" data-test="inventory-item">
+    <div class="inventory_item_name" data-test="inventory-item-name">Sauce Labs
+      Backpack</div>
+    <img src="/a.svg" alt="Backpack">
+    <button id="remove-sauce-labs-backpack" data-test="remove-sauce-labs-backpack">Remove</button>
+  </div>
+  <div class="inventory_item" data-test="inventory-item">
+    <div class="inventory_item_name" data-test="inventory-item-name">Onesie &amp; Co</div>
+    <button id="add-to-cart-onesie" data-test="add-to-cart-onesie">Add to cart</button>
+    <span hidden>secret</span>
+  </div>
+</div>
+"""
+
+
+class FakeProductsPage:
+    """返回固定结果的假Selenium产品页面"""
+    
+    def __init__(self, names):
+        self.names = names
+        self.sorted_by = None
+    
+    def get_product_names(self):
+        return list(self.names)
+    
+    def select_sort_option(self, option_value):
+        self.sorted_by = option_value
+
+
+class TestBrowserless:
+    """HTTP后端测试类"""
+    
+    def test_select_with_page_object_locators(self):
+        """测试页面对象的CSS定位器（属性前缀、逗号分组）可以直接用于解析后的文档"""
+        document = parse_html(MARKUP)
+        assert len(select_all(document, ProductsPage.PRODUCT_ITEMS)) == 2
+        buttons = select_all(document, ProductsPage.PRODUCT_BUTTON)
+        assert [button.get_attribute("id") for button in buttons] == \
+            ["remove-sauce-labs-backpack", "add-to-cart-onesie"]
+        assert len(select_all(document, ProductsPage.REMOVE_BUTTONS)) == 1
+        assert select_one(document, (By.ID, "add-to-cart-onesie")).tag == "button"
+        assert len(select_all(document, (By.CSS_SELECTOR, ".inventory_list .inventory_item_name"))) == 2
+    
+    def test_text_matches_webelement_rules(self):
+        """测试文本折叠空白、解码字符实体并忽略 hidden 元素"""
+        document = parse_html(MARKUP)
+        names = [node.text for node in select_all(document, ProductsPage.PRODUCT_NAMES)]
+        assert names == ["Sauce Labs Backpack", "Onesie & Co"]
+        assert "secret" not in select_all(document, ProductsPage.PRODUCT_ITEMS)[1].text
+    
+    def test_unsupported_selector_rejected(self):
+        """测试不支持的选择器给出明确错误"""
+        with pytest.raises(ValueError, match="不支持的CSS选择器"):
+            select_all(parse_html(MARKUP), (By.CSS_SELECTOR, "div > button"))
+        with pytest.raises(ValueError, match="不支持的定位方式"):
+            select_all(parse_html(MARKUP), (By.XPATH, "//button"))
+    
+    def test_http_page_reads_local_site(self, local_site):
+        """测试HTTP产品页面读取本地替身站点的商品列表"""
+        page = HttpProductsPage(local_site.base_url)
+        assert page.is_products_page()
+        assert page.get_products_count() == len(PRODUCTS)
+        assert page.get_product_names() == [product["name"] for product in sort_products(PRODUCTS, "az")]
+        assert page.get_product_prices()[0].startswith("$")
+        grid = page.get_product_grid()
+        assert grid[0]["button_id"] == f"add-to-cart-{product_slug(grid[0]['name'])}"
+    
+    @pytest.mark.parametrize("option", ["az", "za", "lohi", "hilo"])
+    def test_http_page_sort(self, local_site, option):
+        """参数化测试HTTP产品页面的排序结果"""
+        page = HttpProductsPage(local_site.base_url)
+        page.select_sort_option(option)
+        assert page.get_product_names() == [product["name"] for product in sort_products(PRODUCTS, option)]
+        assert page.request_count == 1
+    
+    def test_http_page_requires_server_rendering(self, local_site, monkeypatch):
+        """测试没有服务端渲染商品列表的页面给出明确错误"""
+        monkeypatch.setattr(Config, "INVENTORY_PATH", "/cart.html")
+        page = HttpProductsPage(local_site.base_url)
+        with pytest.raises(ValueError, match="服务端渲染"):
+            page.open()
+    
+    def test_parity_detects_mismatch(self, local_site):
+        """测试一致性校验在两个后端结果不同时报错，一致时返回结果"""
+        http_page = HttpProductsPage(local_site.base_url)
+        expected = [product["name"] for product in sort_products(PRODUCTS, "za")]
+        
+        parity = ParityProductsPage(http_page, FakeProductsPage(expected))
+        parity.select_sort_option("za")
+        assert parity.get_product_names() == expected
+        assert parity.selenium_page.sorted_by == "za"
+        
+        parity = ParityProductsPage(http_page, FakeProductsPage(expected[::-1]))
+        with pytest.raises(AssertionError, match="HTTP后端与Selenium结果不一致"):
+            parity.get_product_names()
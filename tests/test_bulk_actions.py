@@ -0,0 +1,84 @@
+"""批量点击测试用例 - 使用模拟的WebDriver验证批量加购、移除和清空购物车只需要一次点击脚本"""
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+from pages import scripts, ProductsPage, CartPage
+from tests.fakes import GRID, FakeDriver
+
+
+def fake_driver(result):
+    """生成批量点击脚本返回预设结果的模拟WebDriver
+    
+    Args:
+        result: 批量点击脚本的返回值
+    
+    Returns:
+        FakeDriver: 模拟的WebDriver
+    """
+    return FakeDriver(responses={scripts.CLICK_AND_WAIT: result}, records=GRID)
+
+
+def click_specs(driver):
+    """返回所有批量点击脚本的参数
+    
+    Args:
+        driver: 模拟的WebDriver
+    
+    Returns:
+        list: 点击规格列表
+    """
+    return [args[0] for args in driver.script_calls(scripts.CLICK_AND_WAIT)]
+
+
+class TestBulkActions:
+    """批量点击测试类"""
+    
+    def test_add_products_in_one_script(self):
+        """测试多个产品在一次脚本调用中加购，并等待每个产品的移除按钮出现"""
+        driver = fake_driver({"clicked": 2, "missing": [], "matched": True})
+        page = ProductsPage(driver)
+        assert page.add_products_to_cart(["Sauce Labs Backpack", "Sauce Labs Bike Light"]) == 2
+        
+        specs = click_specs(driver)
+        assert len(specs) == 1
+        assert specs[0]["clicks"] == [
+            {"by": By.ID, "value": "add-to-cart-sauce-labs-backpack"},
+            {"by": By.ID, "value": "add-to-cart-sauce-labs-bike-light"}
+        ]
+        assert specs[0]["expect"][0] == {"by": By.ID, "value": "remove-sauce-labs-backpack", "count": 1}
+        assert page.last_wait["name"] == "click_all"
+    
+    def test_remove_products_waits_for_add_buttons(self):
+        """测试批量移除后等待加购按钮重新出现"""
+        driver = fake_driver({"clicked": 1, "missing": [], "matched": True})
+        ProductsPage(driver).remove_products_from_cart(["sauce-labs-backpack"])
+        spec = click_specs(driver)[0]
+        assert spec["clicks"] == [{"by": By.ID, "value": "remove-sauce-labs-backpack"}]
+        assert spec["expect"] == [{"by": By.ID, "value": "add-to-cart-sauce-labs-backpack", "count": 1}]
+    
+    def test_missing_target_fails_fast(self):
+        """测试点击目标不存在时立即抛出异常，不等待超时"""
+        missing = [{"by": By.ID, "value": "add-to-cart-sauce-labs-backpack"}]
+        driver = fake_driver({"clicked": 0, "missing": missing, "matched": False})
+        with pytest.raises(NoSuchElementException, match="add-to-cart-sauce-labs-backpack"):
+            ProductsPage(driver).add_products_to_cart(["Sauce Labs Backpack"])
+    
+    def test_unmatched_state_raises_timeout(self):
+        """测试点击后状态始终未达到期望时抛出超时异常"""
+        driver = fake_driver({"clicked": 1, "missing": [], "matched": False})
+        page = ProductsPage(driver)
+        with pytest.raises(TimeoutException):
+            page.add_products_to_cart(["Sauce Labs Backpack"])
+        assert page.last_wait["success"] is False
+    
+    def test_clear_cart(self):
+        """测试清空购物车点击所有移除按钮并等待列表为空，空购物车直接返回"""
+        driver = fake_driver({"clicked": 3, "missing": [], "matched": True})
+        assert CartPage(driver).clear_cart() == 3
+        spec = click_specs(driver)[0]
+        assert spec["clicks"] == [{"by": By.CSS_SELECTOR, "value": "[data-test^='remove']"}]
+        assert spec["expect"] == [{"by": By.CSS_SELECTOR, "value": "[data-test='inventory-item']", "count": 0}]
+        
+        empty = fake_driver({"clicked": 0, "missing": spec["clicks"], "matched": False})
+        assert CartPage(empty).clear_cart() == 0
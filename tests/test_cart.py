@@ -2,21 +2,33 @@
 
 import pytest
 from config import Config
+from core.checkpoint import restore_or_capture
 
 
 class TestCart:
     """购物车功能测试类"""
     
     @pytest.fixture
-    def cart_with_items(self, logged_in_user, cart_page):
-        """购物车中有商品的夹具"""
-        # 添加多个商品到购物车
-        logged_in_user.add_backpack_to_cart()
-        logged_in_user.add_bike_light_to_cart()
-        logged_in_user.add_bolt_tshirt_to_cart()
-        
-        # 导航到购物车页面
-        logged_in_user.click_cart_icon()
+    def cart_with_items(self, request, driver, cart_page):
+        """购物车中有商品的夹具
+        
+        每个进程中第一次执行时登录、加购并打开购物车，然后记录浏览器快照；
+        之后的测试直接恢复快照，不再重复这些步骤。
+        """
+        def setup():
+            logged_in_user = request.getfixturevalue("logged_in_user")
+            # 在一次脚本调用中添加多个商品到购物车
+            logged_in_user.add_products_to_cart([
+                "Sauce Labs Backpack",
+                "Sauce Labs Bike Light",
+                "Sauce Labs Bolt T-Shirt"
+            ])
+            
+            # 导航到购物车页面
+            logged_in_user.click_cart_icon()
+            cart_page.wait_for_page_load()
+        
+        restore_or_capture(request, driver, setup, verify=cart_page.is_cart_page)
         return cart_page
     
     @pytest.mark.smoke
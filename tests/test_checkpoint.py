@@ -0,0 +1,114 @@
+"""夹具快照测试用例 - 验证按夹具名称和参数缓存快照、一次脚本调用恢复和快照失效后重新准备"""
+
+import time
+from types import SimpleNamespace
+import pytest
+from config import Config
+from core import checkpoint
+from core.checkpoint import Checkpoint, restore_or_capture
+from tests.fakes import FakeDriver
+
+
+def fixture_request(name="cart_with_items", **kwargs):
+    """生成夹具的请求对象
+    
+    Args:
+        name: 夹具名称
+        kwargs: 参数化夹具的 param
+    
+    Returns:
+        SimpleNamespace: 带有 fixturename 和可选 param 的请求对象
+    """
+    return SimpleNamespace(fixturename=name, **kwargs)
+
+
+def cart_setup(driver, calls, cookie=None):
+    """生成登录并加购的准备步骤
+    
+    Args:
+        driver: 模拟的WebDriver
+        calls: 准备步骤的执行记录
+        cookie: 登录后写入的cookie
+    
+    Returns:
+        function: 准备步骤
+    """
+    def setup():
+        calls.append(driver.current_url)
+        driver.get("http://127.0.0.1/cart.html")
+        driver.cookies = [cookie or {"name": "session-username", "value": "standard_user"}]
+        driver.storage["local_storage"] = {"cart-contents": "[4,0,1]"}
+    return setup
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """每个测试使用空的快照缓存"""
+    checkpoint.clear_cache()
+    yield
+    checkpoint.clear_cache()
+
+
+class TestCheckpoint:
+    """夹具快照测试类"""
+    
+    def test_second_use_restores_without_setup(self):
+        """测试第二次使用夹具时直接恢复快照，不再执行准备步骤"""
+        calls = []
+        driver = FakeDriver()
+        assert restore_or_capture(fixture_request(), driver, cart_setup(driver, calls)) is False
+        
+        driver = FakeDriver()
+        assert restore_or_capture(fixture_request(), driver, cart_setup(driver, calls)) is True
+        assert len(calls) == 1
+        assert driver.current_url == "http://127.0.0.1/cart.html"
+        assert driver.cookies == [{"name": "session-username", "value": "standard_user"}]
+        assert driver.storage["local_storage"] == {"cart-contents": "[4,0,1]"}
+        # 打开同源地址后，cookies和存储在一次脚本调用中写入，再打开记录的地址
+        assert driver.commands == ["get", "w3cExecuteScript", "get"]
+    
+    def test_cache_keyed_by_fixture_and_param(self):
+        """测试不同夹具或不同参数各自记录快照"""
+        calls = []
+        for request in (fixture_request(), fixture_request(param="a"), fixture_request(param="b"),
+                        fixture_request("checkout_page"), fixture_request(param="a")):
+            driver = FakeDriver()
+            restore_or_capture(request, driver, cart_setup(driver, calls))
+        assert len(calls) == 4
+    
+    def test_failed_verify_reruns_setup(self):
+        """测试恢复后检查失败时重新执行准备步骤并更新快照"""
+        calls = []
+        driver = FakeDriver()
+        restore_or_capture(fixture_request(), driver, cart_setup(driver, calls))
+        assert restore_or_capture(fixture_request(), driver, cart_setup(driver, calls), verify=lambda: False) is False
+        assert len(calls) == 2
+        assert checkpoint.stats["captures"] >= 2
+    
+    def test_expired_cookie_reruns_setup(self):
+        """测试快照中的cookie过期后不再恢复"""
+        calls = []
+        driver = FakeDriver()
+        expired = {"name": "session-username", "value": "standard_user", "expiry": int(time.time()) - 1}
+        restore_or_capture(fixture_request(), driver, cart_setup(driver, calls, expired))
+        restore_or_capture(fixture_request(), driver, cart_setup(driver, calls, expired))
+        assert len(calls) == 2
+    
+    def test_http_only_cookie_uses_webdriver_commands(self):
+        """测试存在HttpOnly的cookie时通过WebDriver命令写入cookies"""
+        driver = FakeDriver()
+        snapshot = Checkpoint("http://127.0.0.1/cart.html", [{"name": "sid", "value": "1", "httpOnly": True}],
+                              {"cart-contents": "[4]"}, {})
+        driver.get("http://127.0.0.1/")
+        snapshot.restore(driver)
+        assert driver.commands[1:] == ["deleteAllCookies", "addCookie", "w3cExecuteScript", "get"]
+        assert driver.cookies == snapshot.cookies
+    
+    def test_disabled_always_runs_setup(self, monkeypatch):
+        """测试关闭夹具快照时每次都执行准备步骤"""
+        monkeypatch.setattr(Config, "CHECKPOINTS", False)
+        calls = []
+        driver = FakeDriver()
+        restore_or_capture(fixture_request(), driver, cart_setup(driver, calls))
+        restore_or_capture(fixture_request(), driver, cart_setup(driver, calls))
+        assert len(calls) == 2
@@ -0,0 +1,72 @@
+"""驱动工厂测试用例 - 验证启动配置生成的Chrome选项"""
+
+import pytest
+from core import DriverFactory, NetworkShaper, PROFILES
+from core.driver_factory import summarize_startups
+from core.profile_template import ProfileTemplate
+from tests.fakes import FakeDriver
+
+
+class TestDriverFactory:
+    """驱动工厂测试类"""
+    
+    def test_fast_profile_is_headless(self):
+        """测试快速配置使用新版无头模式并关闭后台功能"""
+        options = DriverFactory(resolver=object(), shaper=NetworkShaper()).build_options("fast")
+        for argument in ("--headless=new", "--disable-extensions", "--no-first-run",
+                         "--disable-background-networking", "--disable-component-update"):
+            assert argument in options.arguments
+    
+    def test_debug_profile_has_window(self):
+        """测试调试配置不使用无头模式"""
+        options = DriverFactory(resolver=object(), shaper=NetworkShaper()).build_options("debug")
+        assert not any(argument.startswith("--headless") for argument in options.arguments)
+        assert PROFILES["debug"]["driver_log"]
+    
+    def test_common_options_applied(self):
+        """测试所有配置共用的选项、性能日志和控制台日志"""
+        options = DriverFactory(resolver=object(), shaper=NetworkShaper(record_traffic=True)).build_options("fast")
+        capabilities = options.to_capabilities()
+        assert "--no-sandbox" in options.arguments
+        assert capabilities["goog:chromeOptions"]["prefs"]["credentials_enable_service"] is False
+        assert capabilities["goog:loggingPrefs"] == {"performance": "ALL", "browser": "ALL"}
+        
+        options = DriverFactory(resolver=object(), shaper=NetworkShaper()).build_options("fast")
+        assert options.to_capabilities()["goog:loggingPrefs"] == {"browser": "ALL"}
+    
+    def test_unknown_profile_rejected(self):
+        """测试不支持的启动配置"""
+        with pytest.raises(ValueError):
+            DriverFactory(resolver=object(), shaper=NetworkShaper()).build_options("turbo")
+    
+    def test_startup_stats_grouped_by_profile(self):
+        """测试按启动配置汇总启动耗时"""
+        factory = DriverFactory(resolver=object(), shaper=NetworkShaper())
+        factory.startups = [
+            {"profile": "fast", "elapsed": 0.5},
+            {"profile": "fast", "elapsed": 1.5},
+            {"profile": "debug", "elapsed": 2.0},
+            {"profile": "fast", "template": True, "elapsed": 0.25}
+        ]
+        stats = factory.startup_stats()
+        assert stats["fast"] == {"count": 2, "mean": 1.0, "min": 0.5, "max": 1.5}
+        assert stats["debug"]["count"] == 1
+        assert stats["fast+template"]["mean"] == 0.25
+        # 控制进程汇总多个worker的启动记录
+        merged = summarize_startups(factory.startups + [{"profile": "debug", "elapsed": 4.0}])
+        assert merged["debug"] == {"count": 2, "mean": 3.0, "min": 2.0, "max": 4.0}
+    
+    def test_failed_clone_starts_with_empty_profile(self, tmp_path, monkeypatch):
+        """测试模板副本创建失败时与模板生成失败一样从空配置启动"""
+        template = ProfileTemplate(str(tmp_path / "template"), str(tmp_path / "clones"), "http://127.0.0.1:8000")
+        factory = DriverFactory(resolver=object(), shaper=NetworkShaper(), profile_template=template)
+        launched = []
+        monkeypatch.setattr(factory, "_launch", lambda profile, path=None: launched.append(path) or FakeDriver())
+        
+        def missing_template(key):
+            raise FileNotFoundError(template.path(key))
+        
+        monkeypatch.setattr(template, "clone", missing_template)
+        factory.create("fast")
+        assert launched[-1] is None
+        assert factory.startups[-1]["template"] is False
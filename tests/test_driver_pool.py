@@ -0,0 +1,77 @@
+"""浏览器池测试用例 - 使用模拟的WebDriver验证复用、归还时重置和丢弃失败的浏览器"""
+
+from selenium.common.exceptions import WebDriverException
+from core.driver_pool import DriverPool
+from tests.fakes import FakeDriver
+
+
+def crashed(*args):
+    """模拟已崩溃的浏览器"""
+    raise WebDriverException("chrome not reachable")
+
+
+class TestDriverPool:
+    """浏览器池测试类"""
+    
+    def test_reset_restores_clean_state(self):
+        """测试重置关闭多余窗口、清除cookies和本地存储并回到空白页"""
+        driver = FakeDriver(url="http://127.0.0.1/inventory.html")
+        pool = DriverPool(lambda: driver)
+        assert pool.acquire() is driver
+        driver.window_handles.append("popup")
+        driver.switch_to.window("popup")
+        
+        assert pool.reset(driver) is True
+        assert driver.window_handles == ["main"]
+        assert driver.current_window_handle == "main"
+        # 本地存储在跳转空白页之前、在页面所属的源下清除
+        assert driver.commands.index("w3cExecuteScript") < driver.commands.index("get")
+        assert driver.cdp_commands == [("Network.clearBrowserCookies", {})]
+        assert driver.current_url == "about:blank"
+    
+    def test_cookies_cleared_without_cdp(self):
+        """测试CDP不可用时通过WebDriver命令清除cookies"""
+        driver = FakeDriver(responses={"Network.clearBrowserCookies": WebDriverException("not supported")})
+        driver.cookies = [{"name": "session-username", "value": "standard_user"}]
+        assert DriverPool(lambda: driver).reset(driver) is True
+        assert driver.cookies == []
+        assert "deleteAllCookies" in driver.commands
+    
+    def test_released_browser_reused(self):
+        """测试归还的浏览器被下一次获取复用，超过空闲上限的浏览器被关闭"""
+        pool = DriverPool(FakeDriver, max_idle=1)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        assert second.quit_called and not first.quit_called
+        assert pool.acquire() is first
+        assert (pool.created_count, pool.reused_count) == (2, 1)
+    
+    def test_release_discard_quits_without_reset(self):
+        """测试丢弃的浏览器不重置、直接关闭，下一次获取创建新的浏览器"""
+        pool = DriverPool(FakeDriver)
+        driver = pool.acquire()
+        pool.release(driver, discard=True)
+        assert driver.quit_called
+        assert "get" not in driver.commands
+        assert pool.acquire() is not driver
+        assert pool.created_count == 2
+    
+    def test_failed_reset_discards_browser(self):
+        """测试重置失败的浏览器被关闭而不是放回池中，关闭时的错误被忽略"""
+        pool = DriverPool(FakeDriver)
+        driver = pool.acquire()
+        driver.get = crashed
+        driver.quit = crashed
+        assert pool.reset(driver) is False
+        pool.release(driver)
+        assert pool.acquire() is not driver
+        assert pool.reused_count == 0
+    
+    def test_fresh_acquire_skips_idle(self):
+        """测试强制获取新浏览器时不使用空闲的浏览器"""
+        pool = DriverPool(FakeDriver)
+        driver = pool.acquire()
+        pool.release(driver)
+        assert pool.acquire(fresh=True) is not driver
+        assert pool.acquire() is driver
@@ -0,0 +1,104 @@
+"""驱动解析测试用例 - 验证解析顺序：预先提供的路径、进程内缓存、磁盘清单、在线下载，以及离线模式"""
+
+import json
+import os
+import pytest
+from core import driver_resolver, worker_stats
+from core.driver_resolver import DriverResolver
+
+
+@pytest.fixture(autouse=True)
+def isolated_resolver(monkeypatch):
+    """每个测试使用空的进程内缓存和固定的Chrome版本"""
+    monkeypatch.setattr(DriverResolver, "_process_cache", {})
+    monkeypatch.setattr(DriverResolver, "_detect_browser_version", lambda self: "120.0.6099.109")
+
+
+@pytest.fixture
+def downloads(tmp_path, monkeypatch):
+    """用假的 ChromeDriverManager 代替在线下载，返回下载记录"""
+    calls = []
+    path = tmp_path / "downloaded" / "chromedriver"
+    path.parent.mkdir()
+    path.write_text("")
+    
+    class FakeManager:
+        """假的驱动下载器"""
+        
+        def install(self):
+            """记录下载并返回驱动路径"""
+            calls.append(str(path))
+            return str(path)
+    
+    monkeypatch.setattr(driver_resolver, "ChromeDriverManager", FakeManager)
+    return calls
+
+
+class TestDriverResolver:
+    """驱动解析测试类"""
+    
+    def test_provided_path_skips_lookup(self, tmp_path, downloads):
+        """测试预先提供的驱动路径直接使用，不查清单也不下载"""
+        path = tmp_path / "chromedriver"
+        path.write_text("")
+        resolver = DriverResolver(driver_path=str(path), manifest_path=str(tmp_path / "manifest.json"))
+        assert resolver.resolve() == str(path)
+        assert resolver.last_resolution["source"] == "provided"
+        assert downloads == []
+        
+        with pytest.raises(FileNotFoundError, match="CHROMEDRIVER_PATH"):
+            DriverResolver(driver_path=str(tmp_path / "missing")).resolve()
+    
+    def test_download_once_then_cache_then_manifest(self, tmp_path, downloads):
+        """测试第一次下载并写入清单，同一进程使用进程内缓存，新进程使用清单"""
+        manifest_path = str(tmp_path / "cache" / "manifest.json")
+        first = DriverResolver(driver_path="", manifest_path=manifest_path, offline=False)
+        path = first.resolve()
+        assert first.last_resolution["source"] == "download"
+        with open(manifest_path, encoding="utf-8") as f:
+            assert json.load(f)["120.0.6099.109"]["path"] == path
+        
+        second = DriverResolver(driver_path="", manifest_path=manifest_path, offline=False)
+        assert second.resolve() == path
+        assert second.last_resolution["source"] == "process"
+        
+        # 新进程没有进程内缓存
+        DriverResolver._process_cache.clear()
+        third = DriverResolver(driver_path="", manifest_path=manifest_path, offline=False)
+        assert third.resolve() == path
+        assert third.last_resolution["source"] == "manifest"
+        assert len(downloads) == 1
+        assert [entry["source"] for entry in first.history] == ["download"]
+    
+    def test_offline_uses_manifest_and_never_downloads(self, tmp_path, downloads):
+        """测试离线模式下只使用清单中的驱动，找不到时报错而不下载"""
+        manifest_path = tmp_path / "manifest.json"
+        resolver = DriverResolver(driver_path="", manifest_path=str(manifest_path), offline=True)
+        with pytest.raises(FileNotFoundError, match="离线模式"):
+            resolver.resolve()
+        assert downloads == []
+        
+        driver = tmp_path / "chromedriver"
+        driver.write_text("")
+        manifest_path.write_text(json.dumps({"120.0.6099.109": {"path": str(driver)}}), encoding="utf-8")
+        assert resolver.resolve() == str(driver)
+        assert resolver.last_resolution["source"] == "manifest"
+    
+    def test_stale_manifest_entry_downloads_again(self, tmp_path, downloads):
+        """测试清单中的驱动文件已被删除时重新下载"""
+        manifest_path = tmp_path / "manifest.json"
+        manifest_path.write_text(json.dumps({"120.0.6099.109": {"path": str(tmp_path / "gone")}}), encoding="utf-8")
+        resolver = DriverResolver(driver_path="", manifest_path=str(manifest_path), offline=False)
+        resolver.resolve()
+        assert resolver.last_resolution["source"] == "download"
+        assert len(downloads) == 1
+    
+    def test_history_collected_from_every_process(self, tmp_path, monkeypatch):
+        """测试每个进程写入的解析记录都能被控制进程读取，没有记录的进程不写入"""
+        directory = str(tmp_path / "stats")
+        for pid, history in [(101, [{"path": "/a", "source": "manifest", "elapsed": 0.01}]), (102, [])]:
+            monkeypatch.setattr(os, "getpid", lambda pid=pid: pid)
+            worker_stats.write("resolver", history, directory)
+        assert worker_stats.load("resolver", directory) == [[{"path": "/a", "source": "manifest", "elapsed": 0.01}]]
+        worker_stats.clear(directory)
+        assert worker_stats.load("resolver", directory) == []
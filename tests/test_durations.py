@@ -0,0 +1,277 @@
+"""测试耗时记录测试用例 - 验证耗时数据库、耗时估算和快速反馈排序"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+from types import SimpleNamespace
+import pytest
+from config import Config
+from core.durations import DurationStore, trend
+from core.parallel import DurationScheduling, quick_feedback_order, split_group
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeItem:
+    """只提供节点ID和标记的假测试项"""
+    
+    def __init__(self, nodeid, smoke=False):
+        self.nodeid = nodeid
+        self.smoke = smoke
+    
+    def get_closest_marker(self, name):
+        return object() if name == "smoke" and self.smoke else None
+
+
+class FakeConfig:
+    """只提供调度器读取的选项的假pytest配置"""
+    
+    def __init__(self, workers, quick_feedback=False):
+        self.options = {"tx": [f"{workers}*popen"], "maxschedchunk": None, "quick_feedback": quick_feedback}
+        self.collect_reports = []
+        self.hook = SimpleNamespace(pytest_collectreport=lambda report: self.collect_reports.append(report))
+    
+    def getoption(self, name):
+        return self.options[name]
+    
+    getvalue = getoption
+
+
+class FakeNode:
+    """记录收到的测试批次和关闭信号的假worker"""
+    
+    def __init__(self, name):
+        self.gateway = SimpleNamespace(id=name)
+        self.batches = []
+        self.shutting_down = False
+    
+    def send_runtest_some(self, indices):
+        self.batches.append(list(indices))
+    
+    def shutdown(self):
+        self.shutting_down = True
+    
+    @property
+    def sent(self):
+        return [index for batch in self.batches for index in batch]
+
+
+def scheduler(collections, durations, quick_feedback=False):
+    """创建调度器并让每个假worker完成收集
+    
+    Args:
+        collections: 每个worker收集到的测试节点ID列表
+        durations: 测试节点ID到历史耗时的映射
+        quick_feedback: 是否使用 --quick-feedback
+    
+    Returns:
+        tuple: (调度器, 假worker列表)
+    """
+    sched = DurationScheduling(FakeConfig(len(collections), quick_feedback), durations=durations)
+    nodes = [FakeNode(f"gw{index}") for index in range(len(collections))]
+    for node, collection in zip(nodes, collections):
+        sched.add_node(node)
+        sched.add_node_collection(node, collection)
+    return sched, nodes
+
+
+@pytest.fixture
+def store(tmp_path):
+    """使用临时数据库的耗时存储"""
+    return DurationStore(str(tmp_path / "durations.sqlite"))
+
+
+def record_run(store, results):
+    """记录一次运行
+    
+    Args:
+        store: 耗时存储
+        results: 测试节点ID到 (耗时, 结果) 的映射
+    """
+    store.run_id = None
+    for nodeid, (duration, outcome) in results.items():
+        store.record(nodeid, "setup", 0.0, "passed")
+        store.record(nodeid, "call", duration, outcome)
+    store.save()
+    store.finish_run()
+
+
+class TestDurations:
+    """测试耗时记录测试类"""
+    
+    def test_history_is_append_only(self, store):
+        """测试每次运行追加记录，耗时估算取最近通过运行的中位数"""
+        for duration in (1.0, 3.0, 2.0):
+            record_run(store, {"test_a": (duration, "passed"), "test_b": (0.5, "passed")})
+        record_run(store, {"test_a": (9.0, "failed")})
+        
+        assert store.load() == {"test_a": 2.0, "test_b": 0.5}
+        history = store.history("test_a")
+        assert [record[1] for record in history["test_a"]] == [1.0, 3.0, 2.0, 9.0]
+    
+    def test_recent_failures(self, store):
+        """测试只返回最近几次运行中失败过的测试"""
+        record_run(store, {"test_old": (1.0, "failed"), "test_new": (1.0, "passed")})
+        record_run(store, {"test_old": (1.0, "passed"), "test_new": (1.0, "failed")})
+        assert store.recent_failures(runs=1) == {"test_new"}
+        assert store.recent_failures(runs=2) == {"test_old", "test_new"}
+    
+    def test_setup_failure_marks_test_failed(self, store):
+        """测试任一阶段失败时整个测试记为失败"""
+        store.record("test_a", "setup", 0.2, "failed")
+        store.record("test_a", "teardown", 0.1, "passed")
+        store.save()
+        assert store.recent_failures() == {"test_a"}
+    
+    def test_retried_test_records_final_attempt(self, store):
+        """测试重试后通过的测试记为通过，只保存最后一次尝试的耗时，并记录尝试次数"""
+        for call, outcome in ((5.0, "failed"), (1.0, "passed")):
+            store.record("test_flaky", "setup", 0.2, "passed")
+            store.record("test_flaky", "call", call, outcome)
+            store.record("test_flaky", "teardown", 0.1, "passed")
+        store.save()
+        assert store.recent_failures() == set()
+        assert store.load() == {"test_flaky": pytest.approx(1.3)}
+        assert store._query("SELECT attempts FROM results WHERE nodeid = 'test_flaky'") == [(2,)]
+    
+    def test_migrates_results_without_attempts(self, store):
+        """测试旧版数据库补上 attempts 列后可以继续写入"""
+        connection = sqlite3.connect(store.path)
+        connection.executescript(
+            "CREATE TABLE results (run_id INTEGER NOT NULL, nodeid TEXT NOT NULL, setup REAL NOT NULL DEFAULT 0, "
+            "call REAL NOT NULL DEFAULT 0, teardown REAL NOT NULL DEFAULT 0, duration REAL NOT NULL, "
+            "outcome TEXT NOT NULL, recorded REAL NOT NULL);"
+            "INSERT INTO results VALUES (1, 'test_old', 0, 1, 0, 1, 'passed', 0);"
+        )
+        connection.close()
+        record_run(store, {"test_new": (2.0, "passed")})
+        assert sorted(store._query("SELECT nodeid, attempts FROM results")) == [("test_new", 1), ("test_old", 1)]
+    
+    def test_trend_compares_halves(self):
+        """测试趋势比较前后两半运行的耗时中位数"""
+        records = [(run, duration, "passed") for run, duration in enumerate([1.0, 1.0, 2.0, 2.0], 1)]
+        summary = trend(records + [(5, 0.1, "failed")])
+        assert summary["runs"] == 5
+        assert summary["failures"] == 1
+        assert summary["change"] == pytest.approx(1.0)
+    
+    def test_imports_legacy_json(self, store, tmp_path):
+        """测试首次创建数据库时导入数据库所在目录中的旧版JSON耗时记录，而不是默认报告目录中的"""
+        assert store.legacy_path == str(tmp_path / "durations.json")
+        assert DurationStore().legacy_path == Config.DURATIONS_FILE
+        with open(store.legacy_path, "w", encoding="utf-8") as f:
+            json.dump({"test_a": 4.0}, f)
+        assert store.load() == {}
+        store.connect().close()
+        assert store.load() == {"test_a": 4.0}
+    
+    def test_quick_feedback_order(self):
+        """测试快速反馈顺序：最近失败的测试、冒烟测试、其余测试，组内耗时短的先运行"""
+        items = [
+            FakeItem("test_slow"),
+            FakeItem("test_fast"),
+            FakeItem("test_smoke_slow", smoke=True),
+            FakeItem("test_smoke_fast", smoke=True),
+            FakeItem("test_failed")
+        ]
+        durations = {"test_slow": 9.0, "test_fast": 1.0, "test_smoke_slow": 5.0, "test_smoke_fast": 2.0,
+                     "test_failed": 8.0}
+        ordered = quick_feedback_order(items, durations, {"test_failed"})
+        assert [item.nodeid for item in ordered] == \
+            ["test_failed", "test_smoke_fast", "test_smoke_slow", "test_fast", "test_slow"]
+    
+    def test_scheduler_dispatches_longest_first(self):
+        """测试按历史耗时从长到短轮流分发，没有记录的测试按已知耗时的中位数估算，之后每次补充一个"""
+        collection = ["test_a", "test_b", "test_c", "test_new", "test_e", "test_f"]
+        durations = {"test_a": 1.0, "test_b": 5.0, "test_c": 3.0, "test_e": 0.5, "test_f": 4.0}
+        sched, (first, second) = scheduler([collection] * 2, durations)
+        sched.schedule()
+        # 耗时顺序 b(5)、f(4)、c(3)、new(中位数3)、a(1)、e(0.5)，每个worker先拿两个，每批一个测试
+        assert [collection[index] for index in first.sent] == ["test_b", "test_c"]
+        assert [collection[index] for index in second.sent] == ["test_f", "test_new"]
+        assert all(len(batch) == 1 for node in (first, second) for batch in node.batches)
+        
+        sched.mark_test_complete(second, collection.index("test_f"), duration=4.0)
+        assert collection[second.sent[-1]] == "test_a"
+        sched.mark_test_complete(first, collection.index("test_b"), duration=5.0)
+        assert collection[first.sent[-1]] == "test_e"
+        assert sched.pending == []
+        
+        sched.mark_test_complete(first, collection.index("test_c"))
+        assert first.shutting_down and not second.shutting_down
+    
+    def test_scheduler_sends_everything_when_few_tests(self):
+        """测试测试数量少于每个worker两个时全部分发，并向所有worker发出关闭信号"""
+        collection = ["test_a", "test_b", "test_c"]
+        sched, nodes = scheduler([collection] * 2, {"test_a": 1.0, "test_b": 0.5, "test_c": 2.0})
+        sched.schedule()
+        assert sorted(index for node in nodes for index in node.sent) == [0, 1, 2]
+        assert nodes[0].sent[0] == collection.index("test_c")
+        assert all(node.shutting_down for node in nodes)
+    
+    def test_scheduler_keeps_quick_feedback_order(self):
+        """测试使用 --quick-feedback 时保持worker收集时排好的顺序"""
+        collection = ["test_failed", "test_smoke", "test_slow"]
+        sched, nodes = scheduler([collection], {"test_slow": 9.0}, quick_feedback=True)
+        sched.schedule()
+        assert nodes[0].sent == [0, 1]
+        assert sched.pending == [2]
+    
+    def test_scheduler_aborts_on_different_collections(self):
+        """测试worker收集到的测试不同时不分发任何测试，并报告收集错误"""
+        sched, nodes = scheduler([["test_a", "test_b"], ["test_a", "test_c"]], {})
+        sched.schedule()
+        assert all(node.batches == [] for node in nodes)
+        assert [report.nodeid for report in sched.config.collect_reports] == ["gw1"]
+    
+    def test_split_group(self):
+        """测试只拆分worker追加的分组后缀，参数中的 @ 不是分组"""
+        assert split_group("tests/test_a.py::test_b[x]@scenarios") == ("tests/test_a.py::test_b[x]", "scenarios")
+        assert split_group("tests/test_a.py::test_b[user@host]") == ("tests/test_a.py::test_b[user@host]", None)
+        assert split_group("tests/test_a.py::test_b") == ("tests/test_a.py::test_b", None)
+    
+    def test_scheduler_keeps_group_on_one_worker(self):
+        """测试同组的测试按收集顺序一起发送给一个worker，耗时按去掉分组后缀的节点ID查找"""
+        collection = ["test_a", "test_s[1]@scenarios", "test_s[2]@scenarios", "test_s[3]@scenarios", "test_b", "test_c"]
+        durations = {"test_a": 1.0, "test_s[2]": 9.0, "test_b": 2.0, "test_c": 0.5}
+        sched, (first, second) = scheduler([collection] * 2, durations)
+        sched.schedule()
+        assert first.batches[0] == [1, 2, 3]
+        # 分组之后按耗时 b(2)、a(1)、c(0.5) 轮流分发
+        assert [collection[index] for index in second.sent] == ["test_b", "test_c"]
+        assert [collection[index] for index in first.sent[3:]] == ["test_a"]
+        assert sched.pending == []
+    
+    def test_grouped_scenarios_run_once_in_parallel(self, tmp_path):
+        """测试 -n 2 并行运行时带 xdist_group 标记的模块级夹具只执行一次"""
+        (tmp_path / "test_grouped.py").write_text(textwrap.dedent("""
+            import pytest
+            
+            pytestmark = pytest.mark.xdist_group("scenarios")
+            
+            @pytest.fixture(scope="module")
+            def tree(tmp_path_factory):
+                with open("tree_runs.txt", "a") as f:
+                    f.write("run\\n")
+                return True
+            
+            @pytest.mark.parametrize("name", range(6))
+            def test_scenario(tree, name):
+                assert tree
+        """), encoding="utf-8")
+        (tmp_path / "test_other.py").write_text(textwrap.dedent("""
+            import pytest
+            
+            @pytest.mark.parametrize("name", range(6))
+            def test_other(name):
+                pass
+        """), encoding="utf-8")
+        result = subprocess.run(
+            [sys.executable, "-m", "pytest", "-p", "core.parallel", "-p", "no:cacheprovider", "-q", "-n", "2"],
+            cwd=tmp_path, capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+        )
+        assert "12 passed" in result.stdout, result.stdout
+        assert (tmp_path / "tree_runs.txt").read_text().splitlines() == ["run"]
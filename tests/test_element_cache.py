@@ -0,0 +1,47 @@
+"""元素缓存测试用例 - 使用模拟的WebDriver验证缓存命中、导航失效和过期重查"""
+
+import pytest
+from pages import ProductsPage
+from tests.fakes import FakeDriver
+
+
+@pytest.fixture
+def fake_page():
+    """使用模拟WebDriver的产品页面"""
+    return ProductsPage(FakeDriver())
+
+
+class TestElementCache:
+    """元素缓存测试类"""
+    
+    def test_static_element_looked_up_once(self, fake_page):
+        """测试静态元素只查找一次"""
+        fake_page.click_cart_icon()
+        fake_page.click_cart_icon()
+        assert len(fake_page.driver.elements) == 1
+        assert len(fake_page.driver.clicked) == 2
+        assert fake_page.cache_stats == {"hits": 1, "misses": 1, "stale": 0}
+    
+    def test_uncacheable_element_looked_up_every_time(self, fake_page):
+        """测试不在 CACHEABLE 中的元素每次都重新查找"""
+        fake_page.add_backpack_to_cart()
+        fake_page.add_backpack_to_cart()
+        assert len(fake_page.driver.elements) == 2
+        assert fake_page.cache_stats["hits"] == 0
+    
+    def test_stale_element_looked_up_again(self, fake_page):
+        """测试缓存的元素过期时透明地重新查找一次"""
+        fake_page.click_cart_icon()
+        fake_page.driver.elements[-1].stale = True
+        fake_page.click_cart_icon()
+        assert len(fake_page.driver.elements) == 2
+        assert len(fake_page.driver.clicked) == 2
+        assert fake_page.cache_stats["stale"] == 1
+    
+    def test_navigation_invalidates_cache(self, fake_page):
+        """测试导航后缓存失效"""
+        fake_page.click_cart_icon()
+        fake_page.driver.execute("get", {"url": "about:blank"})
+        fake_page.click_cart_icon()
+        assert len(fake_page.driver.elements) == 2
+        assert fake_page.cache_stats == {"hits": 0, "misses": 2, "stale": 0}
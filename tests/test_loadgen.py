@@ -0,0 +1,122 @@
+"""负载生成测试用例 - 使用假浏览器和假步骤验证并发调度、直方图和错误统计"""
+
+import pytest
+from core.loadgen import STEPS, LatencyHistogram, LoadRunner, Shopper, parse_step
+from core.metrics import get_recorder
+from pages import scripts
+from tests.fakes import FakeDriver
+
+
+class TestLoadgen:
+    """负载生成测试类"""
+    
+    def test_parse_step(self):
+        """测试拆分步骤名称和参数"""
+        assert parse_step("add_to_cart:Sauce Labs Backpack") == ("add_to_cart", "Sauce Labs Backpack")
+        assert parse_step("view_cart") == ("view_cart", None)
+    
+    def test_histogram_buckets_and_errors(self):
+        """测试直方图按桶计数，错误不计入延迟样本"""
+        histogram = LatencyHistogram(buckets=[100, 500])
+        for elapsed in (0.05, 0.2, 0.3, 0.9):
+            histogram.record(elapsed)
+        histogram.record(1.0, error=True)
+        summary = histogram.summary()
+        assert summary["histogram"] == {"<=100ms": 1, "<=500ms": 2, ">500ms": 1}
+        assert summary["count"] == 5
+        assert summary["error_rate"] == pytest.approx(0.2)
+        assert summary["p50"] == pytest.approx(250)
+    
+    def test_unknown_step_rejected(self):
+        """测试旅程中包含未注册的步骤时立即报错"""
+        with pytest.raises(ValueError, match="未知的旅程步骤"):
+            LoadRunner(journeys=[{"name": "bad", "steps": ["fly"]}], iterations=1,
+                       create_driver=FakeDriver)
+    
+    def test_run_reuses_one_browser_per_user(self):
+        """测试每个用户完成指定次数的旅程，并在旅程之间复用浏览器"""
+        calls = []
+        steps = {
+            "login": lambda shopper, argument: calls.append(("login", argument)),
+            "add_to_cart": lambda shopper, name: calls.append(("add_to_cart", name))
+        }
+        journeys = [{"name": "buyer", "steps": ["login", "add_to_cart:Sauce Labs Backpack"]}]
+        runner = LoadRunner(journeys=journeys, users=3, iterations=2, create_driver=FakeDriver, steps=steps)
+        report = runner.run()
+        
+        assert report["journeys_completed"] == 6
+        assert report["journeys_failed"] == 0
+        assert report["peak_users"] >= 1
+        assert report["browsers_created"] <= 3
+        assert report["steps"]["add_to_cart:Sauce Labs Backpack"]["count"] == 6
+        assert calls.count(("add_to_cart", "Sauce Labs Backpack")) == 6
+        assert report["throughput"] > 0
+    
+    def test_failed_step_aborts_journey_and_discards_browser(self):
+        """测试步骤失败时放弃旅程、记录错误并丢弃浏览器"""
+        def fail(shopper, argument):
+            raise RuntimeError("boom")
+        
+        steps = {"login": lambda shopper, argument: None, "checkout": fail, "logout": lambda shopper, argument: None}
+        journeys = [{"name": "buyer", "steps": ["login", "checkout", "logout"]}]
+        runner = LoadRunner(journeys=journeys, users=2, iterations=2, create_driver=FakeDriver, steps=steps)
+        report = runner.run()
+        
+        assert report["journeys_failed"] == 4
+        assert report["error_rate"] == 1.0
+        assert report["errors"] == {"checkout: RuntimeError": 4}
+        assert report["steps"]["checkout"]["error_rate"] == 1.0
+        assert "logout" not in report["steps"]
+        assert report["browsers_created"] == 4
+    
+    def test_browser_startup_failure_recorded_as_journey_error(self):
+        """测试浏览器启动失败记为旅程错误，不中断运行，结束时关闭所有浏览器"""
+        drivers = []
+        
+        def create_driver():
+            if len(drivers) == 1:
+                drivers.append(None)
+                raise RuntimeError("session not created")
+            driver = FakeDriver()
+            drivers.append(driver)
+            return driver
+        
+        def login(shopper, argument):
+            # 第一次旅程失败并丢弃浏览器，下一次旅程需要启动新的浏览器
+            if len(drivers) == 1:
+                raise RuntimeError("boom")
+        
+        runner = LoadRunner(journeys=[{"name": "buyer", "steps": ["login"]}], users=1, iterations=3,
+                            create_driver=create_driver, steps={"login": login})
+        report = runner.run()
+        
+        assert report["journeys_completed"] == 1
+        assert report["journeys_failed"] == 2
+        assert report["errors"] == {"login: RuntimeError": 1, "acquire: RuntimeError": 1}
+        assert len(drivers) == 3
+        assert drivers[0].quit_called and drivers[2].quit_called
+    
+    def test_duration_requires_stop_condition(self):
+        """测试必须指定运行时长或旅程次数"""
+        with pytest.raises(ValueError):
+            LoadRunner(create_driver=FakeDriver)
+    
+    def test_journeys_keep_metrics_off_the_shared_recorder(self):
+        """测试每次旅程使用自己的指标收集器，不重置进程共享的收集器"""
+        get_recorder().reset("current-test")
+        recorders = []
+        steps = {"login": lambda shopper, argument: recorders.append(shopper.products_page.recorder)}
+        runner = LoadRunner(journeys=[{"name": "buyer", "steps": ["login"]}], users=2, iterations=2,
+                            create_driver=FakeDriver, steps=steps)
+        runner.run()
+        assert len({id(recorder) for recorder in recorders}) == 4
+        assert get_recorder() not in recorders
+        assert get_recorder().test_id == "current-test"
+    
+    def test_checkout_waits_for_checkout_form(self):
+        """测试结账步骤通过页面对象等待结账信息表单出现"""
+        driver = FakeDriver()
+        STEPS["checkout"](Shopper(driver), None)
+        assert driver.clicked == ["checkout"]
+        spec, _ = driver.script_calls(scripts.WAIT_FOR_READY)[-1]
+        assert spec["value"] == "[data-test='firstName']"
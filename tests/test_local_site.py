@@ -0,0 +1,128 @@
+"""本地替身站点测试用例 - 验证页面结构与页面对象的定位器一致"""
+
+import re
+import time
+import urllib.error
+import urllib.request
+import pytest
+from config import Config
+from core.local_site import PRODUCTS, for_target, product_slug
+from pages import LoginPage, ProductsPage, CartPage
+
+
+def fetch(url):
+    """获取页面内容
+    
+    Args:
+        url: 页面地址
+        
+    Returns:
+        str: 页面HTML
+    """
+    with urllib.request.urlopen(url) as response:
+        return response.read().decode("utf-8")
+
+
+def locator_attribute(locator):
+    """把页面对象的定位器转换成HTML中的属性片段
+    
+    Args:
+        locator: 元素定位器 (By, value)
+        
+    Returns:
+        str: 例如 id="user-name" 或 data-test="title"
+    """
+    by, value = locator
+    if by == "id":
+        return f'id="{value}"'
+    match = re.fullmatch(r"\[data-test='([^']+)'\]", value)
+    assert match, f"不支持的定位器: {locator}"
+    return f'data-test="{match.group(1)}"'
+
+
+class TestLocalSite:
+    """本地替身站点测试类"""
+    
+    def test_login_page_matches_locators(self, local_site):
+        """测试登录页面包含LoginPage使用的元素"""
+        page = fetch(local_site.base_url + "/")
+        for locator in (LoginPage.USERNAME_INPUT, LoginPage.PASSWORD_INPUT, LoginPage.LOGIN_BUTTON):
+            assert locator_attribute(locator) in page, f"登录页面缺少元素: {locator}"
+    
+    def test_inventory_page_matches_locators(self, local_site):
+        """测试商品页面包含ProductsPage使用的元素"""
+        page = fetch(local_site.base_url + "/inventory.html")
+        for locator in (ProductsPage.PAGE_TITLE, ProductsPage.MENU_BUTTON, ProductsPage.LOGOUT_LINK,
+                        ProductsPage.CART_ICON, ProductsPage.SORT_DROPDOWN,
+                        ProductsPage.ADD_BACKPACK_BUTTON, ProductsPage.ADD_BIKE_LIGHT_BUTTON,
+                        ProductsPage.ADD_BOLT_TSHIRT_BUTTON):
+            assert locator_attribute(locator) in page, f"商品页面缺少元素: {locator}"
+        assert page.count('data-test="inventory-item"') == len(PRODUCTS), "商品数量不正确"
+    
+    def test_cart_page_matches_locators(self, local_site):
+        """测试购物车页面包含CartPage使用的元素"""
+        page = fetch(local_site.base_url + "/cart.html")
+        for locator in (CartPage.PAGE_TITLE, CartPage.CONTINUE_SHOPPING_BUTTON, CartPage.CHECKOUT_BUTTON):
+            assert locator_attribute(locator) in page, f"购物车页面缺少元素: {locator}"
+        assert 'class="cart_list"' in page, "购物车页面缺少商品列表"
+    
+    @pytest.mark.parametrize("option,key,reverse", [
+        ("az", "name", False),
+        ("za", "name", True),
+        ("lohi", "price", False),
+        ("hilo", "price", True)
+    ])
+    def test_inventory_sort(self, local_site, option, key, reverse):
+        """参数化测试商品页面的服务端排序"""
+        page = fetch(f"{local_site.base_url}/inventory.html?sort={option}")
+        names = re.findall(r'data-test="inventory-item-name">([^<]*)<', page)
+        expected = sorted(PRODUCTS, key=lambda product: product[key], reverse=reverse)
+        assert [product["price"] for product in expected] == \
+            [float(price.lstrip("$")) for price in re.findall(r'data-test="inventory-item-price">([^<]*)<', page)]
+        if key == "name":
+            assert names == [product["name"] for product in expected], f"{option} 排序结果不正确"
+    
+    def test_product_button_ids(self, local_site):
+        """测试商品按钮id与线上站点的生成规则一致"""
+        page = fetch(local_site.base_url + "/inventory.html")
+        for product in PRODUCTS:
+            assert f'id="add-to-cart-{product_slug(product["name"])}"' in page
+        assert product_slug("Test.allTheThings() T-Shirt (Red)") == "test.allthethings()-t-shirt-(red)"
+    
+    def test_injected_latency(self, local_site):
+        """测试注入的响应延迟"""
+        original = local_site.latency_ms
+        local_site.latency_ms = 200
+        try:
+            start_time = time.perf_counter()
+            fetch(local_site.base_url + "/static/style.css")
+            assert time.perf_counter() - start_time >= 0.2, "响应延迟没有生效"
+        finally:
+            local_site.latency_ms = original
+    
+    def test_unknown_path_returns_404(self, local_site):
+        """测试未知路径返回404"""
+        with pytest.raises(urllib.error.HTTPError) as error:
+            fetch(local_site.base_url + "/missing.html")
+        assert error.value.code == 404
+    
+    def test_for_target_points_base_url_at_local_site(self, monkeypatch):
+        """测试目标为本地站点时启动站点并替换测试网站URL，退出后停止站点并恢复URL"""
+        monkeypatch.setattr(Config, "TARGET_SITE", "local")
+        monkeypatch.setattr(Config, "BASE_URL", "https://www.saucedemo.com")
+        with for_target() as site:
+            assert Config.BASE_URL == site.base_url
+            assert 'data-test="login-button"' in fetch(site.base_url + "/")
+        assert Config.BASE_URL == "https://www.saucedemo.com"
+        with pytest.raises(urllib.error.URLError):
+            fetch(site.base_url + "/")
+    
+    def test_for_target_skips_remote_target(self, monkeypatch):
+        """测试目标为线上站点时不启动本地站点，需要时可以只启动站点而不替换URL"""
+        monkeypatch.setattr(Config, "TARGET_SITE", "remote")
+        monkeypatch.setattr(Config, "BASE_URL", "https://www.saucedemo.com")
+        with for_target() as site:
+            assert site is None
+        with for_target(always=True) as site:
+            assert site is not None
+            assert Config.BASE_URL == "https://www.saucedemo.com"
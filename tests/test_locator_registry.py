@@ -0,0 +1,116 @@
+"""商品定位器索引测试用例 - 验证按实际按钮id建立索引、按页面加载缓存和不存在的商品立即报错"""
+
+import asyncio
+import time
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from config import Config
+from pages import scripts, ProductsPage, CartPage
+from pages.aio import AsyncCartPage, AsyncProductsPage
+from pages.locator_registry import ItemIndex, item_slug
+from tests.fakes import GRID, FakeDriver
+
+
+def reads(driver):
+    """返回读取商品列表的次数
+    
+    Args:
+        driver: 模拟的WebDriver
+    
+    Returns:
+        int: 读取次数
+    """
+    return len(driver.script_calls(scripts.READ_ELEMENTS))
+
+
+class TestLocatorRegistry:
+    """商品定位器索引测试类"""
+    
+    def test_index_uses_rendered_button_ids(self):
+        """测试索引使用页面上的按钮id，名称含标点的商品也能按名称或标识查到"""
+        index = ItemIndex(GRID)
+        entry = index.lookup("Test.allTheThings() T-Shirt (Red)")
+        assert entry["add_id"] == "add-to-cart-test.allthethings()-t-shirt-(red)"
+        assert entry["remove_id"] == "remove-test.allthethings()-t-shirt-(red)"
+        assert entry["position"] == 2 and entry["price"] == "$15.99"
+        assert index.lookup("sauce-labs-backpack")["name"] == "Sauce Labs Backpack"
+        assert item_slug("checkout") is None
+    
+    def test_grid_read_once_per_page_load(self):
+        """测试同一次页面访问内多次查找只读取一次商品列表，导航后重新读取"""
+        driver = FakeDriver(records=GRID)
+        page = ProductsPage(driver)
+        page.add_product_to_cart_by_name("Test.allTheThings() T-Shirt (Red)")
+        page.remove_product_from_cart_by_name("Test.allTheThings() T-Shirt (Red)")
+        page.add_product_to_cart_by_name("sauce-labs-backpack")
+        assert reads(driver) == 1
+        assert driver.clicked == [
+            "add-to-cart-test.allthethings()-t-shirt-(red)",
+            "remove-test.allthethings()-t-shirt-(red)",
+            "add-to-cart-sauce-labs-backpack"
+        ]
+        
+        page.driver.execute("get", {"url": "http://127.0.0.1/inventory.html"})
+        page.add_product_to_cart_by_name("Sauce Labs Backpack")
+        assert reads(driver) == 2
+    
+    def test_unknown_product_fails_immediately(self):
+        """测试不存在的商品重新读取一次后立即报错，列出现有商品，不等待显式等待超时"""
+        driver = FakeDriver(records=GRID)
+        page = ProductsPage(driver)
+        start_time = time.perf_counter()
+        with pytest.raises(NoSuchElementException, match="Sauce Labs Backpack"):
+            page.add_product_to_cart_by_name("Sauce Labs Fleece Jacket")
+        assert time.perf_counter() - start_time < 1
+        assert reads(driver) == 1
+        assert not page.is_product_added_to_cart("Sauce Labs Fleece Jacket")
+    
+    def test_cached_miss_rereads_once(self):
+        """测试缓存的索引中没有的商品重新读取一次，应对点击造成的页面跳转"""
+        driver = FakeDriver(records=GRID[:1])
+        page = ProductsPage(driver)
+        page.add_product_to_cart_by_name("Sauce Labs Backpack")
+        driver.records = GRID
+        page.add_product_to_cart_by_name("Test.allTheThings() T-Shirt (Red)")
+        assert reads(driver) == 2
+    
+    def test_cart_remove_invalidates_index(self):
+        """测试购物车移除商品后索引失效"""
+        driver = FakeDriver(records=[dict(GRID[0], button_id="remove-sauce-labs-backpack")])
+        page = CartPage(driver)
+        page.remove_item_by_name("Sauce Labs Backpack")
+        assert driver.clicked == ["remove-sauce-labs-backpack"]
+        assert page.locators.lookup("Sauce Labs Backpack")["position"] == 0
+        assert reads(driver) == 2
+    
+    def test_missing_ready_condition_fails_fast(self, monkeypatch):
+        """测试页面就绪条件不满足时只短暂确认，不读取商品列表，立即报告商品不存在"""
+        monkeypatch.setattr(Config, "READY_PROBE_TIMEOUT", 0.1)
+        driver = FakeDriver(responses={scripts.WAIT_FOR_READY: {"ready": False, "navigation": None}}, records=GRID)
+        page = ProductsPage(driver)
+        start_time = time.perf_counter()
+        with pytest.raises(NoSuchElementException, match="Sauce Labs Backpack"):
+            page.add_product_to_cart_by_name("Sauce Labs Backpack")
+        assert time.perf_counter() - start_time < 1
+        assert reads(driver) == 0
+    
+    def test_async_pages_use_rendered_button_ids(self):
+        """测试异步页面对象同样按页面上的按钮id加购和移除"""
+        name = "Test.allTheThings() T-Shirt (Red)"
+        driver = FakeDriver(records=GRID, visible=[
+            "add-to-cart-test.allthethings()-t-shirt-(red)", "remove-test.allthethings()-t-shirt-(red)"
+        ])
+        
+        async def scenario():
+            page = AsyncProductsPage(driver)
+            await page.add_product_to_cart_by_name(name)
+            await page.remove_product_from_cart_by_name(name)
+            await AsyncCartPage(driver).remove_item_by_name(name)
+        
+        asyncio.run(scenario())
+        assert driver.clicked == [
+            "add-to-cart-test.allthethings()-t-shirt-(red)",
+            "remove-test.allthethings()-t-shirt-(red)",
+            "remove-test.allthethings()-t-shirt-(red)"
+        ]
+        assert reads(driver) == 2
@@ -0,0 +1,76 @@
+"""网络整形测试用例 - 验证拦截规则和性能日志统计"""
+
+import json
+import pytest
+from selenium.webdriver.chrome.options import Options
+from core import NetworkShaper, RESOURCE_TYPE_PATTERNS
+from tests.fakes import FakeDriver
+
+
+def performance_log(events):
+    """生成性能日志条目
+    
+    Args:
+        events: (method, params) 列表
+    
+    Returns:
+        list: 性能日志条目
+    """
+    return [{"message": json.dumps({"message": {"method": method, "params": params}})} for method, params in events]
+
+
+class TestNetworkShaper:
+    """网络整形测试类"""
+    
+    def test_resource_types_expand_to_patterns(self):
+        """测试资源类型展开为URL模式并下发给浏览器"""
+        shaper = NetworkShaper(["*tracking*"], ["font"])
+        driver = FakeDriver()
+        shaper.apply(driver)
+        assert driver.cdp_commands[0] == ("Network.enable", {})
+        assert driver.cdp_commands[1] == (
+            "Network.setBlockedURLs", {"urls": ["*tracking*"] + RESOURCE_TYPE_PATTERNS["font"]}
+        )
+    
+    def test_no_rules_only_enables_network(self):
+        """测试没有拦截规则时不下发拦截命令"""
+        driver = FakeDriver()
+        NetworkShaper().apply(driver)
+        assert driver.cdp_commands == [("Network.enable", {})]
+    
+    def test_unknown_resource_type_rejected(self):
+        """测试不支持的资源类型"""
+        with pytest.raises(ValueError):
+            NetworkShaper(block_types=["video"])
+    
+    def test_options_enable_performance_log_and_cache(self):
+        """测试统计流量时浏览器选项开启性能日志和磁盘缓存"""
+        options = Options()
+        NetworkShaper(cache_dir="/tmp/cache", record_traffic=True).configure_options(options)
+        assert options.to_capabilities()["goog:loggingPrefs"] == {"performance": "ALL"}
+        assert "--disk-cache-dir=/tmp/cache" in options.arguments
+    
+    def test_performance_log_off_without_traffic_recording(self):
+        """测试不统计流量时不开启性能日志，避免日志在不读取的浏览器中累积"""
+        options = Options()
+        NetworkShaper().configure_options(options)
+        assert "goog:loggingPrefs" not in options.to_capabilities()
+    
+    def test_collect_counts_traffic(self):
+        """测试从性能日志统计请求数、字节数、拦截和缓存"""
+        driver = FakeDriver(logs={"performance": performance_log([
+            ("Network.requestWillBeSent", {"type": "Document"}),
+            ("Network.loadingFinished", {"encodedDataLength": 1200}),
+            ("Network.requestWillBeSent", {"type": "Image"}),
+            ("Network.loadingFailed", {"blockedReason": "inspector"}),
+            ("Network.requestWillBeSent", {"type": "Stylesheet"}),
+            ("Network.requestServedFromCache", {}),
+            ("Network.loadingFinished", {"encodedDataLength": 300}),
+        ])})
+        stats = NetworkShaper.collect(driver)
+        assert stats["requests"] == 3
+        assert stats["bytes"] == 1500
+        assert stats["blocked"] == 1
+        assert stats["cached"] == 1
+        assert stats["by_type"] == {"Document": 1, "Image": 1, "Stylesheet": 1}
+        assert NetworkShaper.collect(driver)["requests"] == 0
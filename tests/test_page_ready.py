@@ -0,0 +1,100 @@
+"""页面就绪等待测试用例 - 使用模拟的WebDriver验证事件驱动的 wait_for_page_load"""
+
+import pytest
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from config import Config
+from core.metrics import get_recorder
+from pages import scripts, BasePage, LoginPage, ProductsPage, CartPage
+from tests.fakes import FakeDriver
+
+
+def fake_driver(results):
+    """生成按顺序返回就绪脚本结果的模拟WebDriver
+    
+    Args:
+        results: 每次脚本调用的结果，异常实例会被抛出；最后一个结果会一直重复
+    
+    Returns:
+        FakeDriver: 模拟的WebDriver
+    """
+    return FakeDriver(responses={scripts.WAIT_FOR_READY: list(results)})
+
+
+NAVIGATION = {"url": "http://127.0.0.1/inventory.html", "time_origin": 1.0,
+              "ttfb": 5, "dom_content_loaded": 20, "load": 30}
+
+
+class TestPageReady:
+    """页面就绪等待测试类"""
+    
+    def test_single_script_call(self):
+        """测试页面就绪只需要一次脚本调用，并记录导航计时"""
+        recorder = get_recorder()
+        recorder.reset("test_single_script_call")
+        driver = fake_driver([{"ready": True, "navigation": NAVIGATION}])
+        ProductsPage(driver).wait_for_page_load()
+        script, (spec, timeout_ms) = driver.calls[0]
+        assert len(driver.calls) == 1
+        assert script == scripts.WAIT_FOR_READY
+        assert spec == {"by": "css selector", "value": "[data-test='inventory-item']",
+                        "min_count": 1, "settle_ms": 0}
+        assert recorder.last_navigation == NAVIGATION
+    
+    def test_each_page_declares_condition(self):
+        """测试每个页面对象声明自己的就绪条件"""
+        assert BasePage.ready_condition_spec(BasePage.READY_CONDITION) is None
+        assert LoginPage.READY_CONDITION["locator"] == LoginPage.LOGIN_BUTTON
+        assert BasePage.ready_condition_spec(CartPage.READY_CONDITION)["settle_ms"] > 0
+    
+    def test_retries_after_navigation(self):
+        """测试脚本执行期间文档被卸载时在新文档上重新等待"""
+        driver = fake_driver([
+            JavascriptException("document unloaded while waiting for result"),
+            {"ready": True, "navigation": None}
+        ])
+        page = CartPage(driver)
+        page.wait_for_page_load()
+        assert len(driver.calls) == 2
+        assert page.last_wait["success"] is True
+    
+    def test_not_ready_raises_timeout(self):
+        """测试就绪条件始终不满足时抛出超时异常"""
+        driver = fake_driver([{"ready": False, "navigation": None}])
+        page = ProductsPage(driver)
+        with pytest.raises(TimeoutException):
+            page.wait_for_page_load(timeout=0.05)
+        assert page.last_wait["success"] is False
+    
+    def test_script_error_not_retried(self):
+        """测试不是页面跳转引起的脚本错误直接抛出，不在超时前反复重试"""
+        driver = fake_driver([JavascriptException("javascript error: spec is not defined")])
+        with pytest.raises(JavascriptException, match="spec is not defined"):
+            ProductsPage(driver).wait_for_page_load()
+        assert len(driver.calls) == 1
+    
+    def test_dom_settled_bounded_by_timeout(self):
+        """测试等待DOM稳定时把超时传给脚本，DOM持续变化时脚本返回false而不是等到WebDriver脚本超时"""
+        driver = FakeDriver(responses={scripts.DOM_SETTLED: False})
+        page = ProductsPage(driver)
+        page.wait_for_dom_settled(timeout=2)
+        assert driver.script_calls(scripts.DOM_SETTLED) == [(Config.DOM_SETTLE_QUIET_MS, 2000)]
+        assert page.last_wait["success"] is False
+    
+    def test_read_records_bounded_by_timeout(self):
+        """测试批量读取把超时放进脚本参数，DOM一直变化时返回当前元素并记为未成功的等待"""
+        driver = FakeDriver(responses={scripts.READ_ELEMENTS: {"records": [{"text": "Sauce Labs Backpack"}],
+                                                               "settled": False}})
+        page = ProductsPage(driver)
+        assert page.read_texts(ProductsPage.PRODUCT_NAMES) == ["Sauce Labs Backpack"]
+        quiet_ms, spec = driver.script_calls(scripts.READ_ELEMENTS)[0]
+        assert spec["timeout_ms"] == Config.EXPLICIT_WAIT * 1000
+        assert page.last_wait["name"] == "read_records"
+        assert page.last_wait["success"] is False
+    
+    def test_read_records_script_timeout_recorded(self):
+        """测试WebDriver脚本超时时批量读取抛出带定位器的超时异常，并记为未成功的等待"""
+        driver = FakeDriver(responses={scripts.READ_ELEMENTS: TimeoutException("script timeout")})
+        page = ProductsPage(driver)
+        with pytest.raises(TimeoutException, match="批量读取元素超时"):
+            page.read_texts(ProductsPage.PRODUCT_NAMES)
+        assert page.last_wait["success"] is False
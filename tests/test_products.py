@@ -8,21 +8,21 @@ class TestProducts:
     """产品页面功能测试类"""
     
     @pytest.mark.smoke
-    def test_products_page_display(self, logged_in_user):
+    def test_products_page_display(self, product_catalog):
         """测试产品页面显示"""
         # 验证页面基本元素
-        assert logged_in_user.is_products_page(), "应该在产品页面"
-        assert "Products" in logged_in_user.get_page_title_text(), "页面标题应该包含'Products'"
+        assert product_catalog.is_products_page(), "应该在产品页面"
+        assert "Products" in product_catalog.get_page_title_text(), "页面标题应该包含'Products'"
         
         # 验证产品数量
-        products_count = logged_in_user.get_products_count()
+        products_count = product_catalog.get_products_count()
         assert products_count > 0, "应该显示至少一个产品"
         assert products_count == 6, f"应该显示6个产品，实际显示{products_count}个"
     
-    def test_product_information_display(self, logged_in_user):
+    def test_product_information_display(self, product_catalog):
         """测试产品信息显示"""
         # 获取产品名称
-        product_names = logged_in_user.get_product_names()
+        product_names = product_catalog.get_product_names()
         assert len(product_names) > 0, "应该显示产品名称"
         
         # 验证特定产品存在
@@ -36,7 +36,7 @@ class TestProducts:
             assert product in product_names, f"产品'{product}'应该在产品列表中"
         
         # 获取产品价格
-        product_prices = logged_in_user.get_product_prices()
+        product_prices = product_catalog.get_product_prices()
         assert len(product_prices) > 0, "应该显示产品价格"
         assert len(product_prices) == len(product_names), "产品价格数量应该与产品名称数量一致"
         
@@ -100,6 +100,17 @@ class TestProducts:
         assert not logged_in_user.is_product_added_to_cart("sauce-labs-backpack"), "背包应该显示为未添加"
         assert logged_in_user.is_product_added_to_cart("sauce-labs-bike-light"), "自行车灯应该仍在购物车中"
     
+    @pytest.mark.cart
+    def test_bulk_add_and_remove_products(self, logged_in_user):
+        """测试批量添加和移除产品"""
+        products = ["Sauce Labs Backpack", "Sauce Labs Bike Light", "Sauce Labs Bolt T-Shirt"]
+        assert logged_in_user.add_products_to_cart(products) == 3
+        assert logged_in_user.get_cart_items_count() == 3, "购物车应该有3个商品"
+        
+        logged_in_user.remove_products_from_cart(products[:2])
+        assert logged_in_user.get_cart_items_count() == 1, "购物车应该还有1个商品"
+        assert logged_in_user.is_product_added_to_cart(products[2]), "T恤应该仍在购物车中"
+    
     def test_cart_icon_navigation(self, logged_in_user, cart_page):
         """测试购物车图标导航"""
         # 添加产品到购物车
@@ -111,39 +122,39 @@ class TestProducts:
         # 验证跳转到购物车页面
         assert cart_page.is_cart_page(), "应该跳转到购物车页面"
     
-    def test_product_sorting(self, logged_in_user):
+    def test_product_sorting(self, product_catalog):
         """测试产品排序功能"""
         # 获取默认排序的产品名称
-        default_names = logged_in_user.get_product_names()
+        default_names = product_catalog.get_product_names()
         
         # 按名称Z到A排序
-        logged_in_user.select_sort_option("za")
-        za_names = logged_in_user.get_product_names()
+        product_catalog.select_sort_option("za")
+        za_names = product_catalog.get_product_names()
         
         # 验证排序结果
         assert za_names != default_names, "Z到A排序后产品顺序应该改变"
         assert za_names == sorted(default_names, reverse=True), "Z到A排序结果不正确"
         
         # 按名称A到Z排序
-        logged_in_user.select_sort_option("az")
-        az_names = logged_in_user.get_product_names()
+        product_catalog.select_sort_option("az")
+        az_names = product_catalog.get_product_names()
         
         # 验证排序结果
         assert az_names == sorted(default_names), "A到Z排序结果不正确"
     
-    def test_price_sorting(self, logged_in_user):
+    def test_price_sorting(self, product_catalog):
         """测试价格排序功能"""
         # 按价格从低到高排序
-        logged_in_user.select_sort_option("lohi")
-        lohi_prices = logged_in_user.get_product_prices()
+        product_catalog.select_sort_option("lohi")
+        lohi_prices = product_catalog.get_product_prices()
         
         # 转换价格为数字进行比较
         lohi_values = [float(price.replace('$', '')) for price in lohi_prices]
         assert lohi_values == sorted(lohi_values), "价格从低到高排序不正确"
         
         # 按价格从高到低排序
-        logged_in_user.select_sort_option("hilo")
-        hilo_prices = logged_in_user.get_product_prices()
+        product_catalog.select_sort_option("hilo")
+        hilo_prices = product_catalog.get_product_prices()
         
         # 转换价格为数字进行比较
         hilo_values = [float(price.replace('$', '')) for price in hilo_prices]
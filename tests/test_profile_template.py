@@ -0,0 +1,121 @@
+"""浏览器配置模板测试用例 - 验证模板生成、复用和副本"""
+
+import os
+import pytest
+from core.profile_template import ProfileTemplate, MARKER_FILE
+from tests.fakes import FakeDriver
+
+
+def launch_browser(user_data_dir, launches=None):
+    """模拟启动浏览器：写入用户数据目录，返回模拟的WebDriver
+    
+    Args:
+        user_data_dir: 用户数据目录
+        launches: 记录每次启动的列表
+    
+    Returns:
+        FakeDriver: 模拟的WebDriver
+    """
+    os.makedirs(os.path.join(user_data_dir, "Default", "Cache"), exist_ok=True)
+    with open(os.path.join(user_data_dir, "Default", "Preferences"), "w") as f:
+        f.write("{}")
+    with open(os.path.join(user_data_dir, "SingletonLock"), "w") as f:
+        f.write("lock")
+    driver = FakeDriver(responses={"return document.readyState": "complete"})
+    if launches is not None:
+        launches.append(driver)
+    return driver
+
+
+@pytest.fixture
+def template(tmp_path):
+    """使用临时目录的配置模板"""
+    return ProfileTemplate(
+        template_dir=str(tmp_path / "template"),
+        clone_root=str(tmp_path / "clones"),
+        base_url="http://127.0.0.1:8000"
+    )
+
+
+class TestProfileTemplate:
+    """浏览器配置模板测试类"""
+    
+    def test_template_built_once(self, template):
+        """测试模板只生成一次，并去掉锁文件"""
+        launches = []
+        key = template.key(["--headless=new"])
+        template.ensure(lambda path: launch_browser(path, launches), key)
+        template.ensure(lambda path: launch_browser(path, launches), key)
+        assert len(launches) == 1
+        assert launches[0].visited == ["http://127.0.0.1:8000"]
+        assert os.path.exists(os.path.join(template.path(key), "Default", "Preferences"))
+        assert os.path.exists(os.path.join(template.path(key), MARKER_FILE))
+        assert not os.path.lexists(os.path.join(template.path(key), "SingletonLock"))
+        assert os.listdir(template.template_dir) == [key]
+    
+    def test_each_argument_set_has_own_template(self, template):
+        """测试不同的Chrome参数各自生成模板，互不替换"""
+        launches = []
+        headless, maximized = template.key(["--headless=new"]), template.key(["--start-maximized"])
+        template.ensure(lambda path: launch_browser(path, launches), headless)
+        template.ensure(lambda path: launch_browser(path, launches), maximized)
+        assert len(launches) == 2
+        assert template.is_fresh(headless) and template.is_fresh(maximized)
+    
+    def test_key_includes_site_origin(self, tmp_path):
+        """测试不同站点的源各自生成模板，本地站点的端口不同时共用模板"""
+        first = ProfileTemplate(str(tmp_path), base_url="http://127.0.0.1:8001")
+        second = ProfileTemplate(str(tmp_path), base_url="http://127.0.0.1:8002/inventory.html")
+        remote = ProfileTemplate(str(tmp_path), base_url="https://www.saucedemo.com")
+        staging = ProfileTemplate(str(tmp_path), base_url="https://staging.saucedemo.com")
+        assert first.key(["--headless=new"]) == second.key(["--headless=new"])
+        assert len({template.key(["--headless=new"]) for template in (first, remote, staging)}) == 3
+    
+    def test_concurrent_build_keeps_published_template(self, template, monkeypatch):
+        """测试另一个worker已发布模板时丢弃自己生成的目录，不删除已发布的模板"""
+        key = template.key()
+        published = template.ensure(launch_browser, key)
+        clone = template.clone(key)
+        
+        # 模拟在对方发布前已开始生成的worker：开始时模板还不存在，重命名时已被发布
+        checks = []
+        
+        def published_meanwhile(self, key):
+            checks.append(key)
+            return len(checks) > 1
+        
+        monkeypatch.setattr(ProfileTemplate, "is_fresh", published_meanwhile)
+        assert template.ensure(launch_browser, key) == published
+        monkeypatch.undo()
+        assert os.listdir(template.template_dir) == [key]
+        assert os.path.exists(os.path.join(published, MARKER_FILE))
+        assert os.path.exists(os.path.join(clone, "Default", "Preferences"))
+    
+    def test_clone_is_independent_copy(self, template):
+        """测试副本包含模板内容，修改副本不影响模板"""
+        key = template.key()
+        template.ensure(launch_browser, key)
+        clone = template.clone(key)
+        assert os.path.dirname(clone) == template.clone_root
+        preferences = os.path.join(clone, "Default", "Preferences")
+        assert os.path.exists(preferences)
+        with open(preferences, "w") as f:
+            f.write('{"changed": true}')
+        with open(os.path.join(template.path(key), "Default", "Preferences")) as f:
+            assert f.read() == "{}"
+    
+    def test_clone_missing_template_leaves_nothing(self, template):
+        """测试模板不存在时复制失败，不留下不完整的副本"""
+        with pytest.raises(FileNotFoundError):
+            template.clone(template.key())
+        assert not os.path.exists(template.clone_root) or not os.listdir(template.clone_root)
+    
+    def test_clone_removed_on_quit(self, template):
+        """测试浏览器关闭时删除副本"""
+        key = template.key()
+        template.ensure(launch_browser, key)
+        clone = template.clone(key)
+        browser = launch_browser(clone)
+        ProfileTemplate.remove_on_quit(browser, clone)
+        browser.quit()
+        assert not os.path.exists(clone)
@@ -0,0 +1,127 @@
+"""失败重试测试用例 - 验证失败分类、重试预算、耗时汇总，以及只重试基础设施失败"""
+
+import os
+import subprocess
+import sys
+import textwrap
+from types import SimpleNamespace
+import pytest
+import urllib3
+from selenium.common.exceptions import (
+    InvalidSessionIdException, NoSuchElementException, StaleElementReferenceException,
+    TimeoutException, WebDriverException
+)
+from core.retry import RetryPlugin, classify
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def raised(exc, context=None):
+    """在处理 context 时抛出 exc，返回带有异常链的异常
+    
+    Args:
+        exc: 要抛出的异常
+        context: 正在处理的异常
+    
+    Returns:
+        BaseException: 抛出的异常
+    """
+    try:
+        try:
+            if context is not None:
+                raise context
+        except BaseException:
+            raise exc
+        raise exc
+    except BaseException as e:
+        return e
+
+
+def teardown_report(nodeid, duration, properties=()):
+    """生成teardown阶段的报告
+    
+    Args:
+        nodeid: 测试节点ID
+        duration: 阶段耗时
+        properties: user_properties
+    
+    Returns:
+        SimpleNamespace: 报告
+    """
+    return SimpleNamespace(nodeid=nodeid, when="teardown", duration=duration, user_properties=list(properties))
+
+
+class TestRetry:
+    """失败重试测试类"""
+    
+    def test_classify_by_exception_chain(self):
+        """测试按异常链分类：等待超时后抛出的 NoSuchElementException 归为超时"""
+        assert classify(raised(NoSuchElementException("无法找到元素"), TimeoutException())) == "timeout"
+        assert classify(NoSuchElementException("当前页面没有商品")) == "error"
+        assert classify(StaleElementReferenceException()) == "stale"
+        assert classify(WebDriverException("unknown error: net::ERR_CONNECTION_RESET")) == "network"
+        assert classify(InvalidSessionIdException()) == "network"
+        assert classify(urllib3.exceptions.ProtocolError("Connection aborted")) == "network"
+        assert classify(raised(AssertionError("总价不对"), TimeoutException())) == "assertion"
+        assert classify(ValueError()) == "error"
+    
+    def test_budget_limits_retries(self):
+        """测试只重试可重试的分类，并受每个测试的次数和进程预算限制"""
+        plugin = RetryPlugin(retries=2, budget=2, categories=["timeout", "stale"])
+        assert not plugin.should_retry("assertion", 0)
+        assert plugin.should_retry("timeout", 0)
+        assert not plugin.should_retry("timeout", 2)
+        assert plugin.should_retry("stale", 1)
+        assert not plugin.should_retry("timeout", 0)
+        assert plugin.over_budget("timeout", 0)
+        assert not plugin.over_budget("assertion", 0)
+        assert not plugin.over_budget("timeout", 2)
+    
+    def test_summarizes_first_attempt_and_retry_time(self):
+        """测试汇总首次执行和重试的耗时、最终失败的分类，以及报告中标记的预算用尽"""
+        plugin = RetryPlugin(retries=1, budget=10, categories=["timeout"])
+        plugin.pytest_runtest_logreport(SimpleNamespace(nodeid="a", when="call", duration=1.0))
+        plugin.pytest_runtest_logreport(teardown_report("a", 0.5))
+        plugin.pytest_runtest_logreport(teardown_report("b", 0.4, [("retry", {
+            "attempts": [{"category": "timeout", "duration": 3.0, "error": ""}],
+            "first_attempt": 3.0,
+            "retry_time": 0.4,
+            "passed": True
+        })]))
+        plugin.pytest_runtest_logreport(teardown_report("c", 0.2, [("failure_category", "assertion")]))
+        plugin.pytest_runtest_logreport(teardown_report("d", 0.1, [("failure_category", "timeout"), ("over_budget", True)]))
+        assert plugin.stats["first_attempt_time"] == pytest.approx(4.8)
+        assert plugin.stats["retry_time"] == pytest.approx(0.4)
+        assert plugin.stats["by_category"] == {"timeout": 1}
+        assert plugin.stats["flaky"] == 1
+        assert plugin.stats["failures"] == {"assertion": 1, "timeout": 1}
+        assert plugin.stats["over_budget"] == 1
+    
+    def test_reruns_only_infrastructure_failures(self, tmp_path):
+        """测试超时失败重试后通过，断言失败不重试"""
+        (tmp_path / "test_sample.py").write_text(textwrap.dedent("""
+            from selenium.common.exceptions import NoSuchElementException, TimeoutException
+            
+            calls = {"flaky": 0, "broken": 0}
+            
+            def test_flaky():
+                calls["flaky"] += 1
+                if calls["flaky"] == 1:
+                    try:
+                        raise TimeoutException("slow")
+                    except TimeoutException:
+                        raise NoSuchElementException("无法找到元素")
+            
+            def test_broken():
+                calls["broken"] += 1
+                assert calls["broken"] == 0
+        """), encoding="utf-8")
+        result = subprocess.run(
+            [sys.executable, "-m", "pytest", "-p", "core.retry", "-p", "no:cacheprovider", "-q", "test_sample.py"],
+            cwd=tmp_path, capture_output=True, text=True,
+            env=dict(os.environ, PYTHONPATH=PROJECT_ROOT, RETRIES="1")
+        )
+        assert "1 failed, 1 passed" in result.stdout, result.stdout
+        assert "失败分类: 断言 1" in result.stdout
+        assert "失败重试: 重试 1 次（超时 1），1 个测试重试后通过" in result.stdout
+        assert "assert 1 == 0" in result.stdout
@@ -0,0 +1,140 @@
+"""场景引擎测试用例 - 使用模拟的浏览器和步骤验证前缀合并、快照恢复和分支失败隔离"""
+
+import json
+import pytest
+from core.checkpoint import Checkpoint
+from core.scenarios import NAVIGATION_STEPS, ScenarioRunner, build_tree, load_scenarios, normalize_step
+from tests.fakes import FakeDriver
+
+
+def recording_steps(log, fail=()):
+    """生成记录执行顺序的步骤
+    
+    Args:
+        log: 执行记录列表
+        fail: 执行时断言失败的 (名称, 参数)
+    
+    Returns:
+        dict: 步骤名称到函数的映射
+    """
+    def make(name):
+        def step(shopper, argument):
+            log.append((name, argument))
+            if name == "login":
+                shopper.driver.get("http://127.0.0.1/inventory.html")
+                shopper.driver.cookies = [{"name": "session-username", "value": argument}]
+            if name == "add":
+                shopper.driver.storage["local_storage"]["cart-contents"] = argument
+            assert (name, argument) not in fail, f"{name} 失败"
+        return step
+    return {name: make(name) for name in ("login", "add", "sort", "view_cart", "assert_total")}
+
+
+SCENARIOS = [
+    {"name": "a", "steps": [{"login": "u"}, {"sort": "hilo"}, {"add": "x"}, {"assert_total": 1}]},
+    {"name": "b", "steps": [{"login": "u"}, {"sort": "hilo"}, {"add": "y"}, "view_cart"]},
+    {"name": "c", "steps": [{"login": "u"}, "view_cart"]}
+]
+
+
+class TestScenarioEngine:
+    """场景引擎测试类"""
+    
+    def test_tree_merges_common_prefix(self):
+        """测试开头相同的步骤合并为一个节点"""
+        root = build_tree(SCENARIOS, recording_steps([]))
+        assert len(root.children) == 1
+        login = next(iter(root.children.values()))
+        assert [child.step for child in login.children.values()] == [("sort", "hilo"), ("view_cart", None)]
+        assert sorted(login.scenario_names()) == ["a", "b", "c"]
+    
+    def test_invalid_scenarios_rejected(self):
+        """测试未知步骤、重复名称和格式错误的步骤"""
+        with pytest.raises(ValueError, match="未知的步骤"):
+            build_tree([{"name": "a", "steps": ["fly"]}], recording_steps([]))
+        with pytest.raises(ValueError, match="重复"):
+            build_tree([{"name": "a", "steps": []}, {"name": "a", "steps": []}], recording_steps([]))
+        with pytest.raises(ValueError):
+            normalize_step({"login": "u", "add": "x"})
+    
+    def test_shared_prefix_runs_once(self):
+        """测试共同前缀只执行一次，分支从快照恢复并重放导航之后的DOM步骤"""
+        log = []
+        runner = ScenarioRunner(FakeDriver(), recording_steps(log), base_url="http://127.0.0.1")
+        results = runner.run(SCENARIOS)
+        
+        assert all(result["passed"] for result in results.values())
+        assert log.count(("login", "u")) == 1
+        # 分支 b 恢复快照后重放排序
+        assert log.count(("sort", "hilo")) == 2
+        assert runner.stats["scenario_steps"] == 10
+        # 重放的排序只计入重放步数
+        assert runner.stats["executed_steps"] == 7
+        assert runner.stats["replayed_steps"] == 1
+        assert runner.stats["restores"] == 2
+    
+    def test_restore_resets_branch_state(self):
+        """测试恢复快照后上一个分支写入的购物车状态被清除"""
+        driver = FakeDriver()
+        runner = ScenarioRunner(driver, recording_steps([]), base_url="http://127.0.0.1")
+        runner.run(SCENARIOS[:2])
+        assert driver.storage["local_storage"] == {"cart-contents": "y"}
+    
+    def test_failed_step_fails_only_its_branch(self):
+        """测试步骤失败只影响该分支下的场景"""
+        runner = ScenarioRunner(FakeDriver(), recording_steps([], fail=[("add", "x")]), base_url="http://127.0.0.1")
+        results = runner.run(SCENARIOS)
+        assert results["a"]["passed"] is False
+        assert results["a"]["step"] == 'add: "x"'
+        assert "add 失败" in results["a"]["error"]
+        assert results["b"]["passed"] and results["c"]["passed"]
+    
+    def test_replay_failure_labelled_separately(self):
+        """测试恢复快照后重放的步骤失败时标注为重放，而不是分支自己的步骤"""
+        steps = recording_steps([])
+        sort = steps["sort"]
+        sorts = []
+        
+        def sort_once(shopper, argument):
+            sorts.append(argument)
+            assert len(sorts) == 1, "排序失败"
+            sort(shopper, argument)
+        
+        steps["sort"] = sort_once
+        runner = ScenarioRunner(FakeDriver(), steps, base_url="http://127.0.0.1")
+        results = runner.run(SCENARIOS)
+        assert results["a"]["passed"] and results["c"]["passed"]
+        assert results["b"]["passed"] is False
+        assert results["b"]["step"] == 'sort: "hilo"（恢复快照后重放）'
+    
+    def test_checkpoint_restores_on_same_origin(self):
+        """测试恢复快照时先打开同源地址，再写入cookies和存储并打开记录的地址"""
+        driver = FakeDriver()
+        driver.get("http://127.0.0.1/cart.html")
+        driver.cookies = [{"name": "session-username", "value": "u"}]
+        driver.storage["local_storage"] = {"cart-contents": "[4]"}
+        checkpoint = Checkpoint.capture(driver)
+        
+        driver.get("about:blank")
+        driver.cookies = [{"name": "other", "value": "1"}]
+        checkpoint.restore(driver)
+        assert driver.visited[-2].startswith("http://127.0.0.1/")
+        assert driver.current_url == "http://127.0.0.1/cart.html"
+        assert driver.cookies == [{"name": "session-username", "value": "u"}]
+        assert driver.storage["local_storage"] == {"cart-contents": "[4]"}
+    
+    def test_load_json_and_yaml(self, tmp_path):
+        """测试读取JSON和YAML场景文件"""
+        path = tmp_path / "scenarios.json"
+        path.write_text(json.dumps({"scenarios": SCENARIOS}), encoding="utf-8")
+        assert load_scenarios(str(path)) == SCENARIOS
+        
+        yaml = pytest.importorskip("yaml")
+        path = tmp_path / "scenarios.yaml"
+        path.write_text(yaml.safe_dump({"scenarios": SCENARIOS}), encoding="utf-8")
+        assert load_scenarios(str(path)) == SCENARIOS
+    
+    def test_navigation_steps_are_known(self):
+        """测试导航步骤都是可用的场景步骤"""
+        from core.scenarios import STEPS
+        assert NAVIGATION_STEPS <= set(STEPS)
@@ -0,0 +1,44 @@
+"""数据驱动的场景测试用例 - 场景定义在 scenarios/shopping.json 中，共同前缀只执行一次"""
+
+import pytest
+from config import Config
+from core.scenarios import ScenarioRunner, load_scenarios
+
+SCENARIOS = load_scenarios(Config.SCENARIOS_FILE)
+
+# 并行运行时所有场景分到同一个worker，前缀树只执行一次
+pytestmark = pytest.mark.xdist_group("scenarios")
+
+
+@pytest.fixture(scope="module")
+def scenario_results(driver_pool):
+    """在一个浏览器中按前缀树执行所有场景，整个测试会话只执行一次
+    
+    Args:
+        driver_pool: 浏览器池
+        
+    Returns:
+        dict: 场景名称到结果的映射
+    """
+    browser = driver_pool.acquire(fresh=not Config.REUSE_BROWSER)
+    runner = ScenarioRunner(browser)
+    try:
+        results = runner.run(SCENARIOS)
+    finally:
+        driver_pool.release(browser, discard=not Config.REUSE_BROWSER)
+    stats = runner.stats
+    print(f"\n[Scenarios] {stats['scenarios']} 个场景共 {stats['scenario_steps']} 步，实际执行 "
+          f"{stats['executed_steps']} 步，另重放 {stats['replayed_steps']} 步，恢复快照 {stats['restores']} 次，"
+          f"耗时 {stats['elapsed']:.1f}s")
+    return results
+
+
+class TestScenarios:
+    """数据驱动的场景测试类"""
+    
+    @pytest.mark.regression
+    @pytest.mark.parametrize("name", [scenario["name"] for scenario in SCENARIOS])
+    def test_scenario(self, scenario_results, name):
+        """测试场景文件中的每个场景"""
+        result = scenario_results[name]
+        assert result["passed"], f"步骤 {result['step']} 失败: {result['error']}"
@@ -0,0 +1,72 @@
+"""会话引导测试用例 - 使用模拟的WebDriver验证登录状态缓存和回退到登录表单"""
+
+import time
+import pytest
+from config import Config
+from core.session import SessionBootstrap
+from pages import ProductsPage
+from tests.fakes import FakeDriver
+
+BASE_URL = "http://127.0.0.1:8000"
+SESSION_COOKIE = {"name": "session-username", "value": "standard_user", "expiry": time.time() + 3600}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """每个测试从空的登录状态缓存开始"""
+    SessionBootstrap.clear_cache()
+    yield
+    SessionBootstrap.clear_cache()
+
+
+def logged_in_browser():
+    """生成登录后显示产品页面、并带有会话cookie的模拟WebDriver
+    
+    Returns:
+        FakeDriver: 模拟的WebDriver
+    """
+    driver = FakeDriver(visible={ProductsPage.PAGE_TITLE[1]})
+    driver.cookies = [dict(SESSION_COOKIE)]
+    return driver
+
+
+class TestSessionBootstrap:
+    """会话引导测试类"""
+    
+    def test_second_login_restores_cached_state(self):
+        """测试第一次通过登录表单登录，之后写入缓存的cookies直接打开产品页面"""
+        first = logged_in_browser()
+        SessionBootstrap(first, BASE_URL).login(Config.VALID_USERNAME, Config.VALID_PASSWORD)
+        assert first.clicked == ["login-button"]
+        
+        second = FakeDriver(visible={ProductsPage.PAGE_TITLE[1]})
+        bootstrap = SessionBootstrap(second, BASE_URL)
+        assert bootstrap.login(Config.VALID_USERNAME, Config.VALID_PASSWORD).driver is second
+        assert bootstrap.last_source == "cache"
+        assert second.clicked == []
+        assert second.cookies == [SESSION_COOKIE]
+        assert second.visited == [BASE_URL + Config.SESSION_BOOTSTRAP_PATH, BASE_URL + Config.INVENTORY_PATH]
+    
+    def test_rejected_session_falls_back_to_form(self):
+        """测试写入缓存状态后产品页面标题当前不可见时退回登录表单"""
+        SessionBootstrap(logged_in_browser(), BASE_URL).login(Config.VALID_USERNAME, Config.VALID_PASSWORD)
+        
+        # 产品页面标题不可见：站点拒绝了缓存的会话，跳回了登录页
+        driver = FakeDriver()
+        bootstrap = SessionBootstrap(driver, BASE_URL)
+        bootstrap.login(Config.VALID_USERNAME, Config.VALID_PASSWORD)
+        assert bootstrap.last_source == "form"
+        assert "addCookie" in driver.commands
+        assert driver.clicked == ["login-button"]
+    
+    def test_expired_cookies_skip_restore(self):
+        """测试缓存的cookie已过期时不写入浏览器，直接通过登录表单登录"""
+        first = logged_in_browser()
+        first.cookies[0]["expiry"] = time.time() - 1
+        SessionBootstrap(first, BASE_URL).login(Config.VALID_USERNAME, Config.VALID_PASSWORD)
+        
+        driver = FakeDriver(visible={ProductsPage.PAGE_TITLE[1]})
+        bootstrap = SessionBootstrap(driver, BASE_URL)
+        bootstrap.login(Config.VALID_USERNAME, Config.VALID_PASSWORD)
+        assert bootstrap.last_source == "form"
+        assert "addCookie" not in driver.commands
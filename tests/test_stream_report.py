@@ -0,0 +1,117 @@
+"""流式报告测试用例 - 验证逐条写入、阶段结果合并和附件另存为文件"""
+
+import base64
+import json
+import os
+from types import SimpleNamespace
+import pytest
+from core.stream_report import StreamReportPlugin, StreamReportWriter, add_asset
+
+
+def make_report(nodeid, when, outcome="passed", duration=0.1, **extra):
+    """构造一个阶段报告
+    
+    Args:
+        nodeid: 测试节点ID
+        when: 测试阶段
+        outcome: 阶段结果
+        duration: 阶段耗时
+        **extra: 其他报告属性
+    
+    Returns:
+        SimpleNamespace: 假的测试报告
+    """
+    fields = {
+        "nodeid": nodeid,
+        "location": ("tests/test_x.py", 1, nodeid),
+        "when": when,
+        "outcome": outcome,
+        "passed": outcome == "passed",
+        "failed": outcome == "failed",
+        "skipped": outcome == "skipped",
+        "duration": duration,
+        "longrepr": "AssertionError: boom" if outcome == "failed" else None,
+        "sections": [],
+        "user_properties": []
+    }
+    fields.update(extra)
+    return SimpleNamespace(**fields)
+
+
+def read_records(writer):
+    """读取已写入的记录
+    
+    Args:
+        writer: StreamReportWriter 实例
+    
+    Returns:
+        list: 记录列表
+    """
+    with open(writer.results_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def plugin(tmp_path):
+    """写入临时目录的流式报告插件"""
+    session = SimpleNamespace(config=SimpleNamespace(rootpath=tmp_path, invocation_params=SimpleNamespace(args=())))
+    plugin = StreamReportPlugin(StreamReportWriter(str(tmp_path / "stream")))
+    plugin.pytest_sessionstart(session)
+    yield plugin
+    plugin.writer.close()
+
+
+class TestStreamReport:
+    """流式报告测试类"""
+    
+    def test_records_are_readable_while_running(self, plugin):
+        """测试每个测试结束后记录立即可读，不需要等待运行结束"""
+        for when in ("setup", "call", "teardown"):
+            plugin.pytest_runtest_logreport(make_report("test_a", when))
+        records = read_records(plugin.writer)
+        assert [record["type"] for record in records] == ["session", "test"]
+        assert records[1]["outcome"] == "passed"
+        assert records[1]["duration"] == pytest.approx(0.3)
+        assert os.path.exists(os.path.join(plugin.writer.directory, "index.html"))
+    
+    def test_merges_phase_outcomes(self, plugin):
+        """测试setup失败记为error，call失败记为failed并保留失败信息"""
+        plugin.pytest_runtest_logreport(make_report("test_error", "setup", "failed"))
+        plugin.pytest_runtest_logreport(make_report("test_error", "teardown"))
+        plugin.pytest_runtest_logreport(make_report("test_failed", "setup"))
+        plugin.pytest_runtest_logreport(make_report("test_failed", "call", "failed"))
+        plugin.pytest_runtest_logreport(make_report("test_failed", "teardown"))
+        plugin.pytest_sessionfinish(None, 1)
+        
+        records = read_records(plugin.writer)
+        outcomes = {record["nodeid"]: record["outcome"] for record in records if record["type"] == "test"}
+        assert outcomes == {"test_error": "error", "test_failed": "failed"}
+        assert records[2]["longrepr"] == "AssertionError: boom"
+        assert records[-1]["type"] == "summary"
+        assert records[-1]["counts"] == {"error": 1, "failed": 1}
+    
+    def test_inline_images_saved_as_files(self, plugin):
+        """测试 pytest-html 内嵌的base64图片另存为附件文件"""
+        image = b"\x89PNG fake"
+        extras = [{"name": "screenshot", "format_type": "image", "extension": "png",
+                   "content": base64.b64encode(image).decode("ascii")}]
+        plugin.pytest_runtest_logreport(make_report("test_a", "call", "failed", extras=extras))
+        plugin.pytest_runtest_logreport(make_report("test_a", "teardown"))
+        
+        asset = read_records(plugin.writer)[1]["assets"][0]
+        assert asset["path"].startswith("assets/") and asset["path"].endswith(".png")
+        with open(os.path.join(plugin.writer.directory, asset["path"]), "rb") as f:
+            assert f.read() == image
+    
+    def test_add_asset(self, tmp_path):
+        """测试测试中附加的文件写入附件目录并记录在 user_properties 中"""
+        directory = str(tmp_path / "stream")
+        StreamReportWriter(directory).open().close()
+        node = SimpleNamespace(
+            nodeid="tests/test_x.py::test_a",
+            user_properties=[],
+            config=SimpleNamespace(getoption=lambda name: directory)
+        )
+        path = add_asset(node, "dom.html", "<html></html>")
+        assert node.user_properties == [("asset", {"name": "dom.html", "path": path})]
+        assert os.path.exists(os.path.join(directory, path))